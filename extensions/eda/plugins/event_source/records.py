@@ -71,6 +71,13 @@ options:
       - Defaults to the same value as timestamp_field.
       - Should be a field that can be used for consistent ordering of records.
     required: false
+  read_ahead:
+    description:
+      - Number of pages of records that are fetched in the background while the records of the
+        current page are turned into events.
+      - With V(0), the next page is only requested once the current one is processed.
+    required: false
+    default: 0
 """
 
 EXAMPLES = r"""
@@ -127,6 +134,7 @@ if project_root not in sys.path:
 
 import asyncio  # noqa: E402
 import gc  # noqa: E402
+import itertools  # noqa: E402
 import logging  # noqa: E402
 import re  # noqa: E402
 import resource  # noqa: E402
@@ -145,6 +153,8 @@ logger = logging.getLogger(__name__)
 
 
 DATE_FORMAT_STRING = "%Y-%m-%d %H:%M:%S"
+# Number of records that the worker thread reads ahead of the event loop.
+RECORD_BATCH_SIZE = 100
 
 
 def get_tz_aware_datetime_from_string(
@@ -249,6 +259,34 @@ class QueryFormatter:
         return sysparm_query
 
 
+async def _iterate_records(records, batch_size=RECORD_BATCH_SIZE):
+    """
+    Iterate over the records of a blocking list_records result without blocking
+    the event loop. Each batch of up to batch_size records is read in a worker
+    thread, so at most one batch is held in memory.
+    """
+    loop = asyncio.get_running_loop()
+    records = iter(records)
+    try:
+        while True:
+            batch = await loop.run_in_executor(
+                None, list, itertools.islice(records, batch_size)
+            )
+            if not batch:
+                return
+            for record in batch:
+                yield record
+    finally:
+        # Release the streamed page when the caller stops early. A batch that
+        # is still being read when the poll is cancelled finishes on its own.
+        close = getattr(records, "close", None)
+        if close:
+            try:
+                close()
+            except ValueError:
+                pass
+
+
 class RecordsSource:
     def __init__(self, queue: asyncio.Queue, args: Dict[str, Any]):
         self.queue = queue
@@ -259,7 +297,14 @@ class RecordsSource:
         self.timestamp_field = args.get("timestamp_field", "sys_updated_on")
         self.order_by_field = args.get("order_by_field", self.timestamp_field)
         self.snow_client = client.Client(**self.instance_config)
-        self.table_client = table.TableClient(self.snow_client, memory_efficient=True)
+        # Records are streamed off the socket one at a time. The listing blocks,
+        # so _poll_for_records runs it in a worker thread, see _iterate_records.
+        self.table_client = table.TableClient(
+            self.snow_client,
+            memory_efficient=True,
+            stream=True,
+            read_ahead=int(args.get("read_ahead", 0)),
+        )
         self.query_formatter = QueryFormatter()
         self.list_query = self.query_formatter.format_and_clean_query_parameters(
             query=args.get("query"),
@@ -551,7 +596,7 @@ class RecordsSource:
         # The memory management features are still active through the memory_efficient flag
         records_iter = self.table_client.list_records(self.table_name, self.list_query)
 
-        for record in records_iter:
+        async for record in _iterate_records(records_iter):
             logger.debug(
                 "Processing record with sys_id %s and %s %s",
                 record["sys_id"],
@@ -128,6 +128,247 @@ options:
         default: True
         type: bool
         version_added: '2.3.0'
+      connection_pool_size:
+        description:
+          - Maximum number of idle keep-alive connections kept open per host.
+          - When greater than 0, connections (and their TLS sessions) are reused
+            across requests instead of opening a new connection for every request.
+            This mostly benefits paginated listings of large tables.
+          - The pool is not used when the instance is reached through a proxy
+            configured with environment variables.
+        type: int
+        default: 0
+        version_added: '2.16.0'
+      compress_requests:
+        description:
+          - Whether to gzip-compress large JSON request bodies (for example, batch
+            payloads) and send them with the C(Content-Encoding) header.
+          - Responses are always requested with gzip or deflate compression and are
+            decompressed transparently, regardless of this option.
+        type: bool
+        default: false
+        version_added: '2.16.0'
+      rate_limit:
+        description:
+          - Maximum average number of requests per second to send to the instance.
+          - Requests above the limit are delayed on the client side instead of being
+            rejected by the instance. The limit applies to each module invocation
+            (or plugin) separately, so divide the instance quota by the number of forks.
+          - The default of 0 disables client-side throttling.
+        type: float
+        default: 0
+        version_added: '2.16.0'
+      rate_limit_burst:
+        description:
+          - Number of requests that may be sent back-to-back before O(instance.rate_limit)
+            throttling kicks in.
+          - Defaults to the value of O(instance.rate_limit).
+        type: int
+        version_added: '2.16.0'
+      rate_limit_max_wait:
+        description:
+          - Maximum number of seconds to spend waiting and retrying a single request
+            that the instance rejected because of its rate limit.
+          - Requests rejected with status 429, or 503 with a C(Retry-After) header, are
+            retried after the delay given by the C(Retry-After) or C(X-RateLimit-Reset)
+            headers, or with exponential backoff when neither header is present.
+          - Set to 0 to disable retrying rate limited requests.
+        type: float
+        default: 120
+        version_added: '2.16.0'
+      max_retries:
+        description:
+          - Maximum number of times a request that failed with a transient error is
+            sent again.
+          - See O(instance.retry_rules) for the errors that are retried.
+        type: int
+        default: 3
+        version_added: '2.16.0'
+      retry_backoff:
+        description:
+          - Upper bound, in seconds, of the delay before the first retry.
+          - The bound doubles with every retry and the actual delay is picked at random
+            between 0 and the bound (exponential backoff with full jitter), which keeps
+            many clients from retrying at the same time.
+        type: float
+        default: 0.5
+        version_added: '2.16.0'
+      retry_backoff_max:
+        description:
+          - Maximum delay, in seconds, between two retries.
+        type: float
+        default: 30
+        version_added: '2.16.0'
+      retry_deadline:
+        description:
+          - Maximum number of seconds a single request, including its retries, may
+            take. No retry is attempted if it would exceed the deadline.
+          - By default, only O(instance.max_retries) limits the retries.
+        type: float
+        version_added: '2.16.0'
+      retry_rules:
+        description:
+          - Overrides for the retry rule of each error class.
+          - Keys are error classes, C(handshake_timeout), C(connect_error),
+            C(connection_reset), C(read_timeout) and C(server_error) (status 502, 503
+            or 504 without a C(Retry-After) header).
+          - Values are C(always), C(idempotent) (only GET, HEAD, OPTIONS, PUT and DELETE
+            requests are retried) or C(never).
+          - By default, C(handshake_timeout) and C(connect_error) are C(always) retried,
+            since the request never reached the instance, and the other classes are
+            retried for C(idempotent) requests.
+        type: dict
+        version_added: '2.16.0'
+      token_cache:
+        description:
+          - Whether to cache OAuth access tokens on disk and reuse them across module
+            invocations, instead of requesting a new token for every task.
+          - Tokens are cached per instance host, O(instance.client_id),
+            O(instance.grant_type), O(instance.username) and the credentials sent for
+            the grant, in files that only the owner can read. A cached token is used
+            until it is about to expire or the instance rejects it.
+          - Only used with OAuth authentication.
+        type: bool
+        default: false
+        version_added: '2.16.0'
+      token_cache_dir:
+        description:
+          - Directory for the O(instance.token_cache) files on the host that runs the module.
+          - Defaults to C(~/.ansible/tmp/servicenow_itsm_tokens).
+        type: path
+        version_added: '2.16.0'
+      collect_stats:
+        description:
+          - Whether to collect statistics about the API requests the module sends and
+            return them as C(api_stats).
+          - The statistics contain the number of requests, errors, retries and rate
+            limited responses, the bytes transferred and the time spent, in total and
+            per method and path. Paths have sys_ids replaced with C({sys_id}).
+        type: bool
+        default: false
+        version_added: '2.16.0'
+      stats_export_path:
+        description:
+          - File on the host that runs the module to export API request metrics to.
+          - See O(instance.stats_export_format) for the available formats.
+        type: path
+        version_added: '2.16.0'
+      stats_export_format:
+        description:
+          - Format of the O(instance.stats_export_path) file.
+          - C(jsonl) appends one JSON document per request.
+          - C(prometheus) maintains request counters in the Prometheus text format,
+            for example for the node_exporter textfile collector. Counters from all
+            module invocations that use the same file are added up.
+        type: str
+        choices: [ jsonl, prometheus ]
+        default: jsonl
+        version_added: '2.16.0'
+      cassette_path:
+        description:
+          - Cassette file to record API responses to or to replay them from, see
+            O(instance.cassette_mode).
+          - Cassettes are meant for benchmarking and testing without access to an
+            instance. They are stored gzip compressed when the path ends with C(.gz).
+          - Credentials and OAuth tokens are not recorded, but response bodies are, so
+            treat cassettes like the data they hold.
+        type: path
+        version_added: '2.16.0'
+      cassette_mode:
+        description:
+          - With C(record), requests are sent to the instance and the responses are
+            saved to O(instance.cassette_path) when the plugin finishes.
+          - With C(replay), requests are answered from O(instance.cassette_path)
+            without contacting the instance. Identical requests get the recorded
+            responses in order. Requests that were not recorded fail.
+        type: str
+        choices: [ record, replay ]
+        default: replay
+        version_added: '2.16.0'
+      cassette_latency:
+        description:
+          - Number of seconds added to every replayed response.
+        type: float
+        default: 0
+        version_added: '2.16.0'
+      cassette_bandwidth:
+        description:
+          - Simulated bandwidth for replayed responses in bytes per second.
+          - Set to 0 to serve responses as fast as possible.
+        type: int
+        default: 0
+        version_added: '2.16.0'
+      tinyurl_cache:
+        description:
+          - Whether to reuse TinyURLs for GET requests whose url is too long.
+          - By default, a new TinyURL is created for every such request, including
+            every page of a listing. With the cache, one TinyURL is created per query
+            and the page offset is sent along with it.
+          - The cache lasts for a single plugin run unless O(instance.tinyurl_cache_path)
+            is set.
+        type: bool
+        default: false
+        version_added: '2.16.0'
+      tinyurl_cache_path:
+        description:
+          - JSON file that keeps the TinyURL cache between runs.
+          - Setting this option enables O(instance.tinyurl_cache).
+        type: path
+        version_added: '2.16.0'
+      long_query_strategy:
+        description:
+          - How listings whose query is too long for a url are handled.
+          - C(tinyurl) sends the query through a TinyURL, which costs an extra request.
+          - C(split) splits the longest C(IN) list of the encoded query into several
+            shorter queries and merges their results, so no TinyURLs are needed. The
+            records of the different queries are not sorted together. Queries that
+            cannot be split, for example ones with C(^NQ), still use a TinyURL.
+        type: str
+        choices: [ tinyurl, split ]
+        default: tinyurl
+        version_added: '2.16.0'
+      request_memo:
+        description:
+          - Whether to remember the responses of GET requests for the rest of the
+            plugin run, so that records looked up repeatedly, for example the same
+            user, are only requested once.
+          - A create, update or delete request drops the remembered responses of
+            the table it changes. Changes made by other clients or by business
+            rules to other tables are not noticed.
+          - Identical requests that run at the same time are only sent once.
+        type: bool
+        default: false
+        version_added: '2.16.0'
+      reference_cache:
+        description:
+          - Whether to remember the sys_id of the records that references such as
+            users, assignment groups and configuration items resolve to, so that
+            each reference is looked up once.
+          - A create, update or delete request drops the remembered references of
+            the table it changes.
+          - The cache lasts for a single plugin run unless
+            O(instance.reference_cache_path) is set.
+          - References that are renamed or deleted by something other than this
+            collection keep resolving to the remembered record until
+            O(instance.reference_cache_ttl) passes, so only enable the cache for
+            references that rarely change.
+        type: bool
+        default: false
+        version_added: '2.16.0'
+      reference_cache_path:
+        description:
+          - JSON file that keeps the reference cache between runs, so that later
+            tasks reuse the references resolved by earlier ones.
+          - Only used when O(instance.reference_cache) is enabled.
+          - Only the 10000 most recently used references are kept.
+        type: path
+        version_added: '2.16.0'
+      reference_cache_ttl:
+        description:
+          - Number of seconds a resolved reference is reused for.
+        type: int
+        default: 3600
+        version_added: '2.16.0'
 notes:
   - When a GET request URL exceeds 2048 characters (common with large
     C(sysparm_query) values containing many SysIDs), the request is automatically
@@ -128,6 +128,31 @@ options:
     type: int
     default: 1
     version_added: 2.16.0
+  adaptive_sysparm_limit:
+    description:
+      - Adjust the number of records requested per page between pages, starting from O(sysparm_limit)
+        or O(enhanced_sysparm_limit).
+      - Pages grow while they take less than O(target_page_latency) and shrink when they take longer.
+        A page that times out is requested again with half as many records.
+      - Page sizes stay between 10 and 10000 records.
+      - Ignored if O(max_concurrency) is greater than 1.
+    type: bool
+    default: false
+    version_added: 2.16.0
+  target_page_latency:
+    description:
+      - Number of seconds a page of records should take when O(adaptive_sysparm_limit) is enabled.
+    type: float
+    default: 5
+    version_added: 2.16.0
+  max_page_bytes:
+    description:
+      - Largest size of a page of records in bytes when O(adaptive_sysparm_limit) is enabled.
+      - Pages of large records are requested with fewer records, so that a page stays below this
+        size even when it would be fast enough to grow.
+      - If not set, only O(target_page_latency) limits the size of a page.
+    type: int
+    version_added: 2.16.0
   enhanced_multihop_direction:
     description:
       - Direction to walk the relationship graph when I(enhanced_multihop_max_depth) is greater than 1.
@@ -206,6 +231,25 @@ options:
     type: int
     default: 1000
     version_added: 2.5.0
+  max_concurrency:
+    description:
+      - Maximum number of pages of records that are fetched at the same time.
+      - Once the first page of a query reports the total number of records, the remaining
+        pages are requested in parallel. Hosts are still added in the same order.
+      - Pages that are fetched in parallel are decoded as a whole instead of record by
+        record, so up to this many pages are held in memory at once.
+    type: int
+    default: 1
+    version_added: 2.16.0
+  read_ahead:
+    description:
+      - Number of pages of records that are fetched in the background while the current page
+        is turned into hosts.
+      - With V(0), the next page is only requested once the current one is processed.
+      - Up to this many pages are held in memory on top of the one being processed.
+    type: int
+    default: 0
+    version_added: 2.16.0
 """
 
 EXAMPLES = r"""
@@ -588,6 +632,7 @@ from ansible.utils.vars import combine_vars
 
 from ..module_utils.client import Client
 from ..module_utils.errors import ServiceNowError
+from ..module_utils.page_size import AdaptiveBatchSize
 from ..module_utils.query import parse_query, serialize_query
 from ..module_utils.relations import (
     REL_FIELDS,
@@ -1002,21 +1047,54 @@ class InventoryModule(BaseInventoryPlugin, ConstructableWithLookup, Cacheable):
         except ServiceNowError as e:
             raise AnsibleParserError(e)
 
+        # Records are decoded straight from the connection, so that a page is never
+        # held in memory both as raw data and as a JSON tree.
+        max_concurrency = self.get_option("max_concurrency")
+        read_ahead = self.get_option("read_ahead")
         sysparm_limit = self.get_option("sysparm_limit")
         if sysparm_limit:
-            table_client = TableClient(client, batch_size=sysparm_limit)
+            table_client = TableClient(
+                client,
+                batch_size=sysparm_limit,
+                stream=True,
+                max_concurrency=max_concurrency,
+                batch_sizer=self.__create_batch_sizer(),
+                read_ahead=read_ahead,
+            )
         else:
-            table_client = TableClient(client)
+            table_client = TableClient(
+                client,
+                stream=True,
+                max_concurrency=max_concurrency,
+                batch_sizer=self.__create_batch_sizer(),
+                read_ahead=read_ahead,
+            )
 
         enhanced_table_client = table_client
         enhanced_sysparm_limit = self.get_option("enhanced_sysparm_limit")
         if self.get_option("enhanced") and enhanced_sysparm_limit:
             enhanced_table_client = TableClient(
-                client, batch_size=enhanced_sysparm_limit
+                client,
+                batch_size=enhanced_sysparm_limit,
+                stream=True,
+                max_concurrency=max_concurrency,
+                batch_sizer=self.__create_batch_sizer(),
+                read_ahead=read_ahead,
             )
 
         return table_client, enhanced_table_client
 
+    def __create_batch_sizer(self):
+        if not self.get_option("adaptive_sysparm_limit"):
+            return None
+        try:
+            return AdaptiveBatchSize(
+                target_latency=self.get_option("target_page_latency"),
+                max_page_bytes=self.get_option("max_page_bytes"),
+            )
+        except ServiceNowError as e:
+            raise AnsibleParserError(e)
+
     def __get_query_columns(self, columns):
         query_limit_columns = self.get_option("query_limit_columns")
         query_additional_columns = self.get_option("query_additional_columns")
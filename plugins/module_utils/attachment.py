@@ -11,7 +11,7 @@ import collections
 import mimetypes
 import os
 
-from . import errors
+from . import errors, snow
 
 
 def _path(api_path, *subpaths):
@@ -19,30 +19,18 @@ def _path(api_path, *subpaths):
 
 
 class AttachmentClient:
-    def __init__(self, client, batch_size=10000):
+    def __init__(self, client, batch_size=10000, count=True):
         # 10000 records is default batch size for ServiceNow Attachment REST API, so we also use it
         # as a default.
         self.client = client
         self.batch_size = batch_size
+        self.count = count
 
     def list_records(self, query=None):
-        base_query = dict(query or {}, sysparm_limit=self.batch_size)
-
-        offset = 0
-        total = 1  # Dummy value that ensures loop executes at least once
-        result = []
-
-        while offset < total:
-            response = self.client.get(
-                _path(self.client.api_path),
-                query=dict(base_query, sysparm_offset=offset),
-            )
-
-            result.extend(response.json["result"])
-            total = int(response.headers["x-total-count"])
-            offset += self.batch_size
-
-        return result
+        # Attachment listings are paged like table listings, but without the
+        # query parameters that SNowClient adds for the Table API.
+        pages = snow.SNowClient(self.client, self.batch_size, count=self.count)
+        return list(pages.paginate(_path(self.client.api_path), query or {}))
 
     def create_record(self, query, data, mime_type, check_mode):
         if check_mode:
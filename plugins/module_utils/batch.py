@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+
+from urllib.parse import quote, urlencode
+
+from . import json_codec
+from .client import Response
+from .errors import ServiceNowError, UnexpectedAPIResponse
+
+
+class BatchRequest:
+    """
+    A request that is sent as part of a Batch API call.
+
+    method  -- HTTP method
+    path    -- path relative to the instance (ex: "api/now/table/incident")
+    query   -- query parameters
+    data    -- JSON payload
+    bytes   -- binary payload, sent with the content_type
+    """
+
+    def __init__(
+        self,
+        method,
+        path,
+        query=None,
+        data=None,
+        bytes=None,
+        content_type="application/json",
+    ):
+        if data is not None and bytes is not None:
+            raise AssertionError(
+                "Cannot have JSON and binary payload in a single request."
+            )
+        self.method = method
+        self.path = path
+        self.query = query
+        self.data = data
+        self.bytes = bytes
+        self.content_type = content_type
+
+    def url(self):
+        url = "/" + quote(self.path.strip("/"))
+        if self.query:
+            url = "{0}?{1}".format(url, urlencode(self.query))
+        return url
+
+    def body(self):
+        if self.data is not None:
+            return json_codec.dumps(self.data).encode("utf-8")
+        return self.bytes
+
+
+class BatchClient:
+    """
+    Sends many requests through the Batch API (api/now/v1/batch), chunk_size
+    requests per HTTP round trip.
+
+    ServiceNow may leave some requests of a batch unserviced, for example when
+    the batch takes too long. Those are sent again with the next batch.
+    """
+
+    def __init__(self, client, chunk_size=50):
+        self.client = client
+        self.chunk_size = chunk_size
+        self._batch_count = 0
+
+    def path(self):
+        return "/".join(self.client.api_path + ("v1", "batch"))
+
+    def send(self, requests):
+        """
+        Send the requests and return their responses in the same order.
+
+        Each response is a Response with the status, headers and body of the
+        request it belongs to. Responses with an error status are returned as
+        well; use check() to raise on them.
+        """
+        responses = [None] * len(requests)
+        pending = list(range(len(requests)))
+        while pending:
+            chunk, pending = pending[: self.chunk_size], pending[self.chunk_size :]
+            serviced = self._send_chunk(requests, chunk)
+            if not serviced:
+                raise ServiceNowError(
+                    "The Batch API did not service any of {0} requests.".format(
+                        len(chunk)
+                    )
+                )
+            for index, response in serviced.items():
+                responses[index] = response
+            # Unserviced requests go first, so that they are not starved.
+            pending = [i for i in chunk if i not in serviced] + pending
+        return responses
+
+    def _send_chunk(self, requests, chunk):
+        self._batch_count += 1
+        payload = dict(
+            batch_request_id=str(self._batch_count),
+            rest_requests=[self._encode(index, requests[index]) for index in chunk],
+        )
+        try:
+            result = self.client.post(self.path(), payload).json
+        finally:
+            # The sub-requests bypass Client.request(), which invalidates the
+            # caches for the requests it sends itself.
+            for index in chunk:
+                self.client.invalidate_caches(
+                    requests[index].method, requests[index].url()
+                )
+
+        serviced = {}
+        for item in result.get("serviced_requests") or []:
+            index = int(item["id"])
+            if index in chunk:
+                serviced[index] = self._decode(item)
+        return serviced
+
+    @staticmethod
+    def _encode(index, request):
+        encoded = dict(
+            id=str(index),
+            method=request.method,
+            url=request.url(),
+            headers=[
+                dict(name="Accept", value="application/json"),
+                dict(name="Content-Type", value=request.content_type),
+            ],
+            exclude_response_headers=False,
+        )
+        body = request.body()
+        if body is not None:
+            encoded["body"] = base64.b64encode(body).decode("ascii")
+        return encoded
+
+    def _decode(self, item):
+        headers = [(h["name"], h["value"]) for h in item.get("headers") or []]
+        return Response(
+            int(item["status_code"]),
+            base64.b64decode(item.get("body") or ""),
+            headers,
+            getattr(self.client, "json_decoder_hook", None),
+        )
+
+    @staticmethod
+    def check(responses, statuses=(200, 201, 204)):
+        """
+        Raise UnexpectedAPIResponse for the first response whose status is not
+        one of statuses.
+        """
+        for response in responses:
+            if response.status not in statuses:
+                raise UnexpectedAPIResponse(response.status, response.data)
+        return responses
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .errors import ServiceNowError
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("record", "replay")
+# Requests whose body holds credentials. They are matched without the body and
+# neither the credentials nor the tokens in the response end up in the cassette.
+OAUTH_TOKEN_PATH = "/oauth_token.do"
+REDACTED_RESPONSE_KEYS = ("access_token", "refresh_token")
+# Headers that carry session state and have no value in a replay.
+SKIPPED_HEADERS = ("set-cookie",)
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _to_bytes(data):
+    if data is None:
+        return b""
+    if isinstance(data, bytes):
+        return data
+    if hasattr(data, "read"):
+        raise ServiceNowError("Cannot record requests with file-like bodies.")
+    return str(data).encode("utf-8")
+
+
+def request_key(method, url, data=None):
+    """
+    Return the key that identifies a request in a cassette.
+
+    The scheme and host are left out, so a cassette recorded against one
+    instance can be replayed with any host, and query parameters are sorted.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    target = parts.path + ("?" + query if query else "")
+    if parts.path.endswith(OAUTH_TOKEN_PATH):
+        digest = ""
+    else:
+        body = _uncompressed(_to_bytes(data))
+        digest = hashlib.sha256(body).hexdigest()[:16] if body else ""
+    return method.upper(), target, digest
+
+
+def _uncompressed(body):
+    # Compressed request bodies are matched by their content, so that a request
+    # matches whether or not the client compresses it.
+    if body[:2] != GZIP_MAGIC:
+        return body
+    try:
+        return gzip.decompress(body)
+    except (OSError, EOFError):
+        return body
+
+
+def _encode_body(body):
+    try:
+        return dict(body=body.decode("utf-8"))
+    except UnicodeDecodeError:
+        return dict(body=base64.b64encode(body).decode("ascii"), base64=True)
+
+
+def _decode_body(interaction):
+    body = interaction.get("body", "")
+    if interaction.get("base64"):
+        return base64.b64decode(body)
+    return body.encode("utf-8")
+
+
+def _redact_tokens(body):
+    try:
+        payload = json.loads(body.decode("utf-8"))
+    except ValueError:
+        return body
+    if not isinstance(payload, dict):
+        return body
+    for key in REDACTED_RESPONSE_KEYS:
+        if key in payload:
+            payload[key] = "redacted"
+    return json.dumps(payload).encode("utf-8")
+
+
+class Cassette:
+    """
+    Request/response pairs that a RecordingTransport collects and a
+    ReplayTransport serves back.
+
+    Cassettes are stored as a single JSON document, gzip compressed when the
+    path ends with .gz. Response bodies are kept exactly as received, so
+    compressed responses stay compressed.
+    """
+
+    def __init__(self, path, interactions=None):
+        self.path = path
+        self.interactions = list(interactions or [])
+        self._lock = threading.Lock()
+        self._index = None
+        self._served = {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with _open(path, "rb") as f:
+                content = json.loads(f.read().decode("utf-8"))
+        except (OSError, ValueError) as e:
+            raise ServiceNowError(
+                "Unable to load cassette {0}: {1}".format(path, e)
+            ) from e
+
+        if content.get("version") != CASSETTE_VERSION:
+            raise ServiceNowError(
+                "Unsupported cassette version {0} in {1}.".format(
+                    content.get("version"), path
+                )
+            )
+        return cls(path, content.get("interactions"))
+
+    def save(self):
+        content = json.dumps(
+            dict(version=CASSETTE_VERSION, interactions=self.interactions),
+            separators=(",", ":"),
+        ).encode("utf-8")
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if self.path.endswith(".gz"):
+                    content = gzip.compress(content)
+                f.write(content)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            os.unlink(tmp_path)
+            raise ServiceNowError(
+                "Unable to save cassette {0}: {1}".format(self.path, e)
+            ) from e
+
+    def record(self, method, url, data, status, reason, headers, body):
+        key = request_key(method, url, data)
+        if key[1].split("?", 1)[0].endswith(OAUTH_TOKEN_PATH):
+            body = _redact_tokens(body)
+        interaction = dict(
+            method=key[0],
+            target=key[1],
+            digest=key[2],
+            status=status,
+            reason=reason or "",
+            headers=[
+                [k, v]
+                for k, v in dict(headers or {}).items()
+                if k.lower() not in SKIPPED_HEADERS
+            ],
+            **_encode_body(body)
+        )
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def play(self, method, url, data=None):
+        """
+        Return the next recorded interaction for the request. Identical requests
+        are answered in recording order and once the recordings run out, the
+        last one is repeated.
+        """
+        key = request_key(method, url, data)
+        with self._lock:
+            if self._index is None:
+                self._index = {}
+                for interaction in self.interactions:
+                    self._index.setdefault(
+                        (
+                            interaction["method"],
+                            interaction["target"],
+                            interaction["digest"],
+                        ),
+                        [],
+                    ).append(interaction)
+
+            recorded = self._index.get(key)
+            if not recorded:
+                raise ServiceNowError(
+                    "No recorded response for {0} {1} in cassette {2}.".format(
+                        key[0], key[1], self.path
+                    )
+                )
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            return recorded[min(served, len(recorded) - 1)]
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class ReplayResponse:
+    """
+    Recorded response that mimics the parts of http.client.HTTPResponse the
+    Client uses.
+    """
+
+    def __init__(self, status, reason, headers, body):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._body = io.BytesIO(body)
+
+    def getcode(self):
+        return self.status
+
+    def read(self, amt=None):
+        return self._body.read(-1 if amt is None else amt)
+
+    def close(self):
+        pass
+
+
+class RecordingTransport:
+    """
+    Transport wrapper that records every response the wrapped transport
+    receives, error responses included, into a cassette.
+    """
+
+    def __init__(self, transport, cassette):
+        self.transport = transport
+        self.cassette = cassette
+
+    def open(self, method, url, data=None, **kwargs):
+        # Streaming is not passed on, so the body can be recorded in full.
+        kwargs.pop("stream", None)
+        try:
+            raw_resp = self.transport.open(method, url, data=data, **kwargs)
+        except HTTPError as e:
+            body = e.read()
+            self.cassette.record(method, url, data, e.code, e.reason, e.headers, body)
+            raise HTTPError(url, e.code, e.reason, e.headers, io.BytesIO(body)) from e
+
+        body = raw_resp.read()
+        status = raw_resp.getcode()
+        reason = getattr(raw_resp, "reason", "")
+        self.cassette.record(method, url, data, status, reason, raw_resp.headers, body)
+        return ReplayResponse(status, reason, raw_resp.headers, body)
+
+    def close(self):
+        if hasattr(self.transport, "close"):
+            self.transport.close()
+
+
+class ReplayTransport:
+    """
+    Transport that answers requests from a cassette without any network access.
+
+    latency    -- seconds added to every response
+    bandwidth  -- response bytes per second, 0 means unlimited
+    """
+
+    def __init__(self, cassette, latency=0, bandwidth=0, sleep=time.sleep):
+        self.cassette = cassette
+        self.latency = latency or 0
+        self.bandwidth = bandwidth or 0
+        self.sleep = sleep
+
+    def open(self, method, url, data=None, **kwargs):
+        interaction = self.cassette.play(method, url, data)
+        body = _decode_body(interaction)
+
+        delay = self.latency
+        if self.bandwidth:
+            delay += len(body) / float(self.bandwidth)
+        if delay > 0:
+            self.sleep(delay)
+
+        status = interaction["status"]
+        headers = [tuple(header) for header in interaction["headers"]]
+        if status >= 400:
+            raise HTTPError(
+                url, status, interaction["reason"], dict(headers), io.BytesIO(body)
+            )
+        return ReplayResponse(status, interaction["reason"], headers, body)
+
+
+def create_transport(transport, cassette, mode, latency=0, bandwidth=0):
+    if mode == "record":
+        return RecordingTransport(transport, cassette)
+    if mode == "replay":
+        return ReplayTransport(cassette, latency, bandwidth)
+    raise ServiceNowError(
+        "Unknown cassette mode '{0}', expected one of: {1}.".format(
+            mode, ", ".join(CASSETTE_MODES)
+        )
+    )
@@ -7,15 +7,25 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-import json
+import gzip
+import http.client
 import ssl
+import threading
 import time
 import logging
+import zlib
 
 from urllib.error import HTTPError, URLError
-from urllib.parse import quote, urlencode, parse_qsl
+from urllib.parse import quote, quote_plus, urlencode, parse_qsl
 from ansible.module_utils.urls import Request, basic_auth_header
 
+from . import cassette, connection_pool, json_codec, json_stream, long_query
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, classify_exception, classify_response
+from .observers import RequestEvent, StatsCollector, create_exporter
+from .reference_cache import ReferenceCache
+from .request_memo import RequestMemo, memo_scope
+from .token_cache import TokenCache
 from .errors import (
     AuthError,
     ServiceNowError,
@@ -27,6 +37,100 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_HEADERS = dict(Accept="application/json")
 MAX_URL_LENGTH = 2048
+# Offset used to reserve room for sysparm_offset when a query is split.
+MAX_OFFSET_PROBE = 10**9
+# Parameters that change from page to page of a listing.
+PAGE_PARAMETERS = ("sysparm_offset", "sysparm_no_count")
+ACCEPT_ENCODING = "gzip, deflate"
+# JSON request bodies smaller than this are not worth compressing.
+COMPRESSION_MIN_BODY_SIZE = 8192
+
+
+def decode_content(data, content_encoding):
+    """
+    Decompress a gzip or deflate encoded response body. Bodies with no (or an
+    unknown) content encoding are returned unchanged.
+    """
+    encoding = (content_encoding or "").strip().lower()
+    if not data or encoding not in ("gzip", "x-gzip", "deflate"):
+        return data
+
+    try:
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(data)
+            except zlib.error:
+                # Some servers send raw deflate data without the zlib wrapper.
+                return zlib.decompress(data, -zlib.MAX_WBITS)
+        return gzip.decompress(data)
+    except (OSError, EOFError, zlib.error) as exc:
+        raise ServiceNowError(
+            "Failed to decompress {0} encoded response: {1}".format(encoding, exc)
+        ) from exc
+
+
+class _DecompressingReader:
+    """
+    File-like wrapper that decompresses a gzip or deflate encoded body while it is
+    being read.
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+        # 32 + MAX_WBITS makes zlib detect the gzip or zlib header automatically.
+        self._decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS)
+
+    def read(self, size=-1):
+        while not self._decompressor.eof:
+            chunk = self._raw.read(size)
+            if not chunk:
+                return self._decompressor.flush()
+            data = self._decompressor.decompress(chunk)
+            if data:
+                return data
+        return b""
+
+
+class _CountingReader:
+    """
+    File-like wrapper that counts the bytes read through it.
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.count = 0
+
+    def read(self, size=-1):
+        data = self._raw.read(size)
+        self.count += len(data)
+        return data
+
+
+def decode_stream(raw, content_encoding):
+    """
+    Streaming counterpart of decode_content. Return a file-like object that yields
+    the decompressed body of raw.
+    """
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        return _DecompressingReader(raw)
+    return raw
+
+
+def parse_tinyurl_result(result):
+    """
+    Extract the sysparm_tiny value from a tinyurl API result.
+    """
+    # Response is like "incident_list.do?sysparm_tiny=abc123"
+    # Extract sysparm_tiny value to use with the original REST API path,
+    # because the .do path returns HTML, not JSON.
+    params = dict(parse_qsl(result.split("?", 1)[1])) if "?" in result else {}
+    tiny_value = params.get("sysparm_tiny")
+    if not tiny_value:
+        raise ServiceNowError(
+            f"TinyURL response missing sysparm_tiny parameter: '{result}'"
+        )
+    return tiny_value
 
 
 class Response:
@@ -34,11 +138,11 @@ class Response:
         self, status, data, headers=None, json_decoder_hook=None, max_cache_size=100
     ):
         self.status = status
-        self.data = data
         # [('h1', 'v1'), ('H2', 'V2')] -> {'h1': 'v1', 'h2': 'V2'}
         self.headers = (
             dict((k.lower(), v) for k, v in dict(headers).items()) if headers else {}
         )
+        self.data = decode_content(data, self.headers.get("content-encoding"))
 
         self._json = None
         self.json_decoder_hook = json_decoder_hook
@@ -56,7 +160,7 @@ class Response:
     def json(self):
         if self._json is None:
             try:
-                self._json = json.loads(self.data, object_hook=self.json_decoder_hook)
+                self._json = json_codec.loads(self.data, self.json_decoder_hook)
                 self._cache_entries += 1
                 self._access_count += 1
 
@@ -73,12 +177,119 @@ class Response:
 
         return self._json
 
+    def copy(self):
+        """
+        Return a new response with the same content and its own decoded JSON.
+        """
+        headers = [(k, v) for k, v in self.headers.items() if k != "content-encoding"]
+        return Response(self.status, self.data, headers, self.json_decoder_hook)
+
     def cleanup_if_unused(self, max_access_count=10):
         """Clean up cache if it hasn't been accessed recently"""
         if self._access_count > max_access_count and self._json is not None:
             logger.debug("Clearing unused response cache")
             self.clear_cache()
 
+    def iter_json_array(self, key="result"):
+        """
+        Yield items of the array stored under key one by one.
+
+        If the JSON tree was not built yet, items are decoded straight from the
+        raw data without materializing the whole document.
+        """
+        if self._json is not None:
+            return iter(self._json.get(key) or [])
+        return json_stream.iter_json_array(self.data, key, self.json_decoder_hook)
+
+
+# Errors raised by the connection while a streamed body is read.
+STREAM_READ_ERRORS = (OSError, http.client.HTTPException)
+
+
+def stream_read_error(exception):
+    """
+    Return the ApiCommunicationError for an error raised while a streamed body
+    was read. Socket errors are wrapped in URLError, like the errors raised
+    while the request is sent, so that they are classified the same way.
+    """
+    if isinstance(exception, OSError):
+        exception = URLError(exception)
+    return ApiCommunicationError(
+        exception=exception,
+        message="Failed to read the response from the ServiceNow instance: {0}".format(
+            exception
+        ),
+    )
+
+
+class StreamingResponse:
+    """
+    Response whose body is read lazily from the connection.
+
+    Use iter_json_array() to walk a {"result": [...]} page one record at a time
+    without holding the raw body or the whole JSON tree in memory. Accessing data
+    or json reads the remainder of the body at once, just like Response does.
+    bytes_read is the size of the decoded body read so far.
+    """
+
+    def __init__(self, status, raw, headers=None, json_decoder_hook=None):
+        self.status = status
+        self.headers = (
+            dict((k.lower(), v) for k, v in dict(headers).items()) if headers else {}
+        )
+        self.json_decoder_hook = json_decoder_hook
+        self._raw = raw
+        self._data = None
+        self._json = None
+        self.bytes_read = 0
+
+    @property
+    def data(self):
+        if self._data is None:
+            try:
+                self._data = decode_content(
+                    self._raw.read(), self.headers.get("content-encoding")
+                )
+                self.bytes_read = len(self._data)
+            except STREAM_READ_ERRORS as e:
+                raise stream_read_error(e) from e
+            finally:
+                self.close()
+        return self._data
+
+    @property
+    def json(self):
+        if self._json is None:
+            try:
+                self._json = json_codec.loads(self.data, self.json_decoder_hook)
+            except ValueError as exc:
+                raise ServiceNowError(
+                    "Received invalid JSON response: {0}".format(self.data)
+                ) from exc
+        return self._json
+
+    def iter_json_array(self, key="result"):
+        if self._data is not None:
+            yield from json_stream.iter_json_array(
+                self._data, key, self.json_decoder_hook
+            )
+            return
+
+        reader = _CountingReader(
+            decode_stream(self._raw, self.headers.get("content-encoding"))
+        )
+        try:
+            yield from json_stream.iter_json_array(reader, key, self.json_decoder_hook)
+        except STREAM_READ_ERRORS as e:
+            raise stream_read_error(e) from e
+        finally:
+            self.bytes_read = reader.count
+            self.close()
+
+    def close(self):
+        if hasattr(self._raw, "close"):
+            self._raw.close()
+
 
 class Client:
     def __init__(
@@ -102,6 +313,32 @@ class Client:
         connection_timeout=300,  # 5 minutes
         max_retries=3,
         display=None,
+        connection_pool_size=0,
+        compress_requests=False,
+        rate_limit=0,
+        rate_limit_burst=None,
+        rate_limit_max_wait=120,
+        retry_backoff=0.5,
+        retry_backoff_max=30,
+        retry_deadline=None,
+        retry_rules=None,
+        token_cache=False,
+        token_cache_dir=None,
+        observers=None,
+        collect_stats=False,
+        stats_export_path=None,
+        stats_export_format="jsonl",
+        cassette_path=None,
+        cassette_mode="replay",
+        cassette_latency=0,
+        cassette_bandwidth=0,
+        tinyurl_cache=False,
+        tinyurl_cache_path=None,
+        long_query_strategy="tinyurl",
+        request_memo=False,
+        reference_cache=False,
+        reference_cache_path=None,
+        reference_cache_ttl=3600,
     ):
         if not (host or "").startswith(("https://", "http://")):
             raise ServiceNowError(
@@ -129,12 +366,65 @@ class Client:
         self.connection_timeout = connection_timeout
         self.max_retries = max_retries
         self.display = display
+        self.connection_pool_size = connection_pool_size
+        self.compress_requests = compress_requests
+        self.rate_limiter = RateLimiter(
+            rate=rate_limit or 0,
+            burst=rate_limit_burst,
+            max_wait=rate_limit_max_wait,
+        )
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            backoff_base=retry_backoff,
+            backoff_max=retry_backoff_max,
+            deadline=retry_deadline,
+            rules=retry_rules,
+        )
+        self.token_cache = TokenCache(token_cache_dir) if token_cache else None
+        self.observers = list(observers or [])
+        self.stats = StatsCollector() if collect_stats else None
+        if self.stats:
+            self.observers.append(self.stats)
+        if stats_export_path:
+            self.observers.append(
+                create_exporter(stats_export_path, stats_export_format)
+            )
+        self.cassette_mode = cassette_mode
+        self.cassette_latency = cassette_latency
+        self.cassette_bandwidth = cassette_bandwidth
+        self.cassette = None
+        if cassette_path:
+            self.cassette = (
+                cassette.Cassette.load(cassette_path)
+                if cassette_mode == "replay"
+                else cassette.Cassette(cassette_path)
+            )
+
+        self.tinyurl_cache = (
+            long_query.TinyUrlCache(tinyurl_cache_path)
+            if tinyurl_cache or tinyurl_cache_path
+            else None
+        )
+        if long_query_strategy not in long_query.STRATEGIES:
+            raise ServiceNowError(
+                "Unknown long query strategy '{0}', expected one of: {1}.".format(
+                    long_query_strategy, ", ".join(long_query.STRATEGIES)
+                )
+            )
+        self.long_query_strategy = long_query_strategy
+        self.request_memo = RequestMemo() if request_memo else None
+        self.reference_cache = (
+            ReferenceCache(reference_cache_path, reference_cache_ttl)
+            if reference_cache
+            else None
+        )
 
         self._auth_header = None
         self._token_expiry_time = None
         self._token_refresh_margin = 60  # seconds before expiry to trigger refresh
-        self._client = Request()
+        self._client = self._create_transport()
         self._connection_created = time.time()
+        self._refresh_lock = threading.Lock()
         self._request_count = 0
         self._response_cache = []  # Track response objects for cleanup
         self._max_response_cache = 50  # Maximum cached responses
@@ -165,12 +455,47 @@ class Client:
 
             if hasattr(self._client, "close"):
                 self._client.close()
+            if self.cassette and self.cassette_mode == "record":
+                self.cassette.save()
+            if self.tinyurl_cache:
+                self.tinyurl_cache.save()
+            if self.reference_cache:
+                self.reference_cache.save()
+            for observer in self.observers:
+                observer.close()
             self._auth_header = None
             self._client = None
             logger.debug("Client connections closed")
         except Exception as e:
             logger.warning("Error during client cleanup: %s", e)
 
+    def _create_transport(self):
+        """
+        Create the object that performs HTTP requests.
+
+        A keep-alive connection pool is used when enabled, unless the instance is
+        reached through a proxy, in which case we fall back to a plain Request
+        that opens a new connection for every call. With a cassette, responses
+        are either recorded from that transport or replayed without network access.
+        """
+        if self.cassette and self.cassette_mode == "replay":
+            return cassette.create_transport(
+                None,
+                self.cassette,
+                self.cassette_mode,
+                self.cassette_latency,
+                self.cassette_bandwidth,
+            )
+        if self.connection_pool_size and not connection_pool.is_proxied(self.host):
+            transport = connection_pool.ConnectionPool(self.connection_pool_size)
+        else:
+            transport = Request()
+        if self.cassette:
+            return cassette.create_transport(
+                transport, self.cassette, self.cassette_mode
+            )
+        return transport
+
     def _refresh_connection(self):
         """Refresh the underlying connection"""
         try:
@@ -185,7 +510,7 @@ class Client:
                 response.clear_cache()
         self._response_cache.clear()
 
-        self._client = Request()
+        self._client = self._create_transport()
         self._connection_created = time.time()
         self._request_count = 0
         logger.debug("Connection refreshed")
@@ -275,7 +600,47 @@ class Client:
                 )
             )
 
+    def _token_cache_key(self):
+        if self.grant_type == "refresh_token":
+            secrets = (self.client_secret, self.refresh_token)
+        elif self.grant_type == "client_credentials":
+            secrets = (self.client_secret,)
+        else:
+            secrets = (self.client_secret, self.password)
+        return TokenCache.key(
+            self.host, self.client_id, self.grant_type, self.username, secrets
+        )
+
     def _login_oauth(self):
+        if not self.token_cache:
+            return self._request_oauth_token()
+
+        key = self._token_cache_key()
+        with self.token_cache.lock(key):
+            cached = self.token_cache.get(key, self._token_refresh_margin)
+            if cached:
+                access_token, self._token_expiry_time = cached
+                self._log("Using cached OAuth token")
+                return self._login_token(access_token, is_api_key=False)
+
+            auth_header = self._request_oauth_token()
+            if self._token_expiry_time:
+                self.token_cache.put(
+                    key, self._access_token_from(auth_header), self._token_expiry_time
+                )
+            return auth_header
+
+    @staticmethod
+    def _access_token_from(auth_header):
+        return auth_header["Authorization"].split(" ", 1)[1]
+
+    def _forget_oauth_token(self):
+        self._auth_header = None
+        self._token_expiry_time = None
+        if self.token_cache:
+            self.token_cache.delete(self._token_cache_key())
+
+    def _request_oauth_token(self):
         auth_data = self._login_oauth_generate_auth_data()
         resp = self._request(
             "POST",
@@ -299,14 +664,88 @@ class Client:
         else:
             logger.debug(msg)
 
-    def _request(self, method, path, data=None, headers=None):
-        # Check if connection should be refreshed
+    def add_observer(self, observer):
+        """
+        Register an observer (see observers.Observer) that is notified when a
+        request starts and finishes.
+        """
+        self.observers.append(observer)
+
+    def _notify(self, hook, event):
+        for observer in self.observers:
+            try:
+                getattr(observer, hook)(event)
+            except Exception as e:
+                # Instrumentation must never break the actual request.
+                logger.warning("Observer %s failed in %s: %s", observer, hook, e)
+
+    def stats_result(self):
+        """
+        Return the api_stats entry for module results, or an empty dict if the
+        stats collection is disabled.
+        """
+        if not self.stats:
+            return {}
+        api_stats = self.stats.as_dict()
+        if self.request_memo:
+            api_stats["memo"] = self.request_memo.stats()
+        return dict(api_stats=api_stats)
+
+    def _request(self, method, path, data=None, headers=None, stream=False):
+        event = RequestEvent(method, path, data)
+        self._notify("request_started", event)
+        try:
+            response = self._request_rate_limited(
+                method, path, data, headers, stream, event
+            )
+        except Exception as e:
+            event.finish(error=e.__class__.__name__)
+            self._notify("request_finished", event)
+            raise
+
+        response_bytes = None if stream else len(response.data or b"")
+        event.finish(status=response.status, response_bytes=response_bytes)
+        self._notify("request_finished", event)
+        return response
+
+    def _request_rate_limited(self, method, path, data, headers, stream, event):
+        """
+        Send a request, waiting for the client-side rate limit first and retrying
+        the request when the instance rejects it because of its rate limit.
+        """
+        while True:
+            self._wait_for_rate_limit()
+            response = self._send_request(method, path, data, headers, stream, event)
+            delay = self.rate_limiter.observe(
+                response.status, response.headers, event.throttled, event.throttle_wait
+            )
+            if delay is None:
+                return response
+            self._log(
+                f"ServiceNow: Rate limited ({response.status}), retrying in {delay:.1f}s"
+            )
+            event.throttle_wait += delay
+            event.throttled += 1
+
+    def _wait_for_rate_limit(self):
+        delay = self.rate_limiter.acquire()
+        if delay > 0:
+            self._log(f"ServiceNow: Waiting {delay:.2f}s for the rate limit")
+            time.sleep(delay)
+
+    def _send_request(
+        self, method, path, data=None, headers=None, stream=False, event=None
+    ):
+        # Check if connection should be refreshed. Pages may be fetched from
+        # several threads, only one of them replaces the transport.
         if self._should_refresh_connection():
-            self._refresh_connection()
+            with self._refresh_lock:
+                if self._should_refresh_connection():
+                    self._refresh_connection()
 
         self._log(f"ServiceNow: {method} {path}")
-        if self.custom_headers:
-            headers = dict(headers or {}, **self.custom_headers)
+        headers = dict(headers or {}, **(self.custom_headers or {}))
+        headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
 
         request_kwargs = {
             "data": data,
@@ -315,12 +754,61 @@ class Client:
             "validate_certs": self.validate_certs,
             "client_cert": self.client_certificate_file,
             "client_key": self.client_key_file,
+            # Responses are decompressed by the Response class, so that gzip and
+            # deflate are handled the same way for every transport.
+            "decompress": False,
         }
+        open_kwargs = dict(request_kwargs)
+        if stream and isinstance(self._client, connection_pool.ConnectionPool):
+            open_kwargs["stream"] = True
         request_error_handler = ClientRequestErrorHandler(method, path, request_kwargs)
         request_start = time.perf_counter()
-        for attempt in range(self.max_retries + 1):
+        retry = self.retry_policy.start(method)
+        try:
+            raw_resp = self._open(
+                method, path, open_kwargs, request_error_handler, retry, stream
+            )
+        finally:
+            if event:
+                event.retries += retry.retries
+        if isinstance(raw_resp, Response):
+            # Other HTTP error codes do not necessarily mean errors.
+            # This is for the caller to decide.
+            return raw_resp
+
+        request_elapsed = time.perf_counter() - request_start
+        self._log(f"ServiceNow: Request completed in {request_elapsed:.3f}s")
+
+        # Increment request count for connection management
+        self._request_count += 1
+
+        if stream:
+            # The body is consumed by the caller, so there is nothing to parse or cache.
+            return StreamingResponse(
+                raw_resp.status, raw_resp, raw_resp.headers, self.json_decoder_hook
+            )
+        return self._build_response(raw_resp, event)
+
+    def _open(self, method, path, open_kwargs, request_error_handler, retry, stream):
+        """
+        Open the request, retrying transient failures according to the retry
+        policy. HTTP error responses are returned as a Response.
+
+        Unless the response is streamed, its body is read here as well, so that
+        a connection that breaks while the body is read is retried like one
+        that breaks while the request is sent.
+        """
+        while True:
             try:
-                raw_resp = self._client.open(method, path, **request_kwargs)
+                raw_resp = self._client.open(method, path, **open_kwargs)
+                if stream:
+                    return raw_resp
+                return connection_pool.PooledResponse(
+                    raw_resp.status,
+                    getattr(raw_resp, "reason", ""),
+                    raw_resp.headers,
+                    read_body(raw_resp),
+                )
             except HTTPError as e:
                 # Wrong username/password, or expired access token
                 if e.code == 401:
@@ -329,27 +817,24 @@ class Client:
                             e.code, e.reason
                         ),
                     )
-                # Other HTTP error codes do not necessarily mean errors.
-                # This is for the caller to decide.
-                return Response(e.code, e.read(), e.headers)
-            except Exception as e:
-                # An exception occurred, and we need to parse it to add additional context
-                # for the user. Some errors may be retryable, in which case the loop will be
-                # if the retry limit has not been reached.
-                request_error_handler.handle_request_error(
-                    exception=e, retry_is_allowed=(attempt < self.max_retries)
+                response = Response(e.code, e.read(), e.headers)
+                delay = retry.next_delay(
+                    classify_response(response.status, response.headers)
                 )
-            else:
-                # No exceptions occurred, so the request was successful
-                # and the loop can be exited
-                break
-
-        request_elapsed = time.perf_counter() - request_start
-        self._log(f"ServiceNow: Request completed in {request_elapsed:.3f}s")
+                if delay is None:
+                    return response
+            except Exception as e:
+                delay = retry.next_delay(classify_exception(e))
+                if delay is None:
+                    # Add context for the user and raise.
+                    raise_request_error(request_error_handler, e, retry)
 
-        # Increment request count for connection management
-        self._request_count += 1
+            self._log(
+                f"ServiceNow: {method} {path} failed, retry {retry.retries} in {delay:.2f}s"
+            )
+            time.sleep(delay)
 
+    def _build_response(self, raw_resp, event=None):
         # Create response and track it for cleanup
         parse_start = time.perf_counter()
         response = Response(
@@ -357,6 +842,8 @@ class Client:
         )
         parse_elapsed = time.perf_counter() - parse_start
         self._log(f"ServiceNow: Response parsed in {parse_elapsed:.3f}s")
+        if event:
+            event.parse_elapsed = parse_elapsed
 
         # Add to response cache and cleanup if needed
         self._response_cache.append(response)
@@ -368,7 +855,16 @@ class Client:
 
         return response
 
-    def request(self, method, path, query=None, data=None, headers=None, bytes=None):
+    def request(
+        self,
+        method,
+        path,
+        query=None,
+        data=None,
+        headers=None,
+        bytes=None,
+        stream=False,
+    ):
         # Make sure we only have one kind of payload
         if data is not None and bytes is not None:
             raise AssertionError(
@@ -382,22 +878,54 @@ class Client:
         if query:
             url = "{0}?{1}".format(url, urlencode(query))
         headers = dict(headers or DEFAULT_HEADERS, **self.auth_header)
-        if data is not None:
-            data = json.dumps(data, separators=(",", ":"))
-            headers["Content-type"] = "application/json"
-        elif bytes is not None:
-            data = bytes
+        data = self._encode_payload(headers, data, bytes)
+        # Only pass stream when it is used to keep the call signature unchanged.
+        stream_kwargs = dict(stream=True) if stream else {}
 
         try:
-            return self._request(method, url, data=data, headers=headers)
+            return self._request(
+                method, url, data=data, headers=headers, **stream_kwargs
+            )
         except AuthError:
             if not (self.client_id and self.client_secret):
                 raise
             self._log("OAuth token rejected (401), attempting re-authentication")
-            self._auth_header = None
-            self._token_expiry_time = None
+            self._forget_oauth_token()
             headers.update(self.auth_header)
-            return self._request(method, url, data=data, headers=headers)
+            return self._request(
+                method, url, data=data, headers=headers, **stream_kwargs
+            )
+        finally:
+            self.invalidate_caches(method, url)
+
+    def invalidate_caches(self, method, url):
+        """
+        Drop the request memo and reference cache entries that a method request
+        to url may have made stale. Callers that send writes without request(),
+        such as the Batch API client, must call it for every write they send.
+        """
+        # Failed writes may have been applied as well.
+        if method == "GET":
+            return
+        if self.request_memo:
+            self.request_memo.invalidate(url)
+        table = memo_scope(url)
+        if self.reference_cache and table:
+            self.reference_cache.invalidate(table)
+
+    def _encode_payload(self, headers, data=None, bytes=None):
+        """
+        Serialize the request payload and set the matching headers in place.
+        """
+        if data is not None:
+            data = json_codec.dumps(data)
+            headers["Content-type"] = "application/json"
+            if self.compress_requests and len(data) >= COMPRESSION_MIN_BODY_SIZE:
+                # A fixed mtime keeps the body the same for the same payload.
+                data = gzip.compress(data.encode("utf-8"), mtime=0)
+                headers["Content-Encoding"] = "gzip"
+            return data
+        return bytes
 
     def _build_url(self, path, query=None):
         escaped_path = quote(path.strip("/"))
@@ -415,26 +943,95 @@ class Client:
         resp = self.request("POST", "api/now/tinyurl", data={"url": full_url})
         if resp.status not in (200, 201):
             raise UnexpectedAPIResponse(resp.status, resp.data)
-        result = resp.json.get("result", "")
-        # Response is like "incident_list.do?sysparm_tiny=abc123"
-        # Extract sysparm_tiny value to use with the original REST API path,
-        # because the .do path returns HTML, not JSON.
-        params = dict(parse_qsl(result.split("?", 1)[1])) if "?" in result else {}
-        tiny_value = params.get("sysparm_tiny")
-        if not tiny_value:
-            raise ServiceNowError(
-                f"TinyURL response missing sysparm_tiny parameter: '{result}'"
+        return parse_tinyurl_result(resp.json.get("result", ""))
+
+    def _tinyurl_request(self, path, query):
+        """
+        Split a long query into the url that the TinyURL is created for and
+        the parameters sent along with sysparm_tiny. The offset and the count
+        switch are kept out of the TinyURL, so that all pages of a listing
+        share one.
+        """
+        query = dict(query)
+        extra = {}
+        for name in PAGE_PARAMETERS:
+            if name in query:
+                extra[name] = query.pop(name)
+        return self._build_url(path, query), extra
+
+    def _get_cached_tinyurl(self, path, query, stream_kwargs):
+        url, extra = self._tinyurl_request(path, query)
+        sysparm_tiny = self.tinyurl_cache.get(url)
+        cached = sysparm_tiny is not None
+        if not cached:
+            sysparm_tiny = self._create_tinyurl(url)
+            self.tinyurl_cache.put(url, sysparm_tiny)
+
+        resp = self.request(
+            "GET", path, query=dict(extra, sysparm_tiny=sysparm_tiny), **stream_kwargs
+        )
+        if cached and resp.status != 200:
+            # The TinyURL may have been cleaned up on the instance in the meantime.
+            self._log("ServiceNow: Cached TinyURL was rejected, creating a new one")
+            self.tinyurl_cache.delete(url)
+            sysparm_tiny = self._create_tinyurl(url)
+            self.tinyurl_cache.put(url, sysparm_tiny)
+            resp = self.request(
+                "GET",
+                path,
+                query=dict(extra, sysparm_tiny=sysparm_tiny),
+                **stream_kwargs,
             )
-        return tiny_value
+        return resp
+
+    def split_long_query(self, path, query):
+        """
+        Return a list of queries that together select the same records as query
+        and each fit into a url, by splitting the longest IN list of the encoded
+        query. The query is returned as it is if it fits or cannot be split.
+        """
+        probe = dict(query, sysparm_offset=MAX_OFFSET_PROBE, sysparm_no_count="true")
+        url_length = len(self._build_url(path, probe))
+        if url_length <= MAX_URL_LENGTH or not query.get("sysparm_query"):
+            return [query]
+
+        sysparm_queries = long_query.split_in_query(
+            query["sysparm_query"], url_length, MAX_URL_LENGTH, measure=_url_length
+        )
+        if sysparm_queries is None:
+            return [query]
+        self._log(f"ServiceNow: Split a long query into {len(sysparm_queries)} queries")
+        return [dict(query, sysparm_query=q) for q in sysparm_queries]
+
+    def get(self, path, query=None, stream=False):
+        """
+        Send a GET request. If stream is True, the body of a successful response is
+        not read up front and a StreamingResponse is returned instead.
+
+        With the request memo enabled, responses that are not streamed are served
+        from the memo until a write to the same table invalidates them.
+        """
+        if self.request_memo is None or stream:
+            return self._get(path, query, stream)
+        return self.request_memo.fetch(
+            self._build_url(path, query),
+            lambda: self._get(path, query),
+            Response.copy,
+        )
 
-    def get(self, path, query=None):
+    def _get(self, path, query=None, stream=False):
+        stream_kwargs = dict(stream=True) if stream else {}
         url = self._build_url(path, query)
-        if len(url) > MAX_URL_LENGTH:
+        if len(url) > MAX_URL_LENGTH and self.tinyurl_cache is not None:
+            resp = self._get_cached_tinyurl(path, query, stream_kwargs)
+        elif len(url) > MAX_URL_LENGTH:
             sysparm_tiny = self._create_tinyurl(url)
-            resp = self.request("GET", path, query={"sysparm_tiny": sysparm_tiny})
+            resp = self.request(
+                "GET", path, query={"sysparm_tiny": sysparm_tiny}, **stream_kwargs
+            )
         else:
             self.tinyurl_info = dict(used=False, url_length=len(url))
-            resp = self.request("GET", path, query=query)
+            resp = self.request("GET", path, query=query, **stream_kwargs)
         if resp.status in (200, 404):
             return resp
         raise UnexpectedAPIResponse(resp.status, resp.data)
@@ -464,6 +1061,35 @@ class Client:
         raise UnexpectedAPIResponse(resp.status, resp.data)
 
 
+def _url_length(value):
+    # urlencode() quotes query values with quote_plus.
+    return len(quote_plus(value))
+
+
+def read_body(raw_resp):
+    """
+    Read the rest of the body of raw_resp. Socket errors, timeouts included,
+    are reported as URLError, like the transports report them while sending.
+    """
+    try:
+        return raw_resp.read()
+    except OSError as e:
+        raise URLError(e) from e
+
+
+def raise_request_error(request_error_handler, exception, retry):
+    """
+    Raise the error for a request that the retry policy gave up on, recording
+    the number of retries and the time spent on the request.
+    """
+    try:
+        request_error_handler.handle_request_error(exception=exception)
+    except ApiCommunicationError as e:
+        e.retries = retry.retries
+        e.elapsed = round(retry.elapsed, 3)
+        raise
+
+
 class ClientRequestErrorHandler:
     """
     Handles exceptions that occur during HTTP requests to the ServiceNow instance.
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import http.client
+import functools
+import io
+import logging
+import ssl
+import threading
+
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from .retry import IDEMPOTENT_METHODS
+
+logger = logging.getLogger(__name__)
+
+# Errors that indicate the server closed an idle keep-alive connection before we
+# reused it. Idempotent requests that fail with one of these on a reused
+# connection are resent once on a fresh connection. Other requests may have
+# reached the server already, so the error is raised for the retry policy.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+# The User-Agent that Request.open() sends when it is not given one.
+USER_AGENT = "ansible-httpget"
+
+
+def with_user_agent(headers):
+    """
+    Return a copy of headers that has a User-Agent header.
+    """
+    headers = dict(headers or {})
+    if not any(name.lower() == "user-agent" for name in headers):
+        headers["User-Agent"] = USER_AGENT
+    return headers
+
+
+class PooledResponse:
+    """
+    Fully read response that mimics the parts of http.client.HTTPResponse the
+    Client uses (status, headers and read()).
+    """
+
+    def __init__(self, status, reason, headers, body):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._body = body
+
+    def getcode(self):
+        return self.status
+
+    def read(self):
+        return self._body
+
+    def close(self):
+        pass
+
+
+class PooledStreamResponse:
+    """
+    Response whose body is read from the pooled connection on demand.
+
+    The connection is returned to the pool once the body has been fully read and
+    discarded if the response is closed before that.
+    """
+
+    def __init__(self, raw_resp, release):
+        self.status = raw_resp.status
+        self.reason = raw_resp.reason
+        self.headers = raw_resp.headers
+        self._raw = raw_resp
+        self._release = release
+
+    def getcode(self):
+        return self.status
+
+    def read(self, amt=None):
+        data = self._raw.read(amt)
+        if self._raw.isclosed():
+            self.close()
+        return data
+
+    def close(self):
+        if self._release is None:
+            return
+        release, self._release = self._release, None
+        release(self._raw.isclosed() and not self._raw.will_close)
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    """
+    HTTPS connection that resumes the TLS session of a previous connection to
+    the same host, saving a full handshake when the pool opens a new socket.
+    """
+
+    def __init__(self, host, port=None, timeout=None, context=None, session=None):
+        super(_HTTPSConnection, self).__init__(
+            host, port=port, timeout=timeout, context=context
+        )
+        self.tls_session = session
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        self.sock = self._context.wrap_socket(
+            self.sock, server_hostname=self.host, session=self.tls_session
+        )
+
+
+class _HostPool:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.idle = []
+        self.tls_session = None
+        self.lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Per-host pool of persistent HTTP/1.1 connections.
+
+    The pool exposes an open() method that is compatible with the subset of
+    ansible.module_utils.urls.Request.open() arguments used by the Client, so it
+    can be used as a drop-in transport. Idle connections are kept open (up to
+    maxsize per host) and reused by subsequent requests, which avoids repeating
+    TCP and TLS handshakes for every page of a paginated listing.
+    """
+
+    def __init__(self, maxsize=1):
+        if maxsize < 1:
+            raise ValueError("Connection pool size must be at least 1.")
+        self.maxsize = maxsize
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def open(
+        self,
+        method,
+        url,
+        data=None,
+        headers=None,
+        timeout=None,
+        validate_certs=None,
+        client_cert=None,
+        client_key=None,
+        decompress=None,
+        stream=False,
+    ):
+        # The pool never decompresses response bodies, decompress is only accepted
+        # for compatibility with Request.open().
+        parts = urlsplit(url)
+        key = (
+            parts.scheme,
+            parts.hostname,
+            parts.port,
+            validate_certs is not False,
+            client_cert,
+            client_key,
+        )
+        target = parts.path or "/"
+        if parts.query:
+            target = "{0}?{1}".format(target, parts.query)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        headers = with_user_agent(headers)
+
+        pool = self._get_host_pool(key)
+        conn, reused = self._acquire(pool, key, timeout)
+        try:
+            conn, raw_resp = self._send(
+                pool, key, conn, reused, method, target, data, headers
+            )
+            if stream and raw_resp.status < 400:
+                return PooledStreamResponse(
+                    raw_resp, functools.partial(self._release, pool, conn)
+                )
+            # The whole body must be consumed before the connection can be reused.
+            response = PooledResponse(
+                raw_resp.status, raw_resp.reason, raw_resp.headers, raw_resp.read()
+            )
+        except OSError as e:
+            # Covers ssl.SSLError and socket.timeout too, which Request.open()
+            # also reports as URLError.
+            conn.close()
+            raise URLError(e)
+
+        self._release(pool, conn, not raw_resp.will_close)
+
+        if response.status >= 400:
+            raise HTTPError(
+                url,
+                response.status,
+                response.reason,
+                response.headers,
+                io.BytesIO(response.read()),
+            )
+        return response
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+
+        for pool in pools:
+            with pool.lock:
+                idle, pool.idle = pool.idle, []
+            for conn in idle:
+                conn.close()
+
+    def _get_host_pool(self, key):
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = _HostPool(self.maxsize)
+            return self._pools[key]
+
+    def _acquire(self, pool, key, timeout):
+        with pool.lock:
+            conn = pool.idle.pop() if pool.idle else None
+
+        if conn is None:
+            return self._new_connection(pool, key, timeout), False
+
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _new_connection(self, pool, key, timeout):
+        scheme, host, port, validate_certs, client_cert, client_key = key
+        if scheme == "http":
+            return http.client.HTTPConnection(host, port=port, timeout=timeout)
+
+        return _HTTPSConnection(
+            host,
+            port=port,
+            timeout=timeout,
+            context=_create_ssl_context(validate_certs, client_cert, client_key),
+            session=pool.tls_session,
+        )
+
+    def _release(self, pool, conn, reusable):
+        if not reusable:
+            conn.close()
+            return
+
+        with pool.lock:
+            if isinstance(conn.sock, ssl.SSLSocket) and conn.sock.session is not None:
+                pool.tls_session = conn.sock.session
+            if len(pool.idle) < pool.maxsize:
+                pool.idle.append(conn)
+                return
+
+        conn.close()
+
+    def _send(self, pool, key, conn, reused, method, target, data, headers):
+        try:
+            conn.request(method, target, body=data, headers=headers)
+            return conn, conn.getresponse()
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused or method.upper() not in IDEMPOTENT_METHODS:
+                raise
+
+        logger.debug("Stale pooled connection to %s, reconnecting", key[1])
+        conn = self._new_connection(pool, key, conn.timeout)
+        try:
+            conn.request(method, target, body=data, headers=headers)
+            return conn, conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+
+
+def _create_ssl_context(validate_certs, client_cert, client_key):
+    context = ssl.create_default_context()
+    if not validate_certs:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if client_cert:
+        context.load_cert_chain(client_cert, keyfile=client_key)
+    return context
+
+
+def is_proxied(url):
+    """
+    Return True if environment proxy settings apply to the url. The pool talks to
+    the instance directly, so proxied requests must go through Request instead.
+    """
+    parts = urlsplit(url)
+    return parts.scheme in getproxies() and not proxy_bypass(parts.hostname or "")
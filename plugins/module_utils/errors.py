@@ -49,6 +49,9 @@ class ApiCommunicationError(ServiceNowError):
         self.method = method
         self.path = path
         self.kwargs = kwargs
+        # Filled in by the client once the retry policy gives up on the request.
+        self.retries = 0
+        self.elapsed = None
 
     def to_module_fail_json_output(self):
         return {
@@ -60,6 +63,8 @@ class ApiCommunicationError(ServiceNowError):
             "debug_info": {
                 "method": self.method,
                 "path": self.path,
+                "retries": self.retries,
+                "elapsed": self.elapsed,
                 **{k: v for k, v in self.kwargs.items() if self._is_jsonable(v)},
             },
         }
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import contextlib
+import os
+import tempfile
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+
+@contextlib.contextmanager
+def locked(path):
+    """
+    Hold an exclusive lock on the path.lock file while the block runs, so that
+    processes sharing path take turns. Without fcntl, the block runs unlocked.
+    """
+    fd = os.open(path + ".lock", os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        if HAS_FCNTL:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock.
+        os.close(fd)
+
+
+def write_atomic(path, write, mode=None):
+    """
+    Call write with a file opened for writing and replace path with what it
+    wrote, so readers never see a partially written file. The file is only
+    readable by its owner unless mode says otherwise.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    # mkstemp creates the file with 0600 permissions.
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            write(f)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
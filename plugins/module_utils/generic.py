@@ -12,8 +12,16 @@ from ..module_utils.api import FIELD_SYS_ID, FIELD_ATTRIBUTES_NAME
 
 
 class GenericClient(snow.SNowClient):
-    def __init__(self, client, batch_size=1000):
-        super(GenericClient, self).__init__(client, batch_size)
+    def __init__(
+        self, client, batch_size=1000, max_concurrency=1, count=True, read_ahead=0
+    ):
+        super(GenericClient, self).__init__(
+            client,
+            batch_size,
+            max_concurrency=max_concurrency,
+            count=count,
+            read_ahead=read_ahead,
+        )
 
     def list_records(self, api_path, query=None):
         """
@@ -25,7 +33,7 @@ class GenericClient(snow.SNowClient):
         """
         return self.list(api_path, query)
 
-    def get_record(self, api_path, query, must_exist=False):
+    def get_record(self, api_path, query, must_exist=False, fields=None):
         """
         Return a record matched by the query.
 
@@ -33,9 +41,10 @@ class GenericClient(snow.SNowClient):
         query       -- query in SNow format
         must_exist  -- if true the method throws an expection if the records does not exists.
                        Returns None else.
+        fields      -- names of the fields to return, all fields if not set
         """
 
-        return self.get(api_path, query, must_exist)
+        return self.get(api_path, query, must_exist, fields)
 
     def get_record_by_sys_id(self, api_path, sys_id):
         """
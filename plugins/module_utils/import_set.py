@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import csv
+import itertools
+import time
+
+from . import table
+from .errors import ServiceNowError
+
+# States of the sys_import_set_row records whose transform is done. Rows in
+# any other state are still waiting for their transform.
+ROW_STATES = ("inserted", "updated", "ignored", "skipped", "error")
+ROW_FIELDS = "sys_id,sys_import_state,sys_import_state_comment,sys_target_sys_id"
+# Number of seconds between two looks at the rows of an unfinished import set.
+POLL_INTERVAL = 2
+
+
+def _path(api_path, *subpaths):
+    return "/".join(api_path + ("import",) + subpaths)
+
+
+def chunks(records, size):
+    """
+    Yield lists of up to size records, consuming records lazily.
+    """
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_csv(path):
+    """
+    Yield the rows of the CSV file at path as dicts keyed by its header row.
+    """
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                yield row
+    except (IOError, OSError) as e:
+        raise ServiceNowError("Cannot open {0}: {1}".format(path, e)) from e
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ServiceNowError("Cannot read {0}: {1}".format(path, e)) from e
+
+
+def new_summary(rows):
+    summary = dict(import_set_id=None, multi_import_set_id=None, rows=rows, pending=0)
+    summary.update((state, 0) for state in ROW_STATES)
+    summary["failed_rows"] = []
+    return summary
+
+
+class ImportSetClient:
+    """
+    Loads records into a staging table through the Import Set API, chunk_size
+    records per insertMultiple request, and reports what the transforms of the
+    resulting import sets did.
+
+    ServiceNow transforms the rows after it answers the request, so the rows
+    of every import set are looked at until their transforms are done or
+    transform_timeout seconds passed since the last chunk was sent.
+    """
+
+    def __init__(self, client, chunk_size=1000, transform_timeout=60):
+        if chunk_size < 1:
+            raise ServiceNowError("The chunk size must be at least 1.")
+        self.client = client
+        self.chunk_size = chunk_size
+        self.transform_timeout = transform_timeout
+        self.table_client = table.TableClient(client)
+
+    def insert_multiple(self, staging_table, records):
+        """
+        Insert records into staging_table and return the ids of the import set
+        and the multi import set that ServiceNow created for them.
+        """
+        response = self.client.post(
+            _path(self.client.api_path, staging_table, "insertMultiple"),
+            dict(records=records),
+        ).json
+        return response.get("result", response)
+
+    def list_rows(self, import_set_id):
+        return self.table_client.list_records(
+            "sys_import_set_row",
+            dict(
+                sysparm_query="sys_import_set=" + import_set_id,
+                sysparm_fields=ROW_FIELDS,
+            ),
+        )
+
+    def load(self, staging_table, records, check_mode):
+        """
+        Load records, which can be any iterable, into staging_table and return
+        a summary of every chunk. In check mode, nothing is sent and the
+        summaries only hold the number of rows.
+        """
+        summaries = []
+        for chunk in chunks(records, self.chunk_size):
+            summary = new_summary(len(chunk))
+            if not check_mode:
+                response = self.insert_multiple(staging_table, chunk)
+                summary["import_set_id"] = response.get("import_set_id")
+                summary["multi_import_set_id"] = response.get("multi_import_set_id")
+            summaries.append(summary)
+
+        deadline = time.time() + self.transform_timeout
+        for summary in summaries:
+            if summary["import_set_id"]:
+                self.collect(summary, deadline)
+        return summaries
+
+    def collect(self, summary, deadline):
+        """
+        Count the rows of the import set of summary by state, waiting until
+        deadline for the transforms that are not done yet.
+        """
+        while True:
+            rows = self.list_rows(summary["import_set_id"])
+            pending = [r for r in rows if r.get("sys_import_state") not in ROW_STATES]
+            if not pending or time.time() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+
+        summary["pending"] = len(pending)
+        for row in rows:
+            state = row.get("sys_import_state")
+            if state not in ROW_STATES:
+                continue
+            summary[state] += 1
+            if state == "error":
+                summary["failed_rows"].append(
+                    dict(
+                        sys_id=row["sys_id"],
+                        msg=row.get("sys_import_state_comment", ""),
+                    )
+                )
@@ -82,6 +82,105 @@ INSTANCE_OPTIONS = {
         "type": "bool",
         "default": True,
     },
+    "connection_pool_size": {
+        "type": "int",
+        "default": 0,
+    },
+    "compress_requests": {
+        "type": "bool",
+        "default": False,
+    },
+    "rate_limit": {
+        "type": "float",
+        "default": 0,
+    },
+    "rate_limit_burst": {
+        "type": "int",
+    },
+    "rate_limit_max_wait": {
+        "type": "float",
+        "default": 120,
+    },
+    "max_retries": {
+        "type": "int",
+        "default": 3,
+    },
+    "retry_backoff": {
+        "type": "float",
+        "default": 0.5,
+    },
+    "retry_backoff_max": {
+        "type": "float",
+        "default": 30,
+    },
+    "retry_deadline": {
+        "type": "float",
+    },
+    "retry_rules": {
+        "type": "dict",
+    },
+    "token_cache": {
+        "type": "bool",
+        "default": False,
+    },
+    "token_cache_dir": {
+        "type": "path",
+    },
+    "collect_stats": {
+        "type": "bool",
+        "default": False,
+    },
+    "stats_export_path": {
+        "type": "path",
+    },
+    "stats_export_format": {
+        "type": "str",
+        "choices": ["jsonl", "prometheus"],
+        "default": "jsonl",
+    },
+    "cassette_path": {
+        "type": "path",
+    },
+    "cassette_mode": {
+        "type": "str",
+        "choices": ["record", "replay"],
+        "default": "replay",
+    },
+    "cassette_latency": {
+        "type": "float",
+        "default": 0,
+    },
+    "cassette_bandwidth": {
+        "type": "int",
+        "default": 0,
+    },
+    "tinyurl_cache": {
+        "type": "bool",
+        "default": False,
+    },
+    "tinyurl_cache_path": {
+        "type": "path",
+    },
+    "long_query_strategy": {
+        "type": "str",
+        "choices": ["tinyurl", "split"],
+        "default": "tinyurl",
+    },
+    "request_memo": {
+        "type": "bool",
+        "default": False,
+    },
+    "reference_cache": {
+        "type": "bool",
+        "default": False,
+    },
+    "reference_cache_path": {
+        "type": "path",
+    },
+    "reference_cache_ttl": {
+        "type": "int",
+        "default": 3600,
+    },
 }
 
 
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+# orjson and ujson are optional. They decode large responses several times
+# faster than the standard library, so the fastest one that is installed is used
+# for decoding.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    _fast_loads = orjson.loads
+elif ujson is not None:
+    BACKEND = "ujson"
+    _fast_loads = ujson.loads
+else:
+    BACKEND = "json"
+    _fast_loads = None
+
+
+def apply_object_hook(value, object_hook):
+    """
+    Call object_hook on every object in a decoded JSON document, innermost
+    objects first, and replace each object with the result. This is what
+    json.loads does with its object_hook while parsing.
+    """
+    if isinstance(value, dict):
+        return object_hook(
+            dict((k, apply_object_hook(v, object_hook)) for k, v in value.items())
+        )
+    if isinstance(value, list):
+        return [apply_object_hook(v, object_hook) for v in value]
+    return value
+
+
+def loads(data, object_hook=None):
+    """
+    Decode a JSON document from bytes or str.
+
+    Bytes are handed to the fast backend as they are. The object_hook is
+    applied in a separate pass, so documents without a hook pay nothing for it.
+    Invalid documents raise ValueError, like json.loads does.
+    """
+    if _fast_loads is None:
+        return json.loads(data, object_hook=object_hook)
+
+    try:
+        value = _fast_loads(data)
+    except ValueError:
+        # The standard library accepts a few things the fast backends do not
+        # (NaN, Infinity, ...) and raises the reference error otherwise.
+        return json.loads(data, object_hook=object_hook)
+    if object_hook is None:
+        return value
+    return apply_object_hook(value, object_hook)
+
+
+def dumps(obj):
+    """
+    Encode obj as compact JSON with non-ASCII characters escaped and return it
+    as str.
+
+    The standard library is always used, as request bodies are small and the
+    fast backends cannot escape non-ASCII characters the same way. Request
+    bodies, and the cassette keys that hash them, do not depend on the
+    installed backend.
+    """
+    return json.dumps(obj, separators=(",", ":"))
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import codecs
+import io
+import json
+
+from .errors import ServiceNowError
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+
+class _Scanner:
+    """
+    Incrementally decodes a JSON document read from a binary file object.
+
+    Only a small window of the document is kept in memory: the buffer holds the
+    value that is currently being decoded plus at most one read chunk.
+    """
+
+    def __init__(self, fileobj, object_hook=None, chunk_size=CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder(object_hook=object_hook)
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+
+        chunk = self.fileobj.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buffer = self.buffer[self.pos :] + self.text_decoder.decode(
+                b"", final=True
+            )
+        else:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            self.buffer = self.buffer[self.pos :] + self.text_decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ServiceNowError(
+                "Received invalid JSON response: expected '{0}' but got '{1}'".format(
+                    char, self.buffer[self.pos : self.pos + 20]
+                )
+            )
+        self.pos += 1
+
+    def value(self):
+        """Decode and return the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError as exc:
+                if self._fill():
+                    continue
+                raise ServiceNowError(
+                    "Received invalid JSON response: {0}".format(exc)
+                ) from exc
+            # Scalars such as numbers can be cut in half at the end of the buffer,
+            # so make sure something follows the value before accepting it.
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(fileobj, key="result", object_hook=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield items of the top-level array stored under key in a JSON object, one at a
+    time, without decoding the whole document.
+
+    fileobj      -- binary file object (or bytes/str buffer) holding a JSON object
+                    such as {"result": [{...}, {...}]}
+    key          -- name of the top-level member that holds the array
+    object_hook  -- optional object_hook that is applied just like in json.loads
+
+    Other top-level members are decoded and discarded. If the key is missing or
+    holds null, nothing is yielded.
+    """
+    if isinstance(fileobj, (bytes, str)):
+        fileobj = io.BytesIO(
+            fileobj.encode("utf-8") if isinstance(fileobj, str) else fileobj
+        )
+
+    scanner = _Scanner(fileobj, object_hook=object_hook, chunk_size=chunk_size)
+    scanner.expect("{")
+    if scanner.peek() == "}":
+        return
+
+    while True:
+        member = scanner.value()
+        scanner.expect(":")
+        if member == key and scanner.peek() == "[":
+            for item in _iter_array(scanner):
+                yield item
+        else:
+            scanner.value()
+
+        if scanner.peek() == "}":
+            return
+        scanner.expect(",")
+
+
+def _iter_array(scanner):
+    scanner.expect("[")
+    if scanner.peek() == "]":
+        scanner.pos += 1
+        return
+
+    while True:
+        yield scanner.value()
+        if scanner.peek() == "]":
+            scanner.pos += 1
+            return
+        scanner.expect(",")
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import collections
+import json
+import logging
+import re
+import threading
+
+from .file_utils import locked, write_atomic
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("tinyurl", "split")
+# field IN list, but not field NOT IN list.
+IN_TERM_PATTERN = re.compile(r"^([a-z0-9_.]+)IN(.*)$")
+
+
+def _is_or_term(term):
+    return term.startswith("OR") and not term.startswith("ORDERBY")
+
+
+def _find_in_list(sysparm_query):
+    """
+    Return (terms, index) of the longest IN condition of an encoded query that
+    can be split, or None if there is none.
+
+    A condition can only be split if the query is a plain conjunction around
+    it: ^NQ queries and conditions that are part of an ^OR chain are left alone.
+    """
+    if "^NQ" in sysparm_query:
+        return None
+
+    terms = sysparm_query.split("^")
+    best = None
+    for index, term in enumerate(terms):
+        match = IN_TERM_PATTERN.match(term)
+        if not match:
+            continue
+        if index + 1 < len(terms) and _is_or_term(terms[index + 1]):
+            continue
+        if best is None or len(term) > len(terms[best]):
+            best = index
+    return None if best is None else (terms, best)
+
+
+def split_in_query(sysparm_query, url_length, max_length, measure=len):
+    """
+    Split the longest IN list of an encoded query so that requests with each
+    of the resulting queries fit into max_length.
+
+    url_length  -- length of the url that sysparm_query does not fit into
+    measure     -- returns the length of a string once it is encoded in a url
+
+    Values are deduplicated, so every record matches exactly one of the
+    queries. Returns None if the query cannot be split.
+    """
+    found = _find_in_list(sysparm_query)
+    if found is None:
+        return None
+    terms, index = found
+    field, raw_values = IN_TERM_PATTERN.match(terms[index]).groups()
+
+    budget = max_length - (url_length - measure(raw_values))
+    separator = measure(",")
+    chunks, current, used = [], [], 0
+    for value in collections.OrderedDict.fromkeys(raw_values.split(",")):
+        cost = measure(value) + (separator if current else 0)
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used, cost = [], 0, measure(value)
+        if cost > budget:
+            return None
+        current.append(value)
+        used += cost
+    chunks.append(current)
+
+    return [
+        "^".join(terms[:index] + [field + "IN" + ",".join(chunk)] + terms[index + 1 :])
+        for chunk in chunks
+    ]
+
+
+class TinyUrlCache:
+    """
+    Maps long request urls to the sysparm_tiny values created for them.
+
+    The cache lives in memory. When path is set, entries are loaded from and
+    merged back into that JSON file, so they are reused by later runs. Only the
+    newest max_entries entries are kept.
+    """
+
+    def __init__(self, path=None, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._added = {}
+        self._lock = threading.Lock()
+        if path:
+            self._entries.update(self._read())
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            self._added[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            # None marks the entry for removal from the file.
+            self._added[key] = None
+
+    def save(self):
+        """
+        Merge the entries added since the cache was loaded into the file.
+        """
+        with self._lock:
+            added, self._added = self._added, {}
+        if not self.path or not added:
+            return
+
+        try:
+            with locked(self.path):
+                entries = collections.OrderedDict(self._read())
+                for key, value in added.items():
+                    entries.pop(key, None)
+                    if value is not None:
+                        entries[key] = value
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+                self._write(entries)
+        except OSError as e:
+            logger.warning("Unable to save the TinyURL cache: %s", e)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(entries, list):
+            return []
+        return [
+            tuple(entry)
+            for entry in entries
+            if isinstance(entry, list) and len(entry) == 2
+        ]
+
+    def _write(self, entries):
+        # A list keeps the insertion order, which decides what is evicted.
+        items = [list(item) for item in entries.items()]
+        write_atomic(self.path, lambda f: json.dump(items, f))
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import logging
+import re
+import threading
+import time
+
+from urllib.parse import urlsplit
+
+from .errors import ServiceNowError
+from .file_utils import locked, write_atomic
+
+logger = logging.getLogger(__name__)
+
+SYS_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+EXPORT_FORMATS = ("jsonl", "prometheus")
+
+
+def path_template(url):
+    """
+    Turn a request url into a low-cardinality path: the scheme, host and query
+    are dropped and sys_id path segments are replaced with {sys_id}.
+
+    https://x.service-now.com/api/now/table/incident/<sys_id>?a=b becomes
+    api/now/table/incident/{sys_id}.
+    """
+    segments = urlsplit(url).path.strip("/").split("/")
+    return "/".join(
+        "{sys_id}" if SYS_ID_PATTERN.match(segment) else segment for segment in segments
+    )
+
+
+class RequestEvent:
+    """
+    Information about a single Client request that is passed to observers.
+
+    Fields that are only known once the request is done (status, sizes,
+    elapsed, ...) are None in the request_started event. response_bytes stays
+    None for streamed responses, whose body is read by the caller.
+    """
+
+    def __init__(self, method, url, data=None):
+        self.method = method
+        self.url = url
+        self.path = path_template(url)
+        self.request_bytes = len(data) if data else 0
+        self.started = time.time()
+        self._perf_start = time.perf_counter()
+        self.status = None
+        self.response_bytes = None
+        self.retries = 0
+        self.throttled = 0
+        self.throttle_wait = 0.0
+        self.elapsed = None
+        self.parse_elapsed = None
+        self.error = None
+
+    def finish(self, status=None, response_bytes=None, error=None):
+        self.elapsed = time.perf_counter() - self._perf_start
+        self.status = status
+        self.response_bytes = response_bytes
+        self.error = error
+
+    def as_dict(self):
+        return dict(
+            time=self.started,
+            method=self.method,
+            path=self.path,
+            status=self.status,
+            request_bytes=self.request_bytes,
+            response_bytes=self.response_bytes,
+            retries=self.retries,
+            throttled=self.throttled,
+            throttle_wait=round(self.throttle_wait, 3),
+            elapsed=None if self.elapsed is None else round(self.elapsed, 6),
+            parse_elapsed=(
+                None if self.parse_elapsed is None else round(self.parse_elapsed, 6)
+            ),
+            error=self.error,
+        )
+
+
+class Observer:
+    """
+    Base class for Client observers. Subclasses override the hooks they need.
+    """
+
+    def request_started(self, event):
+        pass
+
+    def request_finished(self, event):
+        pass
+
+    def close(self):
+        pass
+
+
+class StatsCollector(Observer):
+    """
+    Aggregates request events into the api_stats module return value.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.elapsed = 0.0
+        self.by_status = {}
+        self.endpoints = {}
+
+    def request_finished(self, event):
+        with self._lock:
+            self.requests += 1
+            self.errors += 1 if event.error else 0
+            self.retries += event.retries
+            self.throttled += event.throttled
+            self.request_bytes += event.request_bytes
+            self.response_bytes += event.response_bytes or 0
+            self.elapsed += event.elapsed or 0.0
+            status = str(event.status) if event.status else "error"
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+
+            endpoint = self.endpoints.setdefault(
+                (event.method, event.path),
+                dict(
+                    method=event.method,
+                    path=event.path,
+                    count=0,
+                    elapsed=0.0,
+                    max_elapsed=0.0,
+                    response_bytes=0,
+                    retries=0,
+                ),
+            )
+            endpoint["count"] += 1
+            endpoint["elapsed"] += event.elapsed or 0.0
+            endpoint["max_elapsed"] = max(endpoint["max_elapsed"], event.elapsed or 0.0)
+            endpoint["response_bytes"] += event.response_bytes or 0
+            endpoint["retries"] += event.retries
+
+    def as_dict(self):
+        with self._lock:
+            endpoints = sorted(
+                (dict(e) for e in self.endpoints.values()),
+                key=lambda e: e["elapsed"],
+                reverse=True,
+            )
+            for endpoint in endpoints:
+                endpoint["elapsed"] = round(endpoint["elapsed"], 3)
+                endpoint["max_elapsed"] = round(endpoint["max_elapsed"], 3)
+            return dict(
+                requests=self.requests,
+                errors=self.errors,
+                retries=self.retries,
+                throttled=self.throttled,
+                request_bytes=self.request_bytes,
+                response_bytes=self.response_bytes,
+                elapsed=round(self.elapsed, 3),
+                by_status=dict(self.by_status),
+                endpoints=endpoints,
+            )
+
+
+class JsonLinesExporter(Observer):
+    """
+    Appends one JSON document per finished request to a file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def request_finished(self, event):
+        line = json.dumps(event.as_dict(), separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+
+
+class PrometheusTextfileExporter(Observer):
+    """
+    Maintains counters in the Prometheus text format, suitable for the
+    node_exporter textfile collector.
+
+    Counters are accumulated in memory and merged into the file on close(), so
+    the file holds the totals of all clients that exported to it.
+    """
+
+    PREFIX = "servicenow_itsm_"
+    METRICS = (
+        ("requests_total", "Number of ServiceNow API requests."),
+        ("request_duration_seconds_total", "Time spent on ServiceNow API requests."),
+        ("request_retries_total", "Number of retried ServiceNow API requests."),
+        ("response_bytes_total", "Bytes received from the ServiceNow API."),
+    )
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def _add(self, metric, labels, value):
+        key = "{0}{1}{{{2}}}".format(
+            self.PREFIX,
+            metric,
+            ",".join(
+                '{0}="{1}"'.format(name, str(label).replace('"', '\\"'))
+                for name, label in labels
+            ),
+        )
+        self._samples[key] = self._samples.get(key, 0) + value
+
+    def request_finished(self, event):
+        labels = (("method", event.method), ("path", event.path))
+        status = event.status or "error"
+        with self._lock:
+            self._add("requests_total", labels + (("status", status),), 1)
+            self._add("request_duration_seconds_total", labels, event.elapsed or 0.0)
+            self._add("request_retries_total", labels, event.retries)
+            self._add("response_bytes_total", labels, event.response_bytes or 0)
+
+    def close(self):
+        with self._lock:
+            samples, self._samples = self._samples, {}
+        if not samples:
+            return
+
+        try:
+            with locked(self.path):
+                merged = self._read()
+                for key, value in samples.items():
+                    merged[key] = merged.get(key, 0) + value
+                self._write(merged)
+        except OSError as e:
+            logger.warning("Unable to export ServiceNow API metrics: %s", e)
+
+    def _read(self):
+        samples = {}
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    key, value = line.rsplit(" ", 1)
+                    samples[key] = float(value)
+        except (OSError, ValueError):
+            pass
+        return samples
+
+    def _write(self, samples):
+        lines = []
+        for metric, help_text in self.METRICS:
+            name = self.PREFIX + metric
+            lines.append("# HELP {0} {1}".format(name, help_text))
+            lines.append("# TYPE {0} counter".format(name))
+            for key in sorted(samples):
+                if key.startswith(name + "{"):
+                    lines.append("{0} {1}".format(key, _format_number(samples[key])))
+
+        # The collector runs as another user and must never see a partially
+        # written file.
+        text = "\n".join(lines) + "\n"
+        write_atomic(self.path, lambda f: f.write(text), mode=0o644)
+
+
+def _format_number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def create_exporter(path, export_format="jsonl"):
+    if export_format == "prometheus":
+        return PrometheusTextfileExporter(path)
+    if export_format == "jsonl":
+        return JsonLinesExporter(path)
+    raise ServiceNowError(
+        "Unknown export format '{0}', expected one of: {1}.".format(
+            export_format, ", ".join(EXPORT_FORMATS)
+        )
+    )
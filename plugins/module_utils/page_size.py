@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from . import retry
+from .errors import ApiCommunicationError, ServiceNowError
+
+
+def is_read_timeout(exception):
+    return isinstance(
+        exception, ApiCommunicationError
+    ) and retry.READ_TIMEOUT == retry.classify_exception(exception.exception)
+
+
+class AdaptiveBatchSize:
+    """
+    Picks the number of records to ask for in the next page from how long the
+    previous pages took and how large they were.
+
+    min_size        -- smallest page size
+    max_size        -- largest page size
+    target_latency  -- number of seconds a page should take
+    max_page_bytes  -- upper bound for the size of a page body, None for no bound
+
+    The size changes by at most a factor of two between pages, so a single slow
+    or fast page does not swing it from one bound to the other.
+    """
+
+    def __init__(
+        self, min_size=10, max_size=10000, target_latency=5.0, max_page_bytes=None
+    ):
+        if not 0 < min_size <= max_size:
+            raise ServiceNowError(
+                "Invalid page size bounds: {0} to {1}.".format(min_size, max_size)
+            )
+        if target_latency <= 0:
+            raise ServiceNowError("The target page latency must be positive.")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.max_page_bytes = max_page_bytes
+        self.size = None
+
+    def _clamp(self, size):
+        return int(min(max(size, self.min_size), self.max_size))
+
+    def start(self, size):
+        """
+        Return the size of the next page. The first listing starts with size,
+        later listings continue with what the previous ones have learned.
+        """
+        if self.size is None:
+            self.size = self._clamp(size)
+        return self.size
+
+    def observe(self, records, elapsed, response_bytes=None):
+        """
+        Adjust the size after a page with records records that took elapsed
+        seconds and had a body of response_bytes bytes. Return the new size.
+        """
+        if not records or elapsed <= 0:
+            return self.size
+        ideal = self.target_latency * records / elapsed
+        if self.max_page_bytes and response_bytes:
+            ideal = min(ideal, self.max_page_bytes * records / response_bytes)
+        if records < self.size:
+            # A short page tells nothing about how larger pages would do.
+            ideal = min(ideal, self.size)
+        self.size = self._clamp(max(self.size / 2.0, min(ideal, self.size * 2.0)))
+        return self.size
+
+    def shrink(self):
+        """
+        Halve the size after a page timed out. Return False if the size is
+        already at its lower bound.
+        """
+        if self.size <= self.min_size:
+            return False
+        self.size = self._clamp(self.size // 2)
+        return True
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+import time
+
+from email.utils import parsedate_to_datetime
+
+# Statuses that ServiceNow uses to tell the client to slow down. A 503 is only
+# treated as a rate limit when it carries a Retry-After header, other 503s are
+# left for the caller to decide.
+RATE_LIMIT_STATUSES = (429, 503)
+# Backoff used when a 429 response does not say how long to wait.
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+# X-RateLimit-Reset values larger than this are epoch timestamps, smaller ones
+# are a number of seconds.
+EPOCH_THRESHOLD = 10**9
+
+
+def parse_retry_after(value, now=None):
+    """
+    Parse a Retry-After header value, which holds either a number of seconds or
+    an HTTP date, into a number of seconds to wait. Returns None if the value
+    is missing or invalid.
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(retry_at - (time.time() if now is None else now), 0.0)
+
+
+def parse_rate_limit_reset(value, now=None):
+    """
+    Parse an X-RateLimit-Reset header value into a number of seconds to wait.
+    """
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    if reset > EPOCH_THRESHOLD:
+        reset -= time.time() if now is None else now
+    return max(reset, 0.0)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that allows rate requests per second on average
+    and bursts of up to burst requests.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be greater than 0.")
+        self.rate = float(rate)
+        self.capacity = float(burst or max(rate, 1))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token and return the number of seconds to wait before it may be
+        used. The bucket can go into debt, so concurrent callers are spaced out
+        instead of all waking up at the same time.
+        """
+        with self._lock:
+            now = self._clock()
+            elapsed = max(now - self._updated, 0.0)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Client-side view of the instance rate limit.
+
+    rate      -- maximum average number of requests per second, 0 disables
+                 proactive throttling
+    burst     -- number of requests that may be sent back-to-back, defaults to
+                 the rate
+    max_wait  -- maximum number of seconds to spend waiting for the rate limit
+                 to clear before a single request is given up on
+
+    The limiter only computes delays, sleeping is left to the caller.
+    """
+
+    def __init__(self, rate=0, burst=None, max_wait=120, clock=time.monotonic):
+        self.bucket = TokenBucket(rate, burst, clock) if rate else None
+        self.max_wait = max_wait
+        self._clock = clock
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled_responses = 0
+        self.total_wait = 0.0
+
+    def acquire(self):
+        """
+        Return the number of seconds to wait before sending the next request.
+        """
+        delay = self.bucket.reserve() if self.bucket else 0.0
+        with self._lock:
+            delay = max(delay, self._blocked_until - self._clock())
+        return max(delay, 0.0)
+
+    def observe(self, status, headers, attempt=0, waited=0.0):
+        """
+        Update the limiter with the status and (lowercase) headers of a response.
+
+        Returns the number of seconds to wait before retrying the request if it
+        was rejected because of the rate limit, or None if the response should be
+        handed back to the caller. attempt is the number of rate-limited retries
+        of the request so far and waited the time already spent on them.
+        """
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        reset_delay = None
+        if str(headers.get("x-ratelimit-remaining", "")).strip() == "0":
+            reset_delay = parse_rate_limit_reset(headers.get("x-ratelimit-reset"))
+
+        delay = None
+        if status == 429 or (status == 503 and retry_after is not None):
+            self.throttled_responses += 1
+            delay = retry_after
+            if delay is None:
+                delay = reset_delay
+            if delay is None:
+                delay = min(DEFAULT_BACKOFF * 2**attempt, MAX_BACKOFF)
+        elif reset_delay:
+            # The quota is used up, hold back the following requests.
+            self._block(reset_delay)
+            return None
+
+        if delay is None:
+            return None
+        if waited + delay > self.max_wait:
+            return None
+
+        self._block(delay)
+        self.total_wait += delay
+        return delay
+
+    def _block(self, delay):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + delay)
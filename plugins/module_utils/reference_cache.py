@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import collections
+import json
+import logging
+import threading
+import time
+
+from .file_utils import locked, write_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceCache:
+    """
+    Maps (table, column, value) to the sys_id of the record whose column holds
+    value, so that references such as users and groups are looked up once.
+
+    Entries expire ttl seconds after they were looked up and only the
+    max_entries most recently used ones are kept. When path is set, entries are
+    loaded from and merged back into that JSON file, so that later runs share
+    them.
+    """
+
+    def __init__(self, path=None, ttl=3600, max_entries=10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        # Entries that were added or used since the cache was loaded, and the
+        # tables whose entries were dropped.
+        self._changed = {}
+        self._invalidated = set()
+        self._lock = threading.Lock()
+        if path:
+            self._entries.update(self._read())
+
+    @staticmethod
+    def _key(table, column, value):
+        return table, column, str(value)
+
+    def get(self, table, column, value):
+        key = self._key(table, column, value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry[1]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            # Used entries are kept in the file the longest as well.
+            self._changed[key] = entry
+            return entry[0]
+
+    def put(self, table, column, value, sys_id):
+        key = self._key(table, column, value)
+        entry = (sys_id, time.time() + self.ttl)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            self._changed[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, table):
+        """
+        Drop the entries of table, here and in the file once the cache is saved.
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == table]:
+                del self._entries[key]
+            for key in [k for k in self._changed if k[0] == table]:
+                del self._changed[key]
+            self._invalidated.add(table)
+
+    def save(self):
+        """
+        Merge the changes made since the cache was loaded into the file.
+        """
+        with self._lock:
+            changed, self._changed = self._changed, {}
+            invalidated, self._invalidated = self._invalidated, set()
+        if not self.path or not (changed or invalidated):
+            return
+
+        try:
+            with locked(self.path):
+                entries = collections.OrderedDict(
+                    item for item in self._read() if item[0][0] not in invalidated
+                )
+                for key, entry in changed.items():
+                    entries.pop(key, None)
+                    entries[key] = entry
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+                self._write(entries)
+        except OSError as e:
+            logger.warning("Unable to save the reference cache: %s", e)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(entries, list):
+            return []
+        now = time.time()
+        return [
+            (tuple(entry[:3]), (entry[3], entry[4]))
+            for entry in entries
+            if isinstance(entry, list)
+            and len(entry) == 5
+            and isinstance(entry[4], (int, float))
+            and entry[4] > now
+        ]
+
+    def _write(self, entries):
+        # A list keeps the order of use, which decides what is evicted.
+        items = [list(key) + list(entry) for key, entry in entries.items()]
+        write_atomic(self.path, lambda f: json.dump(items, f))
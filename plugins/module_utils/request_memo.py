@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import collections
+import threading
+
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+OTHER_SCOPE = None
+# POST requests that do not change any records.
+READ_ONLY_ENDPOINTS = ("tinyurl",)
+
+
+def _segments(url):
+    return [s for s in urlsplit(url).path.split("/") if s]
+
+
+def memo_key(url):
+    """
+    Normalize a url, so that requests that only differ in the order of their
+    query parameters share a memo entry.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return "{0}://{1}{2}?{3}".format(
+        parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), query
+    )
+
+
+def memo_scope(url):
+    """
+    Return the table that a url reads or writes, or OTHER_SCOPE if the url does
+    not belong to the Table API.
+    """
+    segments = _segments(url)
+    for index, segment in enumerate(segments[:-1]):
+        if segment == "table":
+            return segments[index + 1]
+    return OTHER_SCOPE
+
+
+class _Call:
+    """
+    A request in flight that other threads wait for instead of repeating it.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class RequestMemo:
+    """
+    Memo of successful GET responses for the duration of a run.
+
+    Entries are keyed by the normalized url. A write invalidates the entries of
+    the table it targets; writes outside of the Table API (CMDB Instance API,
+    attachments, ...) and reads outside of it are not tracked per table, so such
+    writes clear the memo and table writes also drop non-table entries. Parent
+    and child tables are not related, so a write to incident does not
+    invalidate reads of task.
+
+    Concurrent identical requests are coalesced: the first one is sent and the
+    others wait for its response.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._inflight = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def stats(self):
+        return dict(hits=self.hits, misses=self.misses, coalesced=self.coalesced)
+
+    def invalidate(self, url):
+        """
+        Drop the entries that a write to url may have made stale.
+        """
+        segments = _segments(url)
+        if segments and segments[-1] in READ_ONLY_ENDPOINTS:
+            return
+        scope = memo_scope(url)
+        with self._lock:
+            self._generation += 1
+            if scope is OTHER_SCOPE:
+                self._entries.clear()
+                return
+            for key, (entry_scope, _response) in list(self._entries.items()):
+                if entry_scope in (scope, OTHER_SCOPE):
+                    del self._entries[key]
+
+    def _lookup(self, url):
+        """
+        Return (key, response, call, generation, owner). response is set on a
+        hit. Otherwise the caller either owns call (it sends the request) or
+        waits for it.
+        """
+        key = memo_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return key, entry[1], None, None, False
+            call = self._inflight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return key, None, call, None, False
+            self.misses += 1
+            call = self._inflight[key] = _Call()
+            return key, None, call, self._generation, True
+
+    def _store(self, key, url, generation, response):
+        with self._lock:
+            self._inflight.pop(key, None)
+            # Responses that raced with a write may be stale.
+            if generation == self._generation and response.status == 200:
+                self._entries[key] = (memo_scope(url), response)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def _discard(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def fetch(self, url, send, copy):
+        """
+        Return the response for url from the memo or by calling send(). copy
+        turns a stored response into one the caller may modify.
+        """
+        key, response, call, generation, owner = self._lookup(url)
+        if response is not None:
+            return copy(response)
+        if not owner:
+            return copy(call.wait())
+
+        try:
+            response = send()
+        except BaseException as e:
+            self._discard(key)
+            call.error = e
+            call.done.set()
+            raise
+        self._store(key, url, generation, response)
+        call.response = response
+        call.done.set()
+        return copy(response)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import http.client
+import random
+import socket
+import time
+
+from urllib.error import URLError
+
+from .errors import ServiceNowError
+
+# Methods that can be repeated without changing the outcome. Other methods
+# (POST and PATCH) are only retried when the request never reached the instance.
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+# Error classes
+HANDSHAKE_TIMEOUT = "handshake_timeout"
+CONNECT_ERROR = "connect_error"
+CONNECTION_RESET = "connection_reset"
+READ_TIMEOUT = "read_timeout"
+SERVER_ERROR = "server_error"
+
+# Rules
+ALWAYS = "always"
+IDEMPOTENT = "idempotent"
+NEVER = "never"
+
+DEFAULT_RULES = {
+    # Nothing was sent to the instance yet, so any request can be repeated.
+    HANDSHAKE_TIMEOUT: ALWAYS,
+    CONNECT_ERROR: ALWAYS,
+    # The instance may have processed the request before the failure.
+    CONNECTION_RESET: IDEMPOTENT,
+    READ_TIMEOUT: IDEMPOTENT,
+    SERVER_ERROR: IDEMPOTENT,
+}
+RETRY_STATUSES = (502, 503, 504)
+
+_RESET_ERRORS = (
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+    http.client.RemoteDisconnected,
+    http.client.IncompleteRead,
+)
+
+
+def classify_exception(exception):
+    """
+    Return the error class of an exception raised while sending a request, or
+    None if the error is not transient.
+    """
+    reason = exception.reason if isinstance(exception, URLError) else exception
+    if str(reason).endswith("The handshake operation timed out"):
+        return HANDSHAKE_TIMEOUT
+    if isinstance(reason, ConnectionRefusedError):
+        return CONNECT_ERROR
+    if isinstance(reason, _RESET_ERRORS):
+        return CONNECTION_RESET
+    if isinstance(reason, (socket.timeout, TimeoutError)) or str(reason) == "timed out":
+        return READ_TIMEOUT
+    return None
+
+
+def classify_response(status, headers):
+    """
+    Return the error class of a response, or None if it should be handed to the
+    caller. Responses with a Retry-After header are left to the rate limiter.
+    """
+    if status in RETRY_STATUSES and "retry-after" not in headers:
+        return SERVER_ERROR
+    return None
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is sent again.
+
+    max_retries   -- maximum number of retries of a single request
+    backoff_base  -- upper bound of the first delay in seconds, doubled on every
+                     retry (exponential backoff with full jitter)
+    backoff_max   -- cap for the upper bound of a single delay in seconds
+    deadline      -- maximum number of seconds a request (including retries) may
+                     take before it is given up on, None means no limit
+    rules         -- mapping of error classes to always, idempotent or never,
+                     merged over DEFAULT_RULES
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff_base=0.5,
+        backoff_max=30,
+        deadline=None,
+        rules=None,
+        random=random.random,
+        clock=time.monotonic,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.rules = dict(DEFAULT_RULES)
+        for error_class, rule in (rules or {}).items():
+            if error_class not in DEFAULT_RULES:
+                raise ServiceNowError(
+                    "Unknown retry error class '{0}'. Valid classes are: {1}.".format(
+                        error_class, ", ".join(sorted(DEFAULT_RULES))
+                    )
+                )
+            if rule not in (ALWAYS, IDEMPOTENT, NEVER):
+                raise ServiceNowError(
+                    "Invalid retry rule '{0}' for '{1}'. Valid rules are: "
+                    "always, idempotent, never.".format(rule, error_class)
+                )
+            self.rules[error_class] = rule
+        self.random = random
+        self.clock = clock
+
+    def start(self, method):
+        return RetryState(self, method)
+
+    def is_retryable(self, method, error_class):
+        rule = self.rules.get(error_class, NEVER)
+        if rule == ALWAYS:
+            return True
+        return rule == IDEMPOTENT and method.upper() in IDEMPOTENT_METHODS
+
+    def backoff(self, retries):
+        return self.random() * min(self.backoff_max, self.backoff_base * 2**retries)
+
+
+class RetryState:
+    """
+    Retry bookkeeping for a single request.
+    """
+
+    def __init__(self, policy, method):
+        self.policy = policy
+        self.method = method
+        self.retries = 0
+        self.started = policy.clock()
+
+    @property
+    def elapsed(self):
+        return self.policy.clock() - self.started
+
+    def next_delay(self, error_class):
+        """
+        Return the number of seconds to wait before retrying a request that
+        failed with error_class, or None if the request must not be retried.
+        """
+        policy = self.policy
+        if error_class is None or not policy.is_retryable(self.method, error_class):
+            return None
+        if self.retries >= policy.max_retries:
+            return None
+
+        delay = policy.backoff(self.retries)
+        if policy.deadline is not None and self.elapsed + delay > policy.deadline:
+            return None
+
+        self.retries += 1
+        return delay
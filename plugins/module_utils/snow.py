@@ -7,19 +7,107 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import collections
 import gc
 import logging
+import queue
+import threading
+import time
 
-from . import errors
+from concurrent.futures import ThreadPoolExecutor
+
+from . import errors, page_size
 
 logger = logging.getLogger(__name__)
 
+PAGINATION_MODES = ("offset", "keyset")
+# Records are handed from the read-ahead worker to the consumer in chunks of at
+# most this many records, so that the queue is not locked once per record.
+READ_AHEAD_CHUNK_SIZE = 100
+# Seconds the read-ahead worker waits for room in the queue before it checks
+# whether the consumer is gone.
+READ_AHEAD_POLL_INTERVAL = 0.1
+
+
+def keyset_query(sysparm_query, field, last=None):
+    """
+    Return sysparm_query ordered by field and, if last is set, limited to the
+    records whose field sorts after last. The condition is added to every ^NQ
+    branch of the query.
+    """
+    branches = sysparm_query.split("^NQ") if sysparm_query else [""]
+    for branch in branches:
+        if any(term.startswith("ORDERBY") for term in branch.split("^")):
+            raise errors.ServiceNowError(
+                "Keyset pagination orders records by {0}, the query cannot be "
+                "ordered by other fields.".format(field)
+            )
+    if last is not None:
+        condition = "{0}>{1}".format(field, last)
+        branches = [
+            "{0}^{1}".format(branch, condition) if branch else condition
+            for branch in branches
+        ]
+    query = "^NQ".join(branches)
+    return "{0}^ORDERBY{1}".format(query, field) if query else "ORDERBY" + field
+
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
 
 class SNowClient:
-    def __init__(self, client, batch_size=1000, memory_efficient=False):
+    def __init__(
+        self,
+        client,
+        batch_size=1000,
+        memory_efficient=False,
+        stream=False,
+        max_concurrency=1,
+        pagination="offset",
+        keyset_field="sys_id",
+        batch_sizer=None,
+        count=True,
+        read_ahead=0,
+    ):
+        if pagination not in PAGINATION_MODES:
+            raise errors.ServiceNowError(
+                "Unknown pagination mode '{0}', expected one of: {1}.".format(
+                    pagination, ", ".join(PAGINATION_MODES)
+                )
+            )
         self.client = client
         self.batch_size = batch_size
         self.memory_efficient = memory_efficient
+        # When enabled, records are decoded one by one straight from the
+        # connection instead of materializing every page as a whole JSON tree.
+        self.stream = stream
+        # Number of pages fetched at the same time once the first page tells
+        # the total record count.
+        self.max_concurrency = max(max_concurrency or 1, 1)
+        # With keyset pagination, records are ordered by the unique
+        # keyset_field and every page starts after the last record of the
+        # previous one instead of at an offset.
+        self.pagination = pagination
+        self.keyset_field = keyset_field
+        # An AdaptiveBatchSize that picks the size of every page, starting
+        # from batch_size. Pages fetched concurrently keep batch_size.
+        self.batch_sizer = batch_sizer
+        # Only the first page of an offset listing asks for the total record
+        # count, later pages are sent with sysparm_no_count. Without count, no
+        # page is counted and a short page ends the listing.
+        self.count = count
+        # Number of pages a background worker fetches ahead of the consumer,
+        # so that the next pages are requested while the current one is
+        # processed. At most about this many pages wait in memory.
+        self.read_ahead = max(read_ahead or 0, 0)
         self._memory_cleanup_interval = 50  # Decrease for more frequent cleanup
         self._batch_count = 0
 
@@ -28,12 +116,15 @@ class SNowClient:
         gc.collect()
         logger.debug("Memory cleanup performed")
 
-    def _log_batch(self, batch_size, offset, total):
+    def _log(self, msg):
         display = getattr(self.client, "display", None)
         if display:
-            display.vvv(
-                f"ServiceNow: Fetched {batch_size} records (offset={offset}, total={total})"
-            )
+            display.vvv(msg)
+
+    def _log_batch(self, batch_size, offset, total):
+        self._log(
+            f"ServiceNow: Fetched {batch_size} records (offset={offset}, total={total})"
+        )
 
     def list(self, api_path, query=None):
         if self.memory_efficient:
@@ -43,89 +134,340 @@ class SNowClient:
 
     def _list_accumulate(self, api_path, query=None):
         """Original list method that accumulates all results"""
-        base_query = self._sanitize_query(query)
-        base_query["sysparm_limit"] = self.batch_size
+        return list(self.list_generator(api_path, query))
 
+    def list_generator(self, api_path, query=None):
+        """Memory-efficient generator-based listing"""
+        yield from self.paginate(api_path, self._sanitize_query(query))
+
+    def paginate(self, api_path, query):
+        """
+        Yield the records of every page of api_path that match the query, which
+        is sent as it is.
+        """
+        records = self._paginate(api_path, dict(query, sysparm_limit=self.batch_size))
+        if self.read_ahead:
+            records = self._read_ahead(records)
+        yield from records
+
+    def _paginate(self, api_path, base_query):
+        list_pages = (
+            self._list_keyset if self.pagination == "keyset" else self._list_pages
+        )
+        for chunk_query in self._split_long_query(api_path, base_query):
+            yield from list_pages(api_path, chunk_query)
+
+    def _read_ahead(self, records):
+        """
+        Iterate over records on a background worker and yield them in the same
+        order. The worker keeps going while the consumer processes records, but
+        stops once about read_ahead pages of records are waiting.
+        """
+        chunk_size = min(self.batch_size, READ_AHEAD_CHUNK_SIZE)
+        chunks = queue.Queue(-(-self.read_ahead * self.batch_size // chunk_size))
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(self._produce_chunks, records, chunk_size, chunks, stop)
+            try:
+                while True:
+                    kind, value = chunks.get()
+                    if kind == "error":
+                        raise value
+                    if kind == "done":
+                        return
+                    yield from value
+            finally:
+                # The consumer may stop early, the worker drops what it fetched.
+                stop.set()
+
+    @staticmethod
+    def _produce_chunks(records, chunk_size, chunks, stop):
+        def put(item):
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=READ_AHEAD_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            for chunk in _chunks(records, chunk_size):
+                if not put(("records", chunk)):
+                    return
+            put(("done", None))
+        except Exception as e:
+            put(("error", e))
+        finally:
+            records.close()
+
+    def _split_long_query(self, api_path, query):
+        # Queries too long for a url are sent through a TinyURL by the client,
+        # unless it is configured to split them into several shorter queries.
+        if getattr(self.client, "long_query_strategy", None) != "split":
+            return [query]
+        return self.client.split_long_query(api_path, query)
+
+    def _list_pages(self, api_path, base_query):
+        """
+        Page through the records by offset. Counting the matching records costs
+        the instance a query of its own for every counted page, so only pages up
+        to the first one that reports the total are counted. When the total is
+        not known (count is disabled or the API does not report it), a short
+        page ends the listing.
+        """
         offset = 0
-        total = 1  # Dummy value that ensures loop executes at least once
-        result = []
-
-        while offset < total:
-            response = self.client.get(
-                api_path,
-                query=dict(base_query, sysparm_offset=offset),
-            )
-
-            batch = response.json["result"]
-            result.extend(batch)
-            # This is a header only for Table API.
-            # When using this client for generic api, the header is not present anymore
-            # and we need to find a new method to break from the loop
-            # It can be removed from Table API but for it's better to keep it for now.
-            if "x-total-count" in response.headers:
+        total = None
+
+        while total is None or offset < total:
+            limit = self._page_limit()
+            page = dict(records=0, response=None, timed_out=False)
+            page_query = dict(base_query, sysparm_offset=offset, sysparm_limit=limit)
+            if total is not None or not self.count:
+                page_query["sysparm_no_count"] = "true"
+            yield from self._page(api_path, page_query, page)
+            if page["timed_out"]:
+                # Ask again for the records of the page that were not received.
+                offset += page["records"]
+                continue
+            response, batch_size = page["response"], page["records"]
+
+            # This is a header only for Table API, other APIs (and pages sent
+            # with sysparm_no_count) do not report it.
+            if total is None and "x-total-count" in response.headers:
                 total = int(response.headers["x-total-count"])
-            else:
-                if len(batch) == 0:
-                    break
 
-            self._log_batch(len(batch), offset, total)
+            self._log_batch(batch_size, offset, "unknown" if total is None else total)
 
-            offset += self.batch_size
+            offset += limit
+            if total is None and batch_size < limit:
+                return
+            if self._fetch_concurrently(offset, total):
+                yield from self._list_concurrent(api_path, base_query, offset, total)
+                return
 
             # Memory cleanup
             self._batch_count += 1
             if self._batch_count % self._memory_cleanup_interval == 0:
                 self._cleanup_memory()
 
-        return result
-
-    def list_generator(self, api_path, query=None):
-        """Memory-efficient generator-based listing"""
-        base_query = self._sanitize_query(query)
-        base_query["sysparm_limit"] = self.batch_size
-
-        offset = 0
-        total = 1  # Dummy value that ensures loop executes at least once
-
-        while offset < total:
-            response = self.client.get(
-                api_path,
-                query=dict(base_query, sysparm_offset=offset),
+    def _fetch_concurrently(self, offset, total):
+        return self.max_concurrency > 1 and total is not None and offset < total
+
+    def _list_concurrent(self, api_path, base_query, offset, total):
+        """
+        Fetch the pages from offset up to total on a pool of max_concurrency
+        threads and yield their records in offset order. At most
+        max_concurrency pages are requested ahead of the consumer.
+        """
+        offsets = iter(range(offset, total, self.batch_size))
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            try:
+                for page_offset in offsets:
+                    pending.append(
+                        (
+                            page_offset,
+                            executor.submit(
+                                self._fetch_page_records,
+                                api_path,
+                                dict(
+                                    base_query,
+                                    sysparm_offset=page_offset,
+                                    sysparm_no_count="true",
+                                ),
+                            ),
+                        )
+                    )
+                    if len(pending) < self.max_concurrency:
+                        continue
+                    yield from self._next_page_records(pending, total)
+                while pending:
+                    yield from self._next_page_records(pending, total)
+            finally:
+                # The consumer may stop early, pages it did not ask for are dropped.
+                for _offset, future in pending:
+                    future.cancel()
+
+    def _next_page_records(self, pending, total):
+        page_offset, future = pending.popleft()
+        records = future.result()
+        self._log_batch(len(records), page_offset, total)
+        self._batch_count += 1
+        if self._batch_count % self._memory_cleanup_interval == 0:
+            self._cleanup_memory()
+        return records
+
+    def _fetch_page_records(self, api_path, query):
+        # Pages fetched by the pool are decoded as a whole in the worker thread.
+        return self.client.get(api_path, query=query).json["result"]
+
+    def _list_keyset(self, api_path, base_query):
+        """
+        Page through the records ordered by keyset_field, asking for the records
+        after the last one seen instead of an offset. Pages cost the same at any
+        depth and records that change during the listing are neither skipped nor
+        repeated. The total is not counted; a short page ends the listing.
+        """
+        query = dict(base_query, sysparm_no_count="true")
+        sysparm_query = query.get("sysparm_query") or ""
+        fields, added_field = self._keyset_fields(query.get("sysparm_fields"))
+        if fields:
+            query["sysparm_fields"] = fields
+
+        last, fetched = None, 0
+        while True:
+            limit = self._page_limit()
+            page = dict(records=0, response=None, timed_out=False)
+            page_query = dict(
+                query,
+                sysparm_limit=limit,
+                sysparm_query=keyset_query(sysparm_query, self.keyset_field, last),
+            )
+            for record in self._page(api_path, page_query, page):
+                last = self._keyset_value(record)
+                if added_field:
+                    record.pop(self.keyset_field, None)
+                yield record
+
+            self._log_batch(page["records"], fetched, "unknown")
+            fetched += page["records"]
+            if not page["timed_out"] and page["records"] < limit:
+                return
+
+    def _keyset_fields(self, sysparm_fields):
+        """
+        Return the sysparm_fields with keyset_field in them and whether it had
+        to be added.
+        """
+        if not sysparm_fields:
+            return sysparm_fields, False
+        fields = [f.strip() for f in sysparm_fields.split(",")]
+        if self.keyset_field in fields:
+            return sysparm_fields, False
+        return ",".join(fields + [self.keyset_field]), True
+
+    def _keyset_value(self, record):
+        value = record.get(self.keyset_field)
+        if isinstance(value, dict):
+            value = value.get("value")
+        if value in (None, ""):
+            raise errors.ServiceNowError(
+                "Keyset pagination needs a {0} value in every record.".format(
+                    self.keyset_field
+                )
+            )
+        return value
+
+    def _page_limit(self):
+        if self.batch_sizer is None or self.max_concurrency > 1:
+            return self.batch_size
+        return self.batch_sizer.start(self.batch_size)
+
+    def _page(self, api_path, query, page):
+        """
+        Yield the records of a page, counting them and keeping the response in
+        page. With an adaptive batch size, the time the page took (without the
+        time the consumer spent on its records) adjusts the size of the next
+        page. A read timeout halves the size and sets page["timed_out"] instead
+        of raising, so that the caller can ask for the rest of the page again.
+        """
+        started, consumer_time = time.monotonic(), 0.0
+        try:
+            page["response"] = self._get_page(api_path, query)
+            for record in self._page_records(page["response"]):
+                page["records"] += 1
+                yielded = time.monotonic()
+                yield record
+                consumer_time += time.monotonic() - yielded
+        except errors.ApiCommunicationError as e:
+            if not self._shrink_after_timeout(e):
+                raise
+            page["timed_out"] = True
+            return
+        if self.batch_sizer is not None:
+            self.batch_sizer.observe(
+                page["records"],
+                time.monotonic() - started - consumer_time,
+                self._response_bytes(page["response"]),
             )
 
-            # Yield records one by one
-            batch = response.json["result"]
-            yield from batch
-
-            # This is a header only for Table API.
-            # When using this client for generic api, the header is not present anymore
-            # and we need to find a new method to break from the loop
-            # It can be removed from Table API but for it's better to keep it for now.
-            if "x-total-count" in response.headers:
-                total = int(response.headers["x-total-count"])
-            else:
-                if len(batch) == 0:
-                    break
-
-            self._log_batch(len(batch), offset, total)
-
-            offset += self.batch_size
+    def _response_bytes(self, response):
+        if self.stream:
+            return response.bytes_read
+        return len(response.data or b"")
+
+    def _shrink_after_timeout(self, error):
+        if self.batch_sizer is None or self.max_concurrency > 1:
+            return False
+        if not page_size.is_read_timeout(error) or not self.batch_sizer.shrink():
+            return False
+        self._log(
+            "ServiceNow: Page timed out, retrying with {0} records per page".format(
+                self.batch_sizer.size
+            )
+        )
+        return True
 
-            # Memory cleanup
-            self._batch_count += 1
-            if self._batch_count % self._memory_cleanup_interval == 0:
-                self._cleanup_memory()
+    def _get_page(self, api_path, query):
+        if self.stream:
+            return self.client.get(api_path, query=query, stream=True)
+        return self.client.get(api_path, query=query)
 
-    def get(self, api_path, query, must_exist=False):
-        records = self.list(api_path, query)
+    def _page_records(self, response):
+        if self.stream:
+            return response.iter_json_array("result")
+        return response.json["result"]
 
-        if len(records) > 1:
-            raise errors.ServiceNowError(
-                "{0} {1} records match the {2} query.".format(
-                    len(records), api_path, query
+    def get(self, api_path, query, must_exist=False, fields=None):
+        """
+        Return the only record that matches the query or None if no record does.
+
+        At most two records are requested and they are not counted, which is
+        enough to tell whether the match is unique. The matches are counted only
+        to report that there is more than one. fields limits the record to the
+        listed fields.
+        """
+        query = self._sanitize_query(query)
+        records = []
+        for lookup_query in self._lookup_queries(api_path, query, fields):
+            records.extend(self.client.get(api_path, query=lookup_query).json["result"])
+            if len(records) > 1:
+                # Records may change in between, the count is never lower
+                # than what the lookup has already seen.
+                raise self._multiple_matches(
+                    api_path,
+                    query,
+                    max(len(records), self._count_matches(api_path, query)),
                 )
-            )
+        return self._single_record(api_path, query, records, must_exist)
+
+    def _lookup_queries(self, api_path, query, fields):
+        lookup_query = dict(query, sysparm_limit=2, sysparm_no_count="true")
+        if fields:
+            lookup_query["sysparm_fields"] = ",".join(fields)
+        return self._split_long_query(api_path, lookup_query)
+
+    def _count_matches(self, api_path, query):
+        total = 0
+        for count_query in self._split_long_query(
+            api_path, dict(query, sysparm_limit=1)
+        ):
+            response = self.client.get(api_path, query=count_query)
+            if "x-total-count" not in response.headers:
+                # APIs that do not count their records have to be listed.
+                return len(self._list_accumulate(api_path, dict(query)))
+            total += int(response.headers["x-total-count"])
+        return total
+
+    @staticmethod
+    def _multiple_matches(api_path, query, matches):
+        return errors.ServiceNowError(
+            "{0} {1} records match the {2} query.".format(matches, api_path, query)
+        )
 
+    @staticmethod
+    def _single_record(api_path, query, records, must_exist):
         if must_exist and not records:
             raise errors.ServiceNowError(
                 "No {0} records match the {1} query.".format(api_path, query)
@@ -7,8 +7,20 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import collections
 import itertools
-from . import snow
+from . import errors, snow
+
+# Values that hold these characters cannot be listed in an IN condition.
+IN_LIST_SPECIAL_CHARACTERS = (",", "^")
+
+# (table, column) pairs that the find_* helpers look records up by.
+USER = ("sys_user", "user_name")
+ASSIGNMENT_GROUP = ("sys_user_group", "name")
+STANDARD_CHANGE_TEMPLATE = ("std_change_producer_version", "name")
+CHANGE_REQUEST = ("change_request", "number")
+CONFIGURATION_ITEM = ("cmdb_ci", "name")
+PROBLEM = ("problem", "number")
 
 
 def _query(original=None):
@@ -18,8 +30,31 @@ def _query(original=None):
 
 
 class TableClient(snow.SNowClient):
-    def __init__(self, client, batch_size=1000, memory_efficient=False):
-        super(TableClient, self).__init__(client, batch_size, memory_efficient)
+    def __init__(
+        self,
+        client,
+        batch_size=1000,
+        memory_efficient=False,
+        stream=False,
+        max_concurrency=1,
+        pagination="offset",
+        keyset_field="sys_id",
+        batch_sizer=None,
+        count=True,
+        read_ahead=0,
+    ):
+        super(TableClient, self).__init__(
+            client,
+            batch_size,
+            memory_efficient,
+            stream,
+            max_concurrency,
+            pagination,
+            keyset_field,
+            batch_sizer,
+            count,
+            read_ahead,
+        )
 
     def list_records(self, table, query=None):
         return self.list(self.path(table), query)
@@ -28,8 +63,8 @@ class TableClient(snow.SNowClient):
         """Memory-efficient generator-based record listing"""
         return self.list_generator(self.path(table), query)
 
-    def get_record(self, table, query, must_exist=False):
-        return self.get(self.path(table), query, must_exist)
+    def get_record(self, table, query, must_exist=False, fields=None):
+        return self.get(self.path(table), query, must_exist, fields)
 
     def get_record_by_sys_id(self, table, sys_id, must_exist=False):
         return self.get_by_sys_id(self.path(table), sys_id, must_exist)
@@ -66,36 +101,134 @@ class TableClient(snow.SNowClient):
         )
 
 
+def _reference_cache(table_client):
+    return getattr(getattr(table_client, "client", None), "reference_cache", None)
+
+
+def find_reference(table_client, table, column, value):
+    """
+    Return the record of table whose column holds value, raising an error if
+    there is not exactly one.
+
+    With the reference cache of the client enabled, references that were
+    resolved before are not looked up again. Records served from the cache
+    only hold the sys_id and the column.
+    """
+    cache = _reference_cache(table_client)
+    if cache is None:
+        return table_client.get_record(table, {column: value}, must_exist=True)
+
+    sys_id = cache.get(table, column, value)
+    if sys_id:
+        return {"sys_id": sys_id, column: value}
+    record = table_client.get_record(table, {column: value}, must_exist=True)
+    cache.put(table, column, value, record["sys_id"])
+    return record
+
+
 def find_user(table_client, user_id):
     # TODO: Maybe add a lookup-by-email option too?
-    return table_client.get_record("sys_user", dict(user_name=user_id), must_exist=True)
+    return find_reference(table_client, *USER + (user_id,))
 
 
 def find_assignment_group(table_client, assignment_name):
-    return table_client.get_record(
-        "sys_user_group", dict(name=assignment_name), must_exist=True
-    )
+    return find_reference(table_client, *ASSIGNMENT_GROUP + (assignment_name,))
 
 
 def find_standard_change_template(table_client, template_name):
-    return table_client.get_record(
-        "std_change_producer_version",
-        dict(name=template_name),
-        must_exist=True,
-    )
+    return find_reference(table_client, *STANDARD_CHANGE_TEMPLATE + (template_name,))
 
 
 def find_change_request(table_client, change_request_number):
-    return table_client.get_record(
-        "change_request", dict(number=change_request_number), must_exist=True
-    )
+    return find_reference(table_client, *CHANGE_REQUEST + (change_request_number,))
 
 
 def find_configuration_item(table_client, item_name):
-    return table_client.get_record("cmdb_ci", dict(name=item_name), must_exist=True)
+    return find_reference(table_client, *CONFIGURATION_ITEM + (item_name,))
 
 
 def find_problem(table_client, problem_number):
-    return table_client.get_record(
-        "problem", dict(number=problem_number), must_exist=True
+    return find_reference(table_client, *PROBLEM + (problem_number,))
+
+
+def query_references(query, fields):
+    """
+    Return the (table, column, value) references in the conditions of a parsed
+    query. fields maps the query fields that hold references to the (table,
+    column) pair that their values name.
+    """
+    return [
+        fields[k] + (v[1],) for item in query for k, v in item.items() if k in fields
+    ]
+
+
+def resolve_references(table_client, references):
+    """
+    Return a dict that maps every (table, column, value) in references to the
+    sys_id of the only record of table whose column holds value, raising an
+    error if there is not exactly one.
+
+    All values of a table and column are fetched with a single IN query, so the
+    number of requests depends on the number of tables instead of the number of
+    references. References in the reference cache are not fetched again.
+    """
+    cache = _reference_cache(table_client)
+    sys_ids = {}
+    # Values are kept in the order of the references, so are the requests.
+    pending = collections.OrderedDict()
+    for reference in references:
+        sys_id = cache.get(*reference) if cache else None
+        if sys_id:
+            sys_ids[reference] = sys_id
+        else:
+            pending.setdefault(reference[:2], collections.OrderedDict())
+            pending[reference[:2]][reference[2]] = True
+
+    for (table, column), values in pending.items():
+        listed = [v for v in values if listable(v)]
+        if len(listed) < 2:
+            listed = []
+        for value in values:
+            if value not in listed:
+                record = find_reference(table_client, table, column, value)
+                sys_ids[(table, column, value)] = record["sys_id"]
+        if listed:
+            sys_ids.update(_resolve_listed(table_client, table, column, listed))
+    return sys_ids
+
+
+def listable(value):
+    """
+    Tell whether value can be one of the values of an IN condition.
+    """
+    value = str(value)
+    return value and not any(c in value for c in IN_LIST_SPECIAL_CHARACTERS)
+
+
+def _resolve_listed(table_client, table, column, values):
+    records = table_client.list_records(
+        table,
+        dict(
+            sysparm_query="{0}IN{1}".format(column, ",".join(sorted(values))),
+            sysparm_fields="sys_id," + column,
+        ),
     )
+    # Like the equality conditions of single lookups, IN conditions ignore case.
+    matches = collections.defaultdict(list)
+    for record in records:
+        matches[str(record.get(column, "")).lower()].append(record["sys_id"])
+
+    cache = _reference_cache(table_client)
+    sys_ids = {}
+    for value in sorted(values):
+        found = matches.get(str(value).lower(), [])
+        if len(found) != 1:
+            raise errors.ServiceNowError(
+                "{0} {1} records match the {2} query.".format(
+                    len(found) or "No", table, {column: value}
+                )
+            )
+        sys_ids[(table, column, value)] = found[0]
+        if cache:
+            cache.put(table, column, value, found[0])
+    return sys_ids
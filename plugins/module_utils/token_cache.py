@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import stat
+import time
+
+from .file_utils import locked, write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Same place Ansible uses for its remote temporary files by default.
+DEFAULT_CACHE_DIR = os.path.join("~", ".ansible", "tmp", "servicenow_itsm_tokens")
+
+
+class TokenCache:
+    """
+    On-disk cache of OAuth access tokens shared by all module invocations that
+    run as the same user on the same host.
+
+    Tokens are stored in files readable only by their owner, one file per
+    (host, client_id, grant_type, username) combination. lock() serializes
+    logins for a key across processes, so concurrent tasks request a single
+    token instead of one each.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = os.path.expanduser(directory or DEFAULT_CACHE_DIR)
+
+    @staticmethod
+    def key(host, client_id, grant_type, username=None, secrets=()):
+        # The username and the secrets sent with the grant (client secret,
+        # password or refresh token) are part of the key so that identities
+        # sharing an OAuth application never get each other's tokens. The key
+        # is a digest, so the secrets never end up in file names.
+        raw = "\0".join(
+            str(part or "")
+            for part in (host, client_id, grant_type, username) + tuple(secrets)
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def _ensure_directory(self):
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        """
+        Hold an exclusive lock for key while the block runs. If locking is not
+        possible, the block runs without it.
+        """
+        with contextlib.ExitStack() as stack:
+            try:
+                self._ensure_directory()
+                stack.enter_context(locked(self._path(key, "")))
+            except OSError as e:
+                logger.debug("Token cache lock unavailable: %s", e)
+            yield
+
+    def get(self, key, margin=0):
+        """
+        Return (access_token, expires_at) for key, or None if there is no token
+        that stays valid for at least margin more seconds.
+        """
+        path = self._path(key, ".json")
+        try:
+            st = os.stat(path)
+            if st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) & 0o077:
+                logger.warning(
+                    "Ignoring token cache file %s with unsafe permissions", path
+                )
+                return None
+            with open(path) as f:
+                entry = json.load(f)
+            access_token = entry["access_token"]
+            expires_at = float(entry["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if time.time() >= expires_at - margin:
+            return None
+        return access_token, expires_at
+
+    def put(self, key, access_token, expires_at):
+        """
+        Store the token atomically. Errors are logged and otherwise ignored,
+        since the cache only saves round trips.
+        """
+        entry = dict(access_token=access_token, expires_at=expires_at)
+        try:
+            self._ensure_directory()
+            write_atomic(self._path(key, ".json"), lambda f: json.dump(entry, f))
+        except OSError as e:
+            logger.warning("Unable to write token cache: %s", e)
+
+    def delete(self, key):
+        try:
+            os.unlink(self._path(key, ".json"))
+        except OSError:
+            pass
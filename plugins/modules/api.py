@@ -279,6 +279,33 @@ record:
     work_notes: ""
     work_notes_list: ""
     work_start: ""
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 2048
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "201": 2
+    endpoints:
+      - method: POST
+        path: /api/now/table/incident
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -378,15 +405,15 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-
-        if module.params["api_path"]:
-            _client = generic.GenericClient(snow_client)
-        else:
-            _client = table.TableClient(snow_client)
-
-        changed, record, diff = run(module, _client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        with client.Client(**module.params["instance"]) as snow_client:
+            if module.params["api_path"]:
+                _client = generic.GenericClient(snow_client)
+            else:
+                _client = table.TableClient(snow_client)
+
+            changed, record, diff = run(module, _client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=changed, record=record, diff=diff, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
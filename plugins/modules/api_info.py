@@ -88,6 +88,16 @@ options:
       - Default is set to C(false).
     type: bool
     default: False
+  max_concurrency:
+    description:
+      - Maximum number of pages of records that are fetched at the same time.
+      - Once the first page reports the total number of records, the remaining pages
+        are requested in parallel. Records are still returned in the same order.
+      - Pages are fetched one after another if O(no_count=true), because the total
+        number of records is not known then.
+    type: int
+    default: 1
+    version_added: "2.16.0"
 """
 
 EXAMPLES = """
@@ -223,6 +233,33 @@ record:
       work_notes: ""
       work_notes_list: ""
       work_start: ""
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/incident
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -284,6 +321,10 @@ def main():
             type="bool",
             default=False,  # to enforce False when this parameter is omitted from a playbook
         ),  # Do not execute a select count(*) on table (default: false)
+        max_concurrency=dict(
+            type="int",
+            default=1,
+        ),
     )
 
     module = AnsibleModule(
@@ -294,15 +335,20 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-
-        if module.params["api_path"]:
-            _client = generic.GenericClient(snow_client)
-        else:
-            _client = table.TableClient(snow_client)
+        with client.Client(**module.params["instance"]) as snow_client:
+            max_concurrency = module.params["max_concurrency"]
+            if module.params["api_path"]:
+                _client = generic.GenericClient(
+                    snow_client, max_concurrency=max_concurrency
+                )
+            else:
+                _client = table.TableClient(
+                    snow_client, max_concurrency=max_concurrency
+                )
 
-        records = run(module, _client)
-        module.exit_json(changed=False, record=records)
+            records = run(module, _client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=False, record=records, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -86,6 +86,33 @@ records:
     sys_updated_on: "2023-05-04 08:53:07"
     table_name: "incident"
     table_sys_id: "7cd58f1647222110afc6fa37536d43ed"
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 2048
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "201": 2
+    endpoints:
+      - method: POST
+        path: /api/now/attachment/file
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 
@@ -145,10 +172,11 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        attachment_client = attachment.AttachmentClient(snow_client)
-        changed, records, diff = run(module, attachment_client)
-        module.exit_json(changed=changed, records=records, diff=diff)
+        with client.Client(**module.params["instance"]) as snow_client:
+            attachment_client = attachment.AttachmentClient(snow_client)
+            changed, records, diff = run(module, attachment_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=changed, records=records, diff=diff, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -108,6 +108,33 @@ records:
       "sys_updated_on": "2024-01-15 10:30:00"
       "urgency": "2"
       "work_notes": ""
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/sc_request
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -126,23 +153,24 @@ def sysparms_query(query_param, table_client, mapper):
     return query.serialize_query(query.map_query_values(remap_query, mapper))
 
 
+REFERENCES = dict(
+    requested_by=table.USER,
+    requested_for=table.USER,
+    assignment_group=table.ASSIGNMENT_GROUP,
+)
+
+
 def remap_params(query, table_client):
+    sys_ids = table.resolve_references(
+        table_client, table.query_references(query, REFERENCES)
+    )
     query_load = []
 
     for item in query:
         q = dict()
         for k, v in item.items():
-            if k == "requested_by":
-                user = table.find_user(table_client, v[1])
-                q["requested_by"] = (v[0], user["sys_id"])
-
-            elif k == "requested_for":
-                user = table.find_user(table_client, v[1])
-                q["requested_for"] = (v[0], user["sys_id"])
-
-            elif k == "assignment_group":
-                assignment_group = table.find_assignment_group(table_client, v[1])
-                q["assignment_group"] = (v[0], assignment_group["sys_id"])
+            if k in REFERENCES:
+                q[k] = (v[0], sys_ids[REFERENCES[k] + (v[1],)])
 
             else:
                 q[k] = v
@@ -198,10 +226,11 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        records = run(module, table_client)
-        module.exit_json(changed=False, records=records)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            records = run(module, table_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=False, records=records, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
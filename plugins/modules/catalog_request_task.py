@@ -237,6 +237,33 @@ record:
     task_state: "open"
     urgency: "2"
     work_notes: ""
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/sc_task
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -320,14 +347,10 @@ def _lookup_request_sys_id(request_value, table_client):
         c in "0123456789abcdef" for c in request_value.lower()
     ):
         # It's a sys_id
-        return table_client.get_record(
-            "sc_request", {"sys_id": request_value}, must_exist=True
-        )
+        return table.find_reference(table_client, "sc_request", "sys_id", request_value)
     else:
         # It's a number
-        return table_client.get_record(
-            "sc_request", {"number": request_value}, must_exist=True
-        )
+        return table.find_reference(table_client, "sc_request", "number", request_value)
 
 
 def build_payload(module, table_client):
@@ -342,28 +365,17 @@ def build_payload(module, table_client):
         payload["request"] = catalog_request["sys_id"]
 
     # Handle user lookups
-    if module.params.get("requested_for"):
-        payload["requested_for"] = table_client.get_record(
-            "sys_user", {"user_name": module.params["requested_for"]}, must_exist=True
-        )["sys_id"]
-
-    if module.params.get("requested_by"):
-        payload["requested_by"] = table_client.get_record(
-            "sys_user", {"user_name": module.params["requested_by"]}, must_exist=True
-        )["sys_id"]
-
-    if module.params.get("assigned_to"):
-        payload["assigned_to"] = table_client.get_record(
-            "sys_user", {"user_name": module.params["assigned_to"]}, must_exist=True
-        )["sys_id"]
+    for field in ("requested_for", "requested_by", "assigned_to"):
+        if module.params.get(field):
+            user = table.find_user(table_client, module.params[field])
+            payload[field] = user["sys_id"]
 
     # Handle group lookup
     if module.params.get("assignment_group"):
-        payload["assignment_group"] = table_client.get_record(
-            "sys_user_group",
-            {"name": module.params["assignment_group"]},
-            must_exist=True,
-        )["sys_id"]
+        group = table.find_assignment_group(
+            table_client, module.params["assignment_group"]
+        )
+        payload["assignment_group"] = group["sys_id"]
 
     return payload
 
@@ -441,10 +453,11 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        changed, record, diff = run(module, table_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            changed, record, diff = run(module, table_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=changed, record=record, diff=diff, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
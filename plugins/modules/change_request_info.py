@@ -201,6 +201,33 @@ records:
       "work_notes": ""
       "work_notes_list": ""
       "work_start": "2015-07-06 18:17:41"
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/change_request
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -209,8 +236,17 @@ from ..module_utils import arguments, attachment, client, errors, query, table,
 from ..module_utils.change_request import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
+REFERENCES = dict(
+    requested_by=table.USER,
+    assignment_group=table.ASSIGNMENT_GROUP,
+    template=table.STANDARD_CHANGE_TEMPLATE,
+)
+
 
 def remap_params(query, table_client):
+    sys_ids = table.resolve_references(
+        table_client, table.query_references(query, REFERENCES)
+    )
     query_load = []
 
     for item in query:
@@ -222,21 +258,13 @@ def remap_params(query, table_client):
             elif k == "hold_reason":
                 q["on_hold_reason"] = (v[0], v[1])
 
-            elif k == "requested_by":
-                user = table.find_user(table_client, v[1])
-                q["requested_by"] = (v[0], user["sys_id"])
-
-            elif k == "assignment_group":
-                assignment_group = table.find_assignment_group(table_client, v[1])
-                q["assignment_group"] = (v[0], assignment_group["sys_id"])
+            elif k in ("requested_by", "assignment_group"):
+                q[k] = (v[0], sys_ids[REFERENCES[k] + (v[1],)])
 
             elif k == "template":
-                standard_change_template = table.find_standard_change_template(
-                    table_client, v[1]
-                )
                 q["std_change_producer_version"] = (
                     v[0],
-                    standard_change_template["sys_id"],
+                    sys_ids[table.STANDARD_CHANGE_TEMPLATE + (v[1],)],
                 )
 
             else:
@@ -312,11 +340,12 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        attachment_client = attachment.AttachmentClient(snow_client)
-        records = run(module, table_client, attachment_client)
-        module.exit_json(changed=False, records=records)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            attachment_client = attachment.AttachmentClient(snow_client)
+            records = run(module, table_client, attachment_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=False, records=records, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -176,6 +176,41 @@ EXAMPLES = """
     number: CTASK0000001
 """
 
+RETURN = r"""
+record:
+  description:
+    - The created, updated or deleted record.
+  returned: success
+  type: dict
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/change_task
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
+"""
+
 from ..module_utils.utils import get_mapper
 from ..module_utils.change_request_task import PAYLOAD_FIELDS_MAPPING
 from ..module_utils import arguments, client, errors, table, utils, validation
@@ -421,10 +456,11 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        changed, record, diff = run(module, table_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            changed, record, diff = run(module, table_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=changed, record=record, diff=diff, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -151,6 +151,33 @@ records:
       "work_notes": ""
       "work_notes_list": ""
       "work_start": ""
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/change_task
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -159,10 +186,17 @@ from ..module_utils import arguments, client, errors, query, table, utils
 from ..module_utils.change_request_task import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
+REFERENCES = dict(
+    configuration_item=table.CONFIGURATION_ITEM,
+    change_request_number=table.CHANGE_REQUEST,
+    assigned_to=table.USER,
+    assignment_group=table.ASSIGNMENT_GROUP,
+)
+
 
 class ReMapper:
-    def __init__(self, table_client):
-        self.table_client = table_client
+    def __init__(self, sys_ids):
+        self.sys_ids = sys_ids
         self.query_args = dict()
 
     def type(self, val):
@@ -175,32 +209,35 @@ class ReMapper:
         self.query_args["cmdb_ci"] = (val[0], val[1])
 
     def configuration_item(self, val):
-        configuration_item = table.find_configuration_item(self.table_client, val[1])
-        self.query_args["cmdb_ci"] = (val[0], configuration_item["sys_id"])
+        sys_id = self.sys_ids[table.CONFIGURATION_ITEM + (val[1],)]
+        self.query_args["cmdb_ci"] = (val[0], sys_id)
 
     def change_request_id(self, val):
         self.query_args["change_request"] = (val[0], val[1])
 
     def change_request_number(self, val):
-        change_request = table.find_change_request(self.table_client, val[1])
-        self.query_args["change_request"] = (val[0], change_request["sys_id"])
+        sys_id = self.sys_ids[table.CHANGE_REQUEST + (val[1],)]
+        self.query_args["change_request"] = (val[0], sys_id)
 
     def assigned_to(self, val):
-        user = table.find_user(self.table_client, val[1])
-        self.query_args["assigned_to"] = (val[0], user["sys_id"])
+        sys_id = self.sys_ids[table.USER + (val[1],)]
+        self.query_args["assigned_to"] = (val[0], sys_id)
 
     def assignment_group(self, val):
-        assignment_group = table.find_assignment_group(self.table_client, val[1])
-        self.query_args["assignment_group"] = (val[0], assignment_group["sys_id"])
+        sys_id = self.sys_ids[table.ASSIGNMENT_GROUP + (val[1],)]
+        self.query_args["assignment_group"] = (val[0], sys_id)
 
     def default(self, key, val):
         self.query_args[key] = val
 
 
 def remap_params(query, table_client):
+    sys_ids = table.resolve_references(
+        table_client, table.query_references(query, REFERENCES)
+    )
     query_load = []
     for item in query:
-        remapper = ReMapper(table_client)
+        remapper = ReMapper(sys_ids)
         for k, v in item.items():
             try:
                 getattr(remapper, k)(v)
@@ -271,10 +308,11 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        records = run(module, table_client)
-        module.exit_json(changed=False, records=records)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            records = run(module, table_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=False, records=records, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -58,6 +58,33 @@ options:
       - Data is returned as string because ServiceNow API expect this
     required: true
     type: dict
+  concurrency:
+    description:
+      - Maximum number of configuration items that are created or updated at the same time.
+      - Dataset items that identify the same configuration item are still applied one after
+        another, in the order of I(dataset).
+      - The writes share the rate limit and retries configured for the instance.
+    type: int
+    default: 1
+    version_added: "2.16.0"
+  continue_on_error:
+    description:
+      - Keep creating and updating the remaining configuration items when one of them fails.
+      - The failed items are returned in I(failures) instead of failing the task.
+      - If C(false), no further writes start after the first failure and the task fails.
+    type: bool
+    default: false
+    version_added: "2.16.0"
+  batch_size:
+    description:
+      - When greater than C(0), the creates and updates are sent through the ServiceNow Batch API,
+        I(batch_size) writes per HTTP request, instead of one HTTP request per write.
+      - Dataset items that identify the same configuration item are still applied one after
+        another, in the order of I(dataset).
+      - Cannot be combined with I(concurrency).
+    type: int
+    default: 0
+    version_added: "2.16.0"
 """
 
 EXAMPLES = r"""
@@ -79,6 +106,17 @@ EXAMPLES = r"""
       ip_address: public_ip_address
       name: tags.Name
 
+- name: Write up to 8 CMDB items at the same time and report the ones that fail
+  servicenow.itsm.configuration_item_batch:
+    sys_class_name: cmdb_ci_server
+    id_column_set: name
+    dataset: "{{ input_data }}"
+    map:
+      name: tags.Name
+      ip_address: private_ip_address
+    concurrency: 8
+    continue_on_error: true
+
 - name: Identify CMDB item using combination of two columns
   servicenow.itsm.configuration_item_batch:
     sys_class_name: cmdb_ci_server
@@ -99,6 +137,8 @@ records:
     - Note that the fields of the returned records depend on the configuration
       item's I(sys_class_name).
     - Returning of values added in version 2.0.0.
+    - Records that did not need to change only hold the I(sys_id) and the
+      columns of I(map).
   returned: success
   type: list
   sample:
@@ -170,42 +210,304 @@ records:
         value: 04a96c0d3790200044e0bfc8bcbe5db3
       purchase_date: '2019-05-25'
       lease_id: ''
+counts:
+  description:
+    - The number of configuration items that were created, updated and left
+      unchanged, and the number of dataset items that failed.
+  returned: success
+  type: dict
+  version_added: "2.16.0"
+  sample:
+    created: 1
+    updated: 3
+    unchanged: 120
+    failed: 0
+failures:
+  description:
+    - The dataset items that could not be applied when I(continue_on_error=true),
+      with their position in I(dataset) and the error message.
+  returned: success
+  type: list
+  version_added: "2.16.0"
+  sample:
+    - index: 4
+      item:
+        name: my_name
+        ip_address: 1.2.3.4
+      msg: 'Unexpected response - 403 {"error": {"message": "Operation Failed"}}'
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/cmdb_ci_server
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 
+import collections
+import functools
+import itertools
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
 from ansible.module_utils.basic import AnsibleModule
 
-from ..module_utils import arguments, client, errors, table, utils
+from ..module_utils import arguments, batch, client, errors, table, utils
 
+# Number of dataset rows whose existing records are fetched with one query.
+PREFETCH_CHUNK_SIZE = 100
 
-def update(module, table_client):
-    changed = False
+
+def record_key(record, id_column_set):
+    # Like the equality lookups, IN conditions ignore case.
+    return tuple(str(record.get(c, "")).lower() for c in id_column_set)
+
+
+def listable(desired, id_column_set):
+    return all(table.listable(desired[c]) for c in id_column_set)
+
+
+def in_query(rows, id_column_set):
+    return "^".join(
+        "{0}IN{1}".format(c, ",".join(sorted(set(str(r[c]) for r in rows))))
+        for c in id_column_set
+    )
+
+
+def prefetch(table_client, cmdb_table, id_column_set, dataset):
+    """
+    Return an index that maps the id_column_set values of the existing records
+    that the dataset rows identify to those records. Only the sys_id and the
+    columns of the dataset are fetched.
+    """
+    fields = set(["sys_id"]).union(id_column_set)
+    for desired in dataset:
+        fields.update(desired)
+    rows = [d for d in dataset if listable(d, id_column_set)]
+
+    index = {}
+    for start in range(0, len(rows), PREFETCH_CHUNK_SIZE):
+        chunk = rows[start : start + PREFETCH_CHUNK_SIZE]
+        query = dict(
+            sysparm_query=in_query(chunk, id_column_set),
+            sysparm_fields=",".join(sorted(fields)),
+        )
+        for record in table_client.list_records(cmdb_table, query):
+            index.setdefault(record_key(record, id_column_set), []).append(record)
+    return index
+
+
+def find_current(table_client, cmdb_table, id_column_set, index, desired):
+    query = dict((c, desired[c]) for c in id_column_set)
+    if not listable(desired, id_column_set):
+        return table_client.get_record(cmdb_table, query)
+
+    records = index.get(record_key(desired, id_column_set), [])
+    if len(records) > 1:
+        raise errors.ServiceNowError(
+            "{0} {1} records match the {2} query.".format(
+                len(records), cmdb_table, query
+            )
+        )
+    return records[0] if records else None
+
+
+def plan_item(module, table_client, index, desired):
+    """
+    Return the outcome of applying desired and the record that it applies to.
+    """
     cmdb_table = module.params["sys_class_name"]
     id_column_set = module.params["id_column_set"]
+    current = find_current(table_client, cmdb_table, id_column_set, index, desired)
+
+    if not current:
+        return "created", None
+    if utils.is_superset(current, desired):
+        return "unchanged", current
+    return "updated", current
+
+
+def apply_item(module, table_client, index, desired):
+    cmdb_table = module.params["sys_class_name"]
+    outcome, current = plan_item(module, table_client, index, desired)
+
+    if outcome == "created":
+        return outcome, table_client.create_record(
+            cmdb_table, desired, module.check_mode
+        )
+    if outcome == "updated":
+        return outcome, table_client.update_record(
+            cmdb_table, current, desired, module.check_mode
+        )
+    return outcome, current
+
 
-    results = []
-    for desired in module.params["dataset"]:
-        query = dict((c, desired[c]) for c in id_column_set)
-        current = table_client.get_record(cmdb_table, query)
+def failure(position, desired, error):
+    result = dict(index=position, item=desired)
+    result.update(error.to_module_fail_json_output())
+    return result
 
-        if not current:
-            result = table_client.create_record(cmdb_table, desired, module.check_mode)
-            results.append(result)
-            changed = True
+
+def apply_group(module, table_client, index, stop, group):
+    """
+    Apply the (position, desired) dataset items of group, which all identify
+    the same record, one after another. Return a (position, outcome, result)
+    triple for every applied item.
+    """
+    outcomes = []
+    for position, desired in group:
+        if stop.is_set():
+            break
+        try:
+            outcome, result = apply_item(module, table_client, index, desired)
+        except errors.ServiceNowError as e:
+            if not module.params["continue_on_error"]:
+                stop.set()
+                raise
+            outcomes.append((position, "failed", failure(position, desired, e)))
             continue
 
-        if utils.is_superset(current, desired):
-            results.append(current)
+        # Later items with the same identity see what earlier items did.
+        index[record_key(desired, module.params["id_column_set"])] = [result]
+        outcomes.append((position, outcome, result))
+    return outcomes
+
+
+def write_request(table_client, cmdb_table, outcome, current, desired):
+    query = dict(sysparm_exclude_reference_link="true")
+    if outcome == "created":
+        return batch.BatchRequest(
+            "POST", table_client.path(cmdb_table), query, data=desired
+        )
+    return batch.BatchRequest(
+        "PATCH", table_client.path(cmdb_table, current["sys_id"]), query, data=desired
+    )
+
+
+def plan_round(module, table_client, index, items):
+    """
+    Return the outcomes of the items that need no write and the
+    (position, desired, outcome, request) writes of the others.
+    """
+    outcomes = []
+    writes = []
+    for position, desired in items:
+        try:
+            outcome, current = plan_item(module, table_client, index, desired)
+        except errors.ServiceNowError as e:
+            if not module.params["continue_on_error"]:
+                raise
+            outcomes.append((position, "failed", failure(position, desired, e)))
             continue
 
-        result = table_client.update_record(
-            cmdb_table, current, desired, module.check_mode
+        if outcome == "unchanged":
+            outcomes.append((position, outcome, current))
+        else:
+            request = write_request(
+                table_client, module.params["sys_class_name"], outcome, current, desired
+            )
+            writes.append((position, desired, outcome, request))
+    return outcomes, writes
+
+
+def send_round(module, batch_client, index, writes):
+    outcomes = []
+    responses = batch_client.send([w[3] for w in writes])
+    for (position, desired, outcome, _request), response in zip(writes, responses):
+        if response.status not in (200, 201):
+            error = errors.UnexpectedAPIResponse(response.status, response.data)
+            if not module.params["continue_on_error"]:
+                raise error
+            outcomes.append((position, "failed", failure(position, desired, error)))
+            continue
+
+        result = response.json["result"]
+        index[record_key(desired, module.params["id_column_set"])] = [result]
+        outcomes.append((position, outcome, result))
+    return outcomes
+
+
+def apply_batched(module, table_client, index, groups):
+    """
+    Apply the dataset items through the Batch API. Every round writes the next
+    item of each group, so that items which identify the same record still see
+    what the earlier items did.
+    """
+    batch_client = batch.BatchClient(table_client.client, module.params["batch_size"])
+    outcomes = []
+    for items in itertools.zip_longest(*groups):
+        planned, writes = plan_round(
+            module, table_client, index, [i for i in items if i is not None]
         )
+        outcomes.extend(planned)
+        outcomes.extend(send_round(module, batch_client, index, writes))
+    return outcomes
+
+
+def group_items(dataset, id_column_set):
+    groups = collections.OrderedDict()
+    for position, desired in enumerate(dataset):
+        key = record_key(desired, id_column_set)
+        groups.setdefault(key, []).append((position, desired))
+    return list(groups.values())
+
+
+def update(module, table_client):
+    cmdb_table = module.params["sys_class_name"]
+    id_column_set = module.params["id_column_set"]
+    dataset = module.params["dataset"]
+    index = prefetch(table_client, cmdb_table, id_column_set, dataset)
+
+    # Items that identify different records are independent, so only the
+    # groups of items that identify the same record need to be kept in order.
+    groups = group_items(dataset, id_column_set)
+    apply = functools.partial(
+        apply_group, module, table_client, index, threading.Event()
+    )
+    if module.params["batch_size"] > 0 and not module.check_mode:
+        outcomes = [apply_batched(module, table_client, index, groups)]
+    elif module.params["concurrency"] > 1:
+        with ThreadPoolExecutor(max_workers=module.params["concurrency"]) as executor:
+            outcomes = list(executor.map(apply, groups))
+    else:
+        outcomes = [apply(group) for group in groups]
 
-        results.append(result)
-        changed = True
+    results = [None] * len(dataset)
+    counts = dict(created=0, updated=0, unchanged=0, failed=0)
+    failures = []
+    for position, outcome, result in sorted(
+        itertools.chain.from_iterable(outcomes), key=lambda o: o[0]
+    ):
+        counts[outcome] += 1
+        if outcome == "failed":
+            failures.append(result)
+        else:
+            results[position] = result
 
-    return results, changed
+    changed = counts["created"] + counts["updated"] > 0
+    return [r for r in results if r is not None], changed, counts, failures
 
 
 def main():
@@ -229,6 +531,18 @@ def main():
             type="dict",
             required=True,
         ),
+        concurrency=dict(
+            type="int",
+            default=1,
+        ),
+        continue_on_error=dict(
+            type="bool",
+            default=False,
+        ),
+        batch_size=dict(
+            type="int",
+            default=0,
+        ),
     )
 
     module = AnsibleModule(
@@ -238,12 +552,25 @@ def main():
 
     if not module.params["id_column_set"]:
         module.fail_json(msg="id_column_set should not be empty")
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="concurrency should be at least 1")
+    if module.params["batch_size"] < 0:
+        module.fail_json(msg="batch_size should not be negative")
+    if module.params["batch_size"] > 0 and module.params["concurrency"] > 1:
+        module.fail_json(msg="batch_size cannot be combined with concurrency")
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        results, changed = update(module, table_client)
-        module.exit_json(changed=changed, records_raw=results)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            results, changed, counts, failures = update(module, table_client)
+            stats = snow_client.stats_result()
+        module.exit_json(
+            changed=changed,
+            records_raw=results,
+            counts=counts,
+            failures=failures,
+            **stats
+        )
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -225,6 +225,33 @@ records:
     "unverified": "false"
     "vendor": "aa0a6df8c611227601cd2ed45989e0ac"
     "warranty_expiration": "2021-10-01"
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/cmdb_ci
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 
@@ -236,14 +263,17 @@ from ..module_utils.utils import get_mapper
 
 
 def remap_assignment(query, table_client):
+    references = dict(assigned_to=table.USER)
+    sys_ids = table.resolve_references(
+        table_client, table.query_references(query, references)
+    )
     query_load = []
 
     for item in query:
         q = dict()
         for k, v in item.items():
             if k == "assigned_to":
-                user = table.find_user(table_client, v[1])
-                q["assigned_to"] = (v[0], user["sys_id"])
+                q["assigned_to"] = (v[0], sys_ids[table.USER + (v[1],)])
             else:
                 q[k] = v
         query_load.append(q)
@@ -334,11 +364,12 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        attachment_client = attachment.AttachmentClient(snow_client)
-        records = run(module, table_client, attachment_client)
-        module.exit_json(changed=False, records=records)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            attachment_client = attachment.AttachmentClient(snow_client)
+            records = run(module, table_client, attachment_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=False, records=records, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -0,0 +1,220 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: import_set
+
+author:
+  - Ansible Cloud Team (@ansible-collections)
+
+short_description: Load records into a ServiceNow import set staging table
+
+description:
+  - Load many records into an import set staging table with the Import Set API, so
+    that ServiceNow transforms them into target records with its transform maps.
+  - Records are sent in chunks, one C(insertMultiple) request per chunk, instead of
+    one request per record.
+  - For more information, refer to the ServiceNow Import Set API documentation at
+    U(https://docs.servicenow.com/bundle/tokyo-application-development/page/integrate/inbound-rest/concept/c_ImportSetAPI.html).
+version_added: 2.16.0
+
+extends_documentation_fragment:
+  - servicenow.itsm.instance
+
+seealso:
+  - module: servicenow.itsm.configuration_item_batch
+  - module: servicenow.itsm.api
+
+options:
+  staging_table:
+    description:
+      - Name of the import set staging table, for example C(u_imp_servers).
+    required: true
+    type: str
+  dataset:
+    description:
+      - List of records to load. The keys are the column names of the staging table.
+      - Mutually exclusive with I(src).
+    type: list
+    elements: dict
+  src:
+    description:
+      - Path to a CSV file on the managed node to load.
+      - The header row holds the column names of the staging table.
+      - The file must be UTF-8 encoded.
+      - The file is read one chunk at a time.
+      - Mutually exclusive with I(dataset).
+    type: path
+  chunk_size:
+    description:
+      - Number of records sent in a single request.
+    type: int
+    default: 1000
+  transform_timeout:
+    description:
+      - Number of seconds to wait, after the last chunk was sent, for ServiceNow to
+        transform the import set rows.
+      - Rows whose transform is not done in time are counted as C(pending).
+    type: int
+    default: 60
+"""
+
+EXAMPLES = r"""
+- name: Load servers into a staging table
+  servicenow.itsm.import_set:
+    staging_table: u_imp_servers
+    dataset:
+      - u_name: web-01
+        u_ip_address: 10.0.0.1
+      - u_name: web-02
+        u_ip_address: 10.0.0.2
+  register: result
+
+- name: Load a CSV export in chunks of 5000 rows
+  servicenow.itsm.import_set:
+    staging_table: u_imp_servers
+    src: /tmp/servers.csv
+    chunk_size: 5000
+    transform_timeout: 300
+"""
+
+RETURN = r"""
+summary:
+  description:
+    - The number of import set rows that were loaded, and how many of them the
+      transforms inserted, updated, ignored, skipped or failed, or did not finish.
+  returned: success
+  type: dict
+  sample:
+    rows: 2
+    inserted: 1
+    updated: 1
+    ignored: 0
+    skipped: 0
+    error: 0
+    pending: 0
+import_sets:
+  description:
+    - The same counts for every chunk, with the ids of the import set and the
+      multi import set that ServiceNow created for the chunk.
+    - I(failed_rows) lists the import set rows that failed to transform.
+  returned: success
+  type: list
+  sample:
+    - import_set_id: 2f3a6a1b1b2c3c10a9c2ed7b1e4bcb3e
+      multi_import_set_id: 2b3a6a1b1b2c3c10a9c2ed7b1e4bcb3d
+      rows: 2
+      inserted: 1
+      updated: 0
+      ignored: 0
+      skipped: 0
+      error: 1
+      pending: 0
+      failed_rows:
+        - sys_id: 633a6a1b1b2c3c10a9c2ed7b1e4bcb40
+          msg: "Unable to resolve target record"
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 2048
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "201": 2
+    endpoints:
+      - method: POST
+        path: /api/now/import/u_imp_servers/insertMultiple
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils import arguments, client, errors, import_set
+
+SUMMARY_KEYS = ("rows", "pending") + import_set.ROW_STATES
+
+
+def run(module, import_set_client):
+    if module.params["src"]:
+        records = import_set.read_csv(module.params["src"])
+    else:
+        records = module.params["dataset"]
+
+    import_sets = import_set_client.load(
+        module.params["staging_table"], records, module.check_mode
+    )
+    summary = dict((k, sum(s[k] for s in import_sets)) for k in SUMMARY_KEYS)
+    return summary["rows"] > 0, summary, import_sets
+
+
+def main():
+    module_args = dict(
+        arguments.get_spec("instance"),
+        staging_table=dict(
+            type="str",
+            required=True,
+        ),
+        dataset=dict(
+            type="list",
+            elements="dict",
+        ),
+        src=dict(
+            type="path",
+        ),
+        chunk_size=dict(
+            type="int",
+            default=1000,
+        ),
+        transform_timeout=dict(
+            type="int",
+            default=60,
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=[("dataset", "src")],
+        required_one_of=[("dataset", "src")],
+    )
+
+    try:
+        with client.Client(**module.params["instance"]) as snow_client:
+            import_set_client = import_set.ImportSetClient(
+                snow_client,
+                chunk_size=module.params["chunk_size"],
+                transform_timeout=module.params["transform_timeout"],
+            )
+            changed, summary, import_sets = run(module, import_set_client)
+            stats = snow_client.stats_result()
+        module.exit_json(
+            changed=changed, summary=summary, import_sets=import_sets, **stats
+        )
+    except errors.ServiceNowError as e:
+        module.fail_json(**e.to_module_fail_json_output())
+
+
+if __name__ == "__main__":
+    main()
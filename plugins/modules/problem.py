@@ -311,6 +311,33 @@ record:
     "workaround_applied": "false"
     "workaround_communicated_at": ""
     "workaround_communicated_by": ""
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/problem
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -374,11 +401,7 @@ def build_payload(sn_params, table_client):
         user = table.find_user(table_client, sn_params["assigned_to"])
         sn_payload["assigned_to"] = user["sys_id"]
     if sn_params["duplicate_of"]:
-        problem = table_client.get_record(
-            "problem",
-            query=dict(number=sn_params["duplicate_of"]),
-            must_exist=True,
-        )
+        problem = table.find_problem(table_client, sn_params["duplicate_of"])
         sn_payload["duplicate_of"] = problem["sys_id"]
 
     return sn_payload
@@ -570,14 +593,15 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        attachment_client = attachment.AttachmentClient(snow_client)
-        problem_client = ProblemClient(snow_client, module.params["base_api_path"])
-        changed, record, diff = run(
-            module, problem_client, table_client, attachment_client
-        )
-        module.exit_json(changed=changed, record=record, diff=diff)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            attachment_client = attachment.AttachmentClient(snow_client)
+            problem_client = ProblemClient(snow_client, module.params["base_api_path"])
+            changed, record, diff = run(
+                module, problem_client, table_client, attachment_client
+            )
+            stats = snow_client.stats_result()
+        module.exit_json(changed=changed, record=record, diff=diff, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -158,6 +158,33 @@ records:
       "work_notes_list": ""
       "work_start": ""
       "workaround": ""
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/now/table/problem_task
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -166,22 +193,20 @@ from ..module_utils import arguments, client, errors, query, table, utils
 from ..module_utils.problem_task import PAYLOAD_FIELDS_MAPPING
 from ..module_utils.utils import get_mapper
 
+REFERENCES = dict(assigned_to=table.USER, duplicate_of=table.PROBLEM)
+
 
 def remap_params(query, table_client):
+    sys_ids = table.resolve_references(
+        table_client, table.query_references(query, REFERENCES)
+    )
     query_load = []
 
     for item in query:
         q = dict()
         for k, v in item.items():
-            if k == "assigned_to":
-                user = table.find_user(table_client, v[1])
-                q["assigned_to"] = (v[0], user["sys_id"])
-
-            elif k == "duplicate_of":
-                problem = table_client.get_record(
-                    "problem", query=dict(number=v[1]), must_exist=True
-                )
-                q["duplicate_of"] = (v[0], problem["sys_id"])
+            if k in REFERENCES:
+                q[k] = (v[0], sys_ids[REFERENCES[k] + (v[1],)])
 
             else:
                 q[k] = v
@@ -250,10 +275,11 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        table_client = table.TableClient(snow_client)
-        records = run(module, table_client)
-        module.exit_json(changed=False, records=records)
+        with client.Client(**module.params["instance"]) as snow_client:
+            table_client = table.TableClient(snow_client)
+            records = run(module, table_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=False, records=records, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
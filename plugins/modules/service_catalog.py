@@ -106,6 +106,33 @@ record:
   sample:
     "request_number": "REQ0010012"
     "request_id": "cf56a3fcdb3a2300e890f71fbf9619ac"
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/sn_sc/servicecatalog/catalogs
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 
@@ -165,10 +192,11 @@ def main():
     )
 
     try:
-        rest_client = client.Client(**module.params["instance"])
-        cart_client = CartClient(rest_client)
-        changed, record, diff = run(module, cart_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        with client.Client(**module.params["instance"]) as rest_client:
+            cart_client = CartClient(rest_client)
+            changed, record, diff = run(module, cart_client)
+            stats = rest_client.stats_result()
+        module.exit_json(changed=changed, record=record, diff=diff, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
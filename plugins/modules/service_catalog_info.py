@@ -148,6 +148,33 @@ records:
       "title": "Technical Catalog"
       }
     ]
+api_stats:
+  description:
+    - Statistics about the API requests that the module sent, in total and per
+      method and path.
+    - I(memo) holds the hits, misses and coalesced requests of the request memo
+      and is only present when O(instance.request_memo) is enabled.
+  returned: when O(instance.collect_stats) is enabled
+  type: dict
+  version_added: '2.16.0'
+  sample:
+    requests: 2
+    errors: 0
+    retries: 0
+    throttled: 0
+    request_bytes: 0
+    response_bytes: 1534
+    elapsed: 0.412
+    by_status:
+      "200": 2
+    endpoints:
+      - method: GET
+        path: /api/sn_sc/servicecatalog/catalogs
+        count: 2
+        elapsed: 0.412
+        max_elapsed: 0.251
+        response_bytes: 1534
+        retries: 0
 """
 
 from ..module_utils import arguments, client, errors, generic
@@ -226,11 +253,12 @@ def main():
     )
 
     try:
-        snow_client = client.Client(**module.params["instance"])
-        generic_client = generic.GenericClient(snow_client)
-        sc_client = ServiceCatalogClient(generic_client)
-        records = run(module, sc_client)
-        module.exit_json(changed=False, records=records)
+        with client.Client(**module.params["instance"]) as snow_client:
+            generic_client = generic.GenericClient(snow_client)
+            sc_client = ServiceCatalogClient(generic_client)
+            records = run(module, sc_client)
+            stats = snow_client.stats_result()
+        module.exit_json(changed=False, records=records, **stats)
     except errors.ServiceNowError as e:
         module.fail_json(**e.to_module_fail_json_output())
 
@@ -8,12 +8,14 @@ import pytest
 from unittest.mock import patch, AsyncMock, Mock
 from ansible.errors import AnsibleParserError, AnsibleError
 import sys
+import threading
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../../.."))
 
 from extensions.eda.plugins.event_source.records import (
     RecordsSource,
+    _iterate_records,
     get_tz_aware_datetime_from_string,
     QueryFormatter,
 )
@@ -40,6 +42,30 @@ def test_get_tz_aware_datetime_from_string_errors():
         get_tz_aware_datetime_from_string("2025-08-13 12:00:00", "Invalid/Timezone")
 
 
+class TestIterateRecords:
+    @pytest.mark.asyncio
+    async def test_batches(self):
+        records = [record async for record in _iterate_records(range(5), 2)]
+
+        assert records == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_closes_the_listing_when_stopped_early(self):
+        closed = []
+
+        def listing():
+            try:
+                yield from range(5)
+            finally:
+                closed.append(True)
+
+        records = _iterate_records(listing(), 2)
+        assert await records.__anext__() == 0
+        await records.aclose()
+
+        assert closed == [True]
+
+
 class TestQueryFormatter:
     @patch(
         "extensions.eda.plugins.event_source.records.construct_sysparm_query_from_query"
@@ -234,6 +260,22 @@ class TestRecordsSource:
         assert source.timestamp_field == "sys_updated_on"
         assert source.order_by_field == "sys_updated_on"
 
+    def test_read_ahead(self):
+        source = RecordsSource(
+            AsyncMock(),
+            dict(
+                table="change_request",
+                instance=dict(
+                    host="http://my.host.name", username="user", password="pass"
+                ),
+                remote_servicenow_timezone="America/New_York",
+                read_ahead=2,
+            ),
+        )
+
+        assert source.table_client.read_ahead == 2
+        assert source.table_client.stream is True
+
     @patch("extensions.eda.plugins.event_source.records.table.TableClient")
     def test_lookup_snow_user_timezone_explicit(self, mock_table_client, source):
         # Mock the temporary client
@@ -437,6 +479,22 @@ class TestRecordsSource:
         await source._poll_for_records()
         assert source.queue.put.call_count == 0
 
+    @pytest.mark.asyncio
+    async def test_poll_for_records_reads_off_the_event_loop(self, source):
+        loop_thread = threading.get_ident()
+        reading_threads = set()
+
+        def records():
+            for sys_id in ("123", "456"):
+                reading_threads.add(threading.get_ident())
+                yield dict(sys_id=sys_id, sys_updated_on="2026-08-13 12:00:00")
+
+        source.table_client.list_records.return_value = records()
+        source.should_record_be_sent_to_queue = Mock(return_value=True)
+        await source._poll_for_records()
+        assert source.queue.put.call_count == 2
+        assert loop_thread not in reading_threads
+
     @pytest.mark.asyncio
     async def test_poll_for_records_custom_timestamp_field(self, custom_source):
         custom_source.table_client.list_records.return_value = [
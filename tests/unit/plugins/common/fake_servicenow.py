@@ -0,0 +1,1042 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Local stand-in for a ServiceNow instance, for end-to-end and load testing of the
+Client without network access.
+
+Implemented APIs:
+  - Table API (/api/now/table): offset/limit paging, X-Total-Count,
+    sysparm_no_count, encoded queries, field=value filters, dot-walked
+    sysparm_fields, sysparm_display_value and sysparm_exclude_reference_link
+  - Attachment API (/api/now/attachment)
+  - CMDB Instance API (/api/now/cmdb/instance)
+  - TinyURL API (/api/now/tinyurl) and sysparm_tiny
+  - Batch API (/api/now/v1/batch)
+  - OAuth token endpoint (/oauth_token.do)
+
+Versioned paths (/api/now/v1/...) are served like unversioned ones.
+
+Only the standard library is used, so the server can also run on its own:
+
+  python fake_servicenow.py --port 8080 --cis 100000 --relationships 200000
+
+and be targeted with host=http://127.0.0.1:8080, username=admin, password=admin.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+# Parent of each table, so that a query against a table also returns the
+# records of its child tables, like cmdb_ci does on a real instance.
+TABLE_PARENTS = {
+    "cmdb_ci": "cmdb",
+    "cmdb_ci_hardware": "cmdb_ci",
+    "cmdb_ci_computer": "cmdb_ci_hardware",
+    "cmdb_ci_server": "cmdb_ci_computer",
+    "cmdb_ci_linux_server": "cmdb_ci_server",
+    "cmdb_ci_win_server": "cmdb_ci_server",
+    "cmdb_ci_appl": "cmdb_ci",
+    "cmdb_ci_db_instance": "cmdb_ci_appl",
+    "cmdb_ci_netgear": "cmdb_ci_hardware",
+    "incident": "task",
+    "problem": "task",
+    "problem_task": "task",
+    "change_request": "task",
+    "change_task": "task",
+    "sc_request": "task",
+    "sc_req_item": "task",
+    "sc_task": "task",
+}
+NUMBER_PREFIXES = {
+    "incident": "INC",
+    "problem": "PRB",
+    "problem_task": "PTASK",
+    "change_request": "CHG",
+    "change_task": "CTASK",
+    "sc_request": "REQ",
+    "sc_req_item": "RITM",
+    "sc_task": "SCTASK",
+}
+# Fields used as the display value of a referenced record, in order of preference.
+DISPLAY_FIELDS = ("name", "number", "user_name", "short_description")
+# Fields that hold sys_ids without being references.
+PLAIN_ID_FIELDS = ("sys_id", "table_sys_id")
+DEFAULT_LIMIT = 10000
+ATTACHMENT_FILTERS = ("table_name", "table_sys_id", "file_name")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SYS_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+# Field names are lower case, so the first upper case operator ends the field.
+CONDITION_PATTERN = re.compile(
+    r"^([a-z0-9_.]+?)"
+    r"(ISNOTEMPTY|ISEMPTY|NOTEMPTY|EMPTYSTRING|EMPTY|ANYTHING|NOT IN|NOT LIKE|"
+    r"STARTSWITH|ENDSWITH|LIKE|BETWEEN|NSAMEAS|SAMEAS|IN|!=|>=|<=|=|>|<)(.*)$"
+)
+
+
+def new_sys_id(rng=None):
+    if rng is None:
+        return uuid.uuid4().hex
+    return "%032x" % rng.getrandbits(128)
+
+
+def timestamp(value=None):
+    return (value or datetime.now(timezone.utc)).strftime(TIMESTAMP_FORMAT)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(left, right):
+    # Numbers are compared as numbers, everything else as strings.
+    left_number, right_number = _number(left), _number(right)
+    if left_number is not None and right_number is not None:
+        return (left_number > right_number) - (left_number < right_number)
+    left, right = str(left), str(right)
+    return (left > right) - (left < right)
+
+
+def _match(operator, actual, expected, other):
+    actual = "" if actual is None else str(actual)
+    if operator == "=":
+        return actual == expected
+    if operator == "!=":
+        return actual != expected
+    if operator in ("ISEMPTY", "EMPTY", "EMPTYSTRING"):
+        return actual == ""
+    if operator in ("ISNOTEMPTY", "NOTEMPTY"):
+        return actual != ""
+    if operator == "ANYTHING":
+        return True
+    if operator == "IN":
+        return actual in expected.split(",")
+    if operator == "NOT IN":
+        return actual not in expected.split(",")
+    if operator == "LIKE":
+        return expected.lower() in actual.lower()
+    if operator == "NOT LIKE":
+        return expected.lower() not in actual.lower()
+    if operator == "STARTSWITH":
+        return actual.lower().startswith(expected.lower())
+    if operator == "ENDSWITH":
+        return actual.lower().endswith(expected.lower())
+    if operator == "BETWEEN":
+        low, _sep, high = expected.partition("@")
+        return _compare(actual, low) >= 0 and _compare(actual, high) <= 0
+    if operator in ("SAMEAS", "NSAMEAS"):
+        return (actual == ("" if other is None else str(other))) == (
+            operator == "SAMEAS"
+        )
+    if actual == "":
+        return False
+    order = _compare(actual, expected)
+    return {">": order > 0, ">=": order >= 0, "<": order < 0, "<=": order <= 0}[
+        operator
+    ]
+
+
+class Condition:
+    def __init__(self, term):
+        match = CONDITION_PATTERN.match(term)
+        if not match:
+            raise ValueError("Unsupported query condition '{0}'".format(term))
+        self.field, self.operator, self.value = match.groups()
+
+    def __call__(self, store, record):
+        actual = store.resolve(record, self.field)
+        other = None
+        if self.operator in ("SAMEAS", "NSAMEAS"):
+            other = store.resolve(record, self.value)
+        return _match(self.operator, actual, self.value, other)
+
+
+class EncodedQuery:
+    """
+    Parsed sysparm_query. ^ joins conditions with AND, ^OR joins a condition
+    with the previous one and ^NQ starts a new query whose results are added.
+    """
+
+    def __init__(self, query):
+        self.groups = []
+        self.order_by = []
+        for group in (query or "").split("^NQ"):
+            clauses = []
+            for term in group.split("^"):
+                if not term or term == "EQ":
+                    continue
+                if term.startswith("ORDERBYDESC"):
+                    self.order_by.append((term[len("ORDERBYDESC") :], True))
+                elif term.startswith("ORDERBY"):
+                    self.order_by.append((term[len("ORDERBY") :], False))
+                elif term.startswith("OR") and clauses:
+                    clauses[-1].append(Condition(term[2:]))
+                else:
+                    clauses.append([Condition(term)])
+            if clauses:
+                self.groups.append(clauses)
+
+    def matches(self, store, record):
+        if not self.groups:
+            return True
+        return any(
+            all(
+                any(condition(store, record) for condition in clause)
+                for clause in clauses
+            )
+            for clauses in self.groups
+        )
+
+    def sort(self, store, records):
+        # Sort by the last key first, so that the first key wins.
+        for field, descending in reversed(self.order_by):
+            records.sort(
+                key=lambda r: str(store.resolve(r, field) or ""), reverse=descending
+            )
+        return records
+
+
+class Store:
+    """
+    Thread-safe in-memory record storage.
+
+    Records are plain dicts. Reference fields hold the sys_id of the referenced
+    record, which is what dot-walking follows and what encoded queries compare.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.by_sys_id = {}
+        self.attachments = {}
+        self.tiny_urls = {}
+        self.counters = {}
+        self.lock = threading.RLock()
+        self.version = 0
+        self._query_cache = {}
+
+    def _touch(self):
+        self.version += 1
+        self._query_cache = {}
+
+    def table_family(self, table):
+        family = []
+        for name in self.tables:
+            current = name
+            while current and current != table:
+                current = TABLE_PARENTS.get(current)
+            if current == table:
+                family.append(name)
+        return family
+
+    def _prepare(self, table, record, rng=None, created=None):
+        record = dict(record)
+        record.setdefault("sys_id", new_sys_id(rng))
+        record.setdefault("sys_class_name", table)
+        created = timestamp(created)
+        record.setdefault("sys_created_on", created)
+        record.setdefault("sys_updated_on", record["sys_created_on"])
+        if table in NUMBER_PREFIXES and "number" not in record:
+            count = self.counters.get(table, 0) + 1
+            self.counters[table] = count
+            record["number"] = "{0}{1:07d}".format(NUMBER_PREFIXES[table], count)
+        return record
+
+    def insert(self, table, record):
+        with self.lock:
+            record = self._prepare(table, record)
+            self.tables.setdefault(table, {})[record["sys_id"]] = record
+            self.by_sys_id[record["sys_id"]] = (table, record)
+            self._touch()
+            return record
+
+    def insert_many(self, table, records, rng=None, created=None):
+        with self.lock:
+            rows = self.tables.setdefault(table, {})
+            for record in records:
+                record = self._prepare(table, record, rng, created)
+                rows[record["sys_id"]] = record
+                self.by_sys_id[record["sys_id"]] = (table, record)
+            self._touch()
+
+    def get(self, table, sys_id):
+        with self.lock:
+            entry = self.by_sys_id.get(sys_id)
+            if entry and entry[0] in self.table_family(table):
+                return entry[1]
+            return None
+
+    def update(self, table, sys_id, values):
+        with self.lock:
+            record = self.get(table, sys_id)
+            if record is None:
+                return None
+            record.update(values)
+            record["sys_updated_on"] = timestamp()
+            self._touch()
+            return record
+
+    def delete(self, table, sys_id):
+        with self.lock:
+            record = self.get(table, sys_id)
+            if record is None:
+                return False
+            del self.tables[self.by_sys_id.pop(sys_id)[0]][sys_id]
+            self.attachments.pop(sys_id, None)
+            self._touch()
+            return True
+
+    def query(self, table, sysparm_query=None):
+        """
+        Return the records of table and its child tables that match the
+        encoded query. Results are cached until the next write.
+        """
+        with self.lock:
+            key = (table, sysparm_query or "")
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                return cached
+            query = EncodedQuery(sysparm_query)
+            records = [
+                record
+                for name in self.table_family(table)
+                for record in self.tables[name].values()
+                if query.matches(self, record)
+            ]
+            records = query.sort(self, records)
+            self._query_cache[key] = records
+            return records
+
+    def resolve(self, record, field):
+        """
+        Return the raw value of a (dot-walked) field of record.
+        """
+        value = record
+        for part in field.split("."):
+            if not isinstance(value, dict):
+                entry = self.by_sys_id.get(value) if isinstance(value, str) else None
+                if entry is None:
+                    return None
+                value = entry[1]
+            value = value.get(part)
+        return value
+
+    def display_value(self, sys_id):
+        entry = self.by_sys_id.get(sys_id)
+        if entry is None:
+            return ""
+        record = entry[1]
+        for field in DISPLAY_FIELDS:
+            if record.get(field):
+                return record[field]
+        return sys_id
+
+    def reference_table(self, field, value):
+        """
+        Return the table of the record that value references, or None if the
+        value is not a reference.
+        """
+        if field.rsplit(".", 1)[-1] in PLAIN_ID_FIELDS or not isinstance(value, str):
+            return None
+        if not SYS_ID_PATTERN.match(value):
+            return None
+        entry = self.by_sys_id.get(value)
+        return entry[0] if entry else None
+
+
+class Formatter:
+    """
+    Renders records the way the Table API does for a given set of sysparm
+    parameters.
+    """
+
+    def __init__(self, store, base_url, params):
+        self.store = store
+        self.base_url = base_url
+        self.display = params.get("sysparm_display_value", "false").lower()
+        self.exclude_link = (
+            params.get("sysparm_exclude_reference_link", "false").lower() == "true"
+        )
+        fields = params.get("sysparm_fields")
+        self.fields = [f.strip() for f in fields.split(",")] if fields else None
+
+    def field(self, name, value):
+        table = self.store.reference_table(name, value)
+        if table is None:
+            if self.display == "all":
+                return dict(display_value=value, value=value)
+            return value
+
+        display_value = self.store.display_value(value)
+        if self.exclude_link:
+            if self.display == "true":
+                return display_value
+            if self.display == "all":
+                return dict(display_value=display_value, value=value)
+            return value
+
+        link = "{0}/api/now/table/{1}/{2}".format(self.base_url, table, value)
+        if self.display == "true":
+            return dict(display_value=display_value, link=link)
+        if self.display == "all":
+            return dict(display_value=display_value, link=link, value=value)
+        return dict(link=link, value=value)
+
+    def record(self, record):
+        fields = self.fields or list(record)
+        return dict(
+            (name, self.field(name, self.store.resolve(record, name)))
+            for name in fields
+        )
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Collects the responses of Batch API sub-requests instead of sending them.
+    captured = None
+
+    # Routing
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def log_message(self, *args):
+        pass
+
+    def _handle(self, method):
+        server = self.server
+        parts = urlsplit(self.path)
+        self.params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        self.body = self._read_body()
+        segments = [s for s in parts.path.split("/") if s]
+        server.record_request(method, parts.path)
+        if server.latency:
+            time.sleep(server.latency)
+
+        if segments == ["oauth_token.do"] and method == "POST":
+            return self._oauth_token()
+        if not self._authenticated():
+            return self._error(401, "User Not Authenticated")
+        self._dispatch(method, segments)
+
+    def _dispatch(self, method, segments):
+        if segments[2:3] == ["v1"]:
+            segments = segments[:2] + segments[3:]
+        if segments[:2] != ["api", "now"] or len(segments) < 3:
+            return self._not_found()
+
+        handler = {
+            "table": self._table,
+            "attachment": self._attachment,
+            "cmdb": self._cmdb,
+            "tinyurl": self._tinyurl,
+            "batch": self._batch,
+        }.get(segments[2])
+        if handler is None:
+            return self._not_found()
+        try:
+            return handler(method, segments[3:])
+        except ValueError as e:
+            return self._error(400, str(e))
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    @property
+    def base_url(self):
+        return "http://{0}".format(self.headers.get("Host", "localhost"))
+
+    def _json_body(self):
+        try:
+            return json.loads(self.body.decode("utf-8") or "{}")
+        except ValueError:
+            raise ValueError("Invalid JSON payload")
+
+    # Responses
+
+    def _send(self, status, payload=None, headers=None, body=None, content_type=None):
+        if body is None:
+            body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            content_type = content_type or "application/json"
+        if self.captured is not None:
+            headers = dict(headers or {})
+            if content_type:
+                headers["Content-Type"] = content_type
+            self.captured.append((status, headers, body))
+            return
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(
+            status, dict(error=dict(message=message, detail=None), status="failure")
+        )
+
+    def _not_found(self):
+        self._error(404, "Requested URI does not represent any resource")
+
+    def _send_page(self, records, render):
+        # X-Total-Count holds the number of matching records, not of the page.
+        offset = int(self.params.get("sysparm_offset") or 0)
+        limit = int(self.params.get("sysparm_limit") or DEFAULT_LIMIT)
+        headers = {}
+        if self.params.get("sysparm_no_count", "false").lower() != "true":
+            headers["X-Total-Count"] = str(len(records))
+        page = [render(record) for record in records[offset : offset + limit]]
+        self._send(200, dict(result=page), headers)
+
+    # Authentication
+
+    def _authenticated(self):
+        server = self.server
+        if not server.users and not server.clients:
+            return True
+        header = self.headers.get("Authorization", "")
+        scheme, _sep, credentials = header.partition(" ")
+        if scheme.lower() == "basic":
+            try:
+                username, _sep, password = (
+                    base64.b64decode(credentials).decode("utf-8").partition(":")
+                )
+            except ValueError:
+                return False
+            return server.users.get(username) == password
+        if scheme.lower() == "bearer":
+            expires_at = server.tokens.get(credentials)
+            return expires_at is not None and expires_at > time.time()
+        return False
+
+    def _oauth_token(self):
+        server = self.server
+        form = dict(parse_qsl(self.body.decode("utf-8")))
+        grant_type = form.get("grant_type")
+        if server.clients.get(form.get("client_id")) != form.get("client_secret"):
+            return self._send(401, dict(error="access_denied"))
+        if grant_type == "password":
+            valid = server.users.get(form.get("username")) == form.get("password")
+        elif grant_type == "refresh_token":
+            valid = form.get("refresh_token") in server.refresh_tokens
+        else:
+            valid = grant_type == "client_credentials"
+        if not valid:
+            return self._send(401, dict(error="access_denied"))
+        self._send(200, server.issue_token())
+
+    # Table API
+
+    def _table(self, method, segments):
+        store = self.server.store
+        if not segments:
+            return self._not_found()
+        table = segments[0]
+        sys_id = segments[1] if len(segments) > 1 else None
+        formatter = Formatter(store, self.base_url, self.params)
+
+        if method == "GET" and sys_id is None:
+            query = self.params.get("sysparm_query")
+            if "sysparm_tiny" in self.params:
+                stored = store.tiny_urls.get(self.params["sysparm_tiny"])
+                if stored is None:
+                    return self._not_found()
+                # Parameters sent along with sysparm_tiny, such as the offset,
+                # take precedence over the stored ones.
+                self.params = dict(stored, **self.params)
+                formatter = Formatter(store, self.base_url, self.params)
+                query = self.params.get("sysparm_query")
+            # Other parameters match fields directly.
+            query = "^".join(
+                [query or ""]
+                + [
+                    "{0}={1}".format(name, value)
+                    for name, value in sorted(self.params.items())
+                    if not name.startswith("sysparm_")
+                ]
+            )
+            return self._send_page(store.query(table, query), formatter.record)
+        if method == "POST" and sys_id is None:
+            record = store.insert(table, self._json_body())
+            return self._send(201, dict(result=formatter.record(record)))
+        if sys_id is None:
+            return self._not_found()
+
+        if method == "GET":
+            record = store.get(table, sys_id)
+        elif method in ("PATCH", "PUT"):
+            record = store.update(table, sys_id, self._json_body())
+        elif method == "DELETE":
+            return self._send(204) if store.delete(table, sys_id) else self._not_found()
+        else:
+            return self._not_found()
+        if record is None:
+            return self._error(404, "No Record found")
+        self._send(200, dict(result=formatter.record(record)))
+
+    # Attachment API
+
+    def _attachment(self, method, segments):
+        store = self.server.store
+        formatter = Formatter(store, self.base_url, self.params)
+        if not segments and method == "GET":
+            # Besides sysparm_query, metadata fields can be matched directly.
+            query = "^".join(
+                [self.params.get("sysparm_query") or ""]
+                + [
+                    "{0}={1}".format(name, self.params[name])
+                    for name in ATTACHMENT_FILTERS
+                    if name in self.params
+                ]
+            )
+            records = store.query("sys_attachment", query)
+            return self._send_page(records, formatter.record)
+        if segments == ["file"] and method == "POST":
+            return self._upload_attachment(formatter)
+        if not segments:
+            return self._not_found()
+
+        sys_id = segments[0]
+        metadata = store.get("sys_attachment", sys_id)
+        if metadata is None:
+            return self._error(
+                404, "Record doesn't exist or ACL restricts the record retrieval"
+            )
+        if segments[1:] == ["file"] and method == "GET":
+            return self._send(
+                200,
+                body=store.attachments.get(sys_id, b""),
+                content_type=metadata["content_type"],
+            )
+        if len(segments) == 1 and method == "GET":
+            return self._send(200, dict(result=formatter.record(metadata)))
+        if len(segments) == 1 and method == "DELETE":
+            store.delete("sys_attachment", sys_id)
+            return self._send(204)
+        self._not_found()
+
+    def _upload_attachment(self, formatter):
+        store = self.server.store
+        params = self.params
+        if (
+            store.get(params.get("table_name", ""), params.get("table_sys_id", ""))
+            is None
+        ):
+            return self._error(400, "Invalid table name or sys_id")
+        record = store.insert(
+            "sys_attachment",
+            dict(
+                table_name=params["table_name"],
+                table_sys_id=params["table_sys_id"],
+                file_name=params.get("file_name", ""),
+                content_type=params.get(
+                    "content_type",
+                    self.headers.get("Content-Type", "application/octet-stream"),
+                ),
+                size_bytes=str(len(self.body)),
+                hash=params.get("hash") or hashlib.sha256(self.body).hexdigest(),
+            ),
+        )
+        store.attachments[record["sys_id"]] = self.body
+        self._send(201, dict(result=formatter.record(record)))
+
+    # CMDB Instance API
+
+    def _cmdb(self, method, segments):
+        if not segments or segments[0] != "instance" or len(segments) < 2:
+            return self._not_found()
+        store = self.server.store
+        ci_class = segments[1]
+        sys_id = segments[2] if len(segments) > 2 else None
+        rest = segments[3:]
+
+        if sys_id is None:
+            if method == "GET":
+                records = store.query(ci_class, self.params.get("sysparm_query"))
+                return self._send_page(
+                    records, lambda r: dict(sys_id=r["sys_id"], name=r.get("name", ""))
+                )
+            if method == "POST":
+                payload = self._json_body()
+                record = store.insert(ci_class, payload.get("attributes") or {})
+                return self._send(201, dict(result=self._cmdb_instance(record)))
+            return self._not_found()
+
+        record = store.get(ci_class, sys_id)
+        if record is None:
+            return self._error(404, "No Record found")
+        if method == "GET" and not rest:
+            return self._send(200, dict(result=self._cmdb_instance(record)))
+        if method == "PATCH" and not rest:
+            store.update(ci_class, sys_id, self._json_body().get("attributes") or {})
+            return self._send(200, dict(result=self._cmdb_instance(record)))
+        if method == "POST" and rest == ["relation"]:
+            self._cmdb_add_relations(sys_id, self._json_body())
+            return self._send(201, dict(result=self._cmdb_instance(record)))
+        if method == "DELETE" and len(rest) == 2 and rest[0] == "relation":
+            if not store.delete("cmdb_rel_ci", rest[1]):
+                return self._error(404, "No Record found")
+            return self._send(204)
+        self._not_found()
+
+    def _cmdb_add_relations(self, sys_id, payload):
+        store = self.server.store
+        for relation in payload.get("outbound_relations") or []:
+            store.insert(
+                "cmdb_rel_ci",
+                dict(parent=sys_id, child=relation["target"], type=relation["type"]),
+            )
+        for relation in payload.get("inbound_relations") or []:
+            store.insert(
+                "cmdb_rel_ci",
+                dict(parent=relation["target"], child=sys_id, type=relation["type"]),
+            )
+
+    def _cmdb_instance(self, record):
+        store = self.server.store
+        formatter = Formatter(store, self.base_url, dict(sysparm_display_value="all"))
+
+        def relations(column, target_column):
+            return [
+                dict(
+                    sys_id=rel["sys_id"],
+                    type=formatter.field("type", rel.get("type")),
+                    target=formatter.field(target_column, rel.get(target_column)),
+                )
+                for rel in store.query(
+                    "cmdb_rel_ci", "{0}={1}".format(column, record["sys_id"])
+                )
+            ]
+
+        return dict(
+            attributes=Formatter(
+                store, self.base_url, dict(sysparm_display_value="false")
+            ).record(record),
+            outbound_relations=relations("parent", "child"),
+            inbound_relations=relations("child", "parent"),
+        )
+
+    # TinyURL API
+
+    def _tinyurl(self, method, segments):
+        if method != "POST" or segments:
+            return self._not_found()
+        url = self._json_body().get("url", "")
+        parts = urlsplit(url)
+        tiny = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        self.server.store.tiny_urls[tiny] = dict(parse_qsl(parts.query))
+        table = parts.path.rstrip("/").rsplit("/", 1)[-1]
+        self._send(200, dict(result="{0}_list.do?sysparm_tiny={1}".format(table, tiny)))
+
+    # Batch API
+
+    def _batch(self, method, segments):
+        if method != "POST" or segments:
+            return self._not_found()
+        payload = self._json_body()
+        rest_requests = payload.get("rest_requests") or []
+        limit = self.server.batch_limit
+        serviced = []
+        for request in rest_requests[:limit]:
+            serviced.append(dict(self._batch_request(request), id=request["id"]))
+        self.params, self.body = {}, b""
+        self._send(
+            200,
+            dict(
+                batch_request_id=payload.get("batch_request_id"),
+                serviced_requests=serviced,
+                unserviced_requests=[r["id"] for r in rest_requests[len(serviced) :]],
+            ),
+        )
+
+    def _batch_request(self, request):
+        parts = urlsplit(request["url"])
+        method = request["method"].upper()
+        self.params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        self.body = base64.b64decode(request.get("body") or "")
+        self.server.record_request(method, parts.path)
+        self.captured = []
+        try:
+            self._dispatch(method, [s for s in parts.path.split("/") if s])
+            status, headers, body = self.captured[0]
+        finally:
+            self.captured = None
+        return dict(
+            status_code=status,
+            status_text=self.responses.get(status, ("",))[0],
+            headers=[dict(name=k, value=v) for k, v in headers.items()],
+            body=base64.b64encode(body).decode("ascii"),
+            execution_time=0,
+        )
+
+
+class FakeServiceNow(ThreadingHTTPServer):
+    """
+    Threaded HTTP server that serves the store.
+
+    users    -- username to password mapping for basic and OAuth password auth
+    clients  -- OAuth client_id to client_secret mapping
+    latency  -- seconds added to every response
+    batch_limit -- number of Batch API sub-requests serviced per call, None
+                   services all of them
+
+    Authentication is disabled when both users and clients are empty.
+    requests holds the number of requests per (method, path) for assertions.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        store=None,
+        address=("127.0.0.1", 0),
+        users=None,
+        clients=None,
+        latency=0,
+        token_lifetime=1800,
+        batch_limit=None,
+    ):
+        ThreadingHTTPServer.__init__(self, address, Handler)
+        self.store = store or Store()
+        self.users = dict(users or {})
+        self.clients = dict(clients or {})
+        self.latency = latency
+        self.token_lifetime = token_lifetime
+        self.batch_limit = batch_limit
+        self.tokens = {}
+        self.refresh_tokens = set()
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        return "http://{0}:{1}".format(*self.server_address[:2])
+
+    def record_request(self, method, path):
+        with self._lock:
+            key = (method, path)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def request_count(self, method=None, path=None):
+        return sum(
+            count
+            for (m, p), count in self.requests.items()
+            if (method is None or m == method) and (path is None or p == path)
+        )
+
+    def issue_token(self):
+        access_token, refresh_token = new_sys_id(), new_sys_id()
+        with self._lock:
+            self.tokens[access_token] = time.time() + self.token_lifetime
+            self.refresh_tokens.add(refresh_token)
+        return dict(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="Bearer",
+            expires_in=self.token_lifetime,
+        )
+
+    def start(self):
+        # A short poll interval keeps stop() fast.
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs=dict(poll_interval=0.05), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+# Synthetic data
+
+CI_CLASSES = (
+    ("cmdb_ci_linux_server", "lnx", "Linux Red Hat"),
+    ("cmdb_ci_win_server", "win", "Windows 2019 Datacenter"),
+    ("cmdb_ci_db_instance", "db", ""),
+    ("cmdb_ci_appl", "app", ""),
+    ("cmdb_ci_netgear", "net", ""),
+)
+REL_TYPES = (
+    "Depends on::Used by",
+    "Runs on::Runs",
+    "Contains::Contained by",
+    "Connects to::Connected by",
+    "Hosted on::Hosts",
+)
+ENVIRONMENTS = ("production", "test", "development")
+LOCATIONS = ("Ljubljana", "Raleigh", "Amsterdam", "Tokyo", "Sydney")
+
+
+def generate_relationship_types(store):
+    """
+    Add the relationship types that generate_cmdb uses and return their
+    sys_ids.
+    """
+    existing = store.query("cmdb_rel_type")
+    if existing:
+        return [record["sys_id"] for record in existing]
+    store.insert_many("cmdb_rel_type", (dict(name=name) for name in REL_TYPES))
+    return [record["sys_id"] for record in store.query("cmdb_rel_type")]
+
+
+def generate_cis(store, count, seed=0):
+    """
+    Add count configuration items spread over CI_CLASSES and return their
+    sys_ids. The data only depends on count and seed.
+    """
+    rng = random.Random(seed)
+    epoch = datetime(2024, 1, 1)
+    by_class = dict((ci_class, []) for ci_class, _prefix, _os in CI_CLASSES)
+    sys_ids = []
+    for i in range(count):
+        ci_class, prefix, os_name = CI_CLASSES[i % len(CI_CLASSES)]
+        sys_id = new_sys_id(rng)
+        sys_ids.append(sys_id)
+        by_class[ci_class].append(
+            dict(
+                sys_id=sys_id,
+                name="{0}-{1:06d}".format(prefix, i),
+                fqdn="{0}-{1:06d}.example.com".format(prefix, i),
+                ip_address="10.{0}.{1}.{2}".format(
+                    (i >> 16) & 255, (i >> 8) & 255, i & 255
+                ),
+                serial_number="SN{0:010d}".format(rng.getrandbits(32)),
+                os=os_name,
+                environment=rng.choice(ENVIRONMENTS),
+                location=rng.choice(LOCATIONS),
+                install_status=rng.choice(("1", "1", "1", "3", "7")),
+                operational_status=rng.choice(("1", "1", "2")),
+                sys_created_on=timestamp(epoch + timedelta(seconds=i)),
+            )
+        )
+    for ci_class, records in by_class.items():
+        store.insert_many(ci_class, records)
+    return sys_ids
+
+
+def generate_relationships(store, ci_sys_ids, count, seed=0):
+    """
+    Add count cmdb_rel_ci records between random pairs of the given CIs.
+    """
+    # A seed of its own keeps the sys_ids apart from the ones of generate_cis.
+    rng = random.Random("cmdb_rel_ci:{0}".format(seed))
+    types = generate_relationship_types(store)
+    store.insert_many(
+        "cmdb_rel_ci",
+        (
+            dict(
+                sys_id=new_sys_id(rng),
+                parent=parent,
+                child=child,
+                type=rng.choice(types),
+            )
+            for parent, child in (rng.sample(ci_sys_ids, 2) for _i in range(count))
+        ),
+    )
+
+
+def generate_cmdb(store, cis=100000, relationships=None, seed=0):
+    """
+    Fill the store with cis configuration items and relationships between
+    them, one per CI by default.
+    """
+    sys_ids = generate_cis(store, cis, seed)
+    if len(sys_ids) > 1:
+        generate_relationships(
+            store, sys_ids, cis if relationships is None else relationships, seed
+        )
+    return sys_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cis", type=int, default=100000)
+    parser.add_argument("--relationships", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--client-id", default="client")
+    parser.add_argument("--client-secret", default="secret")
+    args = parser.parse_args()
+
+    store = Store()
+    started = time.time()
+    generate_cmdb(store, args.cis, args.relationships, args.seed)
+    print(
+        "Generated {0} CIs in {1:.1f}s".format(args.cis, time.time() - started),
+        flush=True,
+    )
+
+    server = FakeServiceNow(
+        store,
+        (args.address, args.port),
+        users={args.username: args.password},
+        clients={args.client_id: args.client_secret},
+        latency=args.latency,
+    )
+    print("Serving on {0}".format(server.url), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
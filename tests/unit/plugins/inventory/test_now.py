@@ -1217,3 +1217,56 @@ class TestInventoryModuleEnhancedQueryFeatures:
         result = inventory_plugin._InventoryModule__get_query_columns(columns)
 
         assert result is None
+
+
+class TestCreateTableClient:
+    def test_read_ahead(self, inventory_plugin, mocker):
+        options = dict(
+            instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+            max_concurrency=1,
+            read_ahead=2,
+            sysparm_limit=100,
+            enhanced=True,
+            enhanced_sysparm_limit=50,
+            adaptive_sysparm_limit=False,
+        )
+        mocker.patch.object(inventory_plugin, "get_option", new=options.get)
+        mocker.patch.object(
+            inventory_plugin, "_get_instance", return_value=options["instance"]
+        )
+
+        (
+            table_client,
+            enhanced_table_client,
+        ) = inventory_plugin._InventoryModule__create_table_client()
+
+        assert table_client.read_ahead == 2
+        assert table_client.batch_size == 100
+        assert enhanced_table_client.read_ahead == 2
+        assert enhanced_table_client.batch_size == 50
+
+    def test_max_page_bytes(self, inventory_plugin, mocker):
+        options = dict(
+            instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+            max_concurrency=1,
+            read_ahead=0,
+            sysparm_limit=100,
+            enhanced=False,
+            adaptive_sysparm_limit=True,
+            target_page_latency=5,
+            max_page_bytes=1000000,
+        )
+        mocker.patch.object(inventory_plugin, "get_option", new=options.get)
+        mocker.patch.object(
+            inventory_plugin, "_get_instance", return_value=options["instance"]
+        )
+
+        table_client, _enhanced = (
+            inventory_plugin._InventoryModule__create_table_client()
+        )
+
+        assert table_client.batch_sizer.max_page_bytes == 1000000
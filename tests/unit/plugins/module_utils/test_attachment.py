@@ -285,7 +285,34 @@ class TestAttachmentListRecords:
         )
         client.get.assert_any_call(
             "api/now/attachment",
-            query=dict(sysparm_limit=1, sysparm_offset=1),
+            query=dict(sysparm_limit=1, sysparm_offset=1, sysparm_no_count="true"),
+        )
+
+    def test_pagination_without_total_count(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 3}]}'),
+            Response(200, '{"result": []}'),
+        )
+        a = attachment.AttachmentClient(client, batch_size=1)
+
+        records = a.list_records()
+
+        assert [dict(a=3)] == records
+        assert 2 == len(client.get.mock_calls)
+
+    def test_pagination_without_count(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 3}, {"a": 2}]}'),
+            Response(200, '{"result": [{"a": 1}]}'),
+        )
+        a = attachment.AttachmentClient(client, batch_size=2, count=False)
+
+        records = a.list_records()
+
+        assert [dict(a=3), dict(a=2), dict(a=1)] == records
+        client.get.assert_any_call(
+            "api/now/attachment",
+            query=dict(sysparm_limit=2, sysparm_offset=0, sysparm_no_count="true"),
         )
 
 
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+import json
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    batch,
+    client as client_module,
+    errors,
+)
+from ansible_collections.servicenow.itsm.plugins.module_utils.client import Response
+from ansible_collections.servicenow.itsm.tests.unit.plugins.common import (
+    fake_servicenow,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def b64(value):
+    return base64.b64encode(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+def batch_response(serviced, unserviced=()):
+    return Response(
+        200,
+        json.dumps(
+            dict(
+                batch_request_id="1",
+                serviced_requests=serviced,
+                unserviced_requests=list(unserviced),
+            )
+        ),
+    )
+
+
+class TestBatchRequest:
+    def test_url(self):
+        request = batch.BatchRequest(
+            "GET", "api/now/table/incident", dict(sysparm_limit=1)
+        )
+
+        assert request.url() == "/api/now/table/incident?sysparm_limit=1"
+        assert request.body() is None
+
+    def test_json_body(self):
+        request = batch.BatchRequest("POST", "api/now/table/incident", data=dict(a=1))
+
+        assert json.loads(request.body()) == dict(a=1)
+
+    def test_both_payloads(self):
+        with pytest.raises(AssertionError):
+            batch.BatchRequest("POST", "x", data=dict(a=1), bytes=b"a")
+
+
+class TestBatchClientSend:
+    def test_requests_are_encoded(self, client):
+        client.post.return_value = batch_response([])
+        requests = [
+            batch.BatchRequest("GET", "api/now/table/incident/1"),
+            batch.BatchRequest("POST", "api/now/table/incident", data=dict(a=1)),
+        ]
+
+        with pytest.raises(errors.ServiceNowError, match="did not service"):
+            batch.BatchClient(client).send(requests)
+
+        path, payload = client.post.call_args[0]
+        assert path == "api/now/v1/batch"
+        assert [r["id"] for r in payload["rest_requests"]] == ["0", "1"]
+        assert "body" not in payload["rest_requests"][0]
+        assert payload["rest_requests"][1]["method"] == "POST"
+        assert payload["rest_requests"][1]["body"] == base64.b64encode(
+            b'{"a":1}'
+        ).decode("ascii")
+
+    def test_responses_are_demultiplexed(self, client):
+        client.post.return_value = batch_response(
+            [
+                dict(id="1", status_code=404, body=b64(dict(error="missing"))),
+                dict(
+                    id="0",
+                    status_code=200,
+                    body=b64(dict(result=dict(n=0))),
+                    headers=[dict(name="X-Total-Count", value="1")],
+                ),
+            ]
+        )
+        requests = [batch.BatchRequest("GET", "a"), batch.BatchRequest("GET", "b")]
+
+        responses = batch.BatchClient(client).send(requests)
+
+        assert [r.status for r in responses] == [200, 404]
+        assert responses[0].json == dict(result=dict(n=0))
+        assert responses[0].headers == {"x-total-count": "1"}
+
+    def test_chunks(self, client):
+        def post(path, payload):
+            return batch_response(
+                [
+                    dict(id=r["id"], status_code=204, body="")
+                    for r in payload["rest_requests"]
+                ]
+            )
+
+        client.post.side_effect = post
+        requests = [batch.BatchRequest("DELETE", str(i)) for i in range(5)]
+
+        responses = batch.BatchClient(client, chunk_size=2).send(requests)
+
+        assert len(responses) == 5
+        assert client.post.call_count == 3
+
+    def test_unserviced_requests_are_resent(self, client):
+        def post(path, payload):
+            first = payload["rest_requests"][0]
+            return batch_response(
+                [dict(id=first["id"], status_code=200, body=b64(first["url"]))],
+                [r["id"] for r in payload["rest_requests"][1:]],
+            )
+
+        client.post.side_effect = post
+        requests = [batch.BatchRequest("GET", str(i)) for i in range(3)]
+
+        responses = batch.BatchClient(client, chunk_size=2).send(requests)
+
+        assert [r.json for r in responses] == ["/0", "/1", "/2"]
+        assert client.post.call_count == 3
+
+    def test_caches_are_invalidated(self, client):
+        client.post.return_value = batch_response(
+            [dict(id="0", status_code=201, body=b64(dict(result=dict())))]
+        )
+        requests = [batch.BatchRequest("POST", "api/now/table/incident", data={})]
+
+        batch.BatchClient(client).send(requests)
+
+        client.invalidate_caches.assert_called_once_with(
+            "POST", "/api/now/table/incident"
+        )
+
+
+class TestBatchClientCheck:
+    def test_ok(self):
+        responses = [Response(200, "{}"), Response(204, "")]
+
+        assert batch.BatchClient.check(responses) == responses
+
+    def test_error(self):
+        with pytest.raises(errors.UnexpectedAPIResponse):
+            batch.BatchClient.check([Response(200, "{}"), Response(400, "bad")])
+
+
+class TestBatchEndToEnd:
+    def test_crud(self):
+        store = fake_servicenow.Store()
+        fake_servicenow.generate_cmdb(store, cis=10, seed=4)
+        cis = store.query("cmdb_ci")[:3]
+
+        with fake_servicenow.FakeServiceNow(
+            store, users=dict(admin="admin"), batch_limit=2
+        ) as server:
+            c = client_module.Client(server.url, "admin", "admin")
+            requests = [
+                batch.BatchRequest(
+                    "PATCH",
+                    "api/now/table/cmdb_ci/" + ci["sys_id"],
+                    data=dict(comments="batched"),
+                )
+                for ci in cis
+            ] + [
+                batch.BatchRequest(
+                    "POST", "api/now/table/incident", data=dict(short_description="x")
+                ),
+                batch.BatchRequest("GET", "api/now/table/incident/missing"),
+            ]
+            responses = batch.BatchClient(c, chunk_size=4).send(requests)
+            c.close()
+
+        assert [r.status for r in responses] == [200, 200, 200, 201, 404]
+        assert all(r["comments"] == "batched" for r in cis)
+        assert responses[3].json["result"]["short_description"] == "x"
+        assert server.request_count("POST", "/api/now/v1/batch") == 3
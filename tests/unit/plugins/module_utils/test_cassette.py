@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import io
+import json
+import sys
+
+from urllib.error import HTTPError
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    cassette,
+    client,
+    errors,
+    snow,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def raw_response(mocker, body, status=200, headers=None):
+    raw_resp = mocker.MagicMock(status=status, reason="OK")
+    raw_resp.getcode.return_value = status
+    raw_resp.headers = headers or {}
+    raw_resp.read.return_value = body
+    return raw_resp
+
+
+class TestRequestKey:
+    def test_host_is_ignored_and_query_sorted(self):
+        assert cassette.request_key(
+            "get", "https://a.com/api/now/table/x?b=2&a=1"
+        ) == cassette.request_key("GET", "http://b.com/api/now/table/x?a=1&b=2")
+
+    def test_body_is_part_of_the_key(self):
+        url = "https://a.com/api/now/table/x"
+
+        assert cassette.request_key("POST", url, '{"a":1}') != cassette.request_key(
+            "POST", url, '{"a":2}'
+        )
+        assert cassette.request_key("POST", url, '{"a":1}') == cassette.request_key(
+            "POST", url, b'{"a":1}'
+        )
+
+    def test_compressed_body_matches_its_content(self):
+        url = "https://a.com/api/now/table/x"
+        key = cassette.request_key("POST", url, '{"a":1}')
+
+        assert key == cassette.request_key(
+            "POST", url, gzip.compress(b'{"a":1}', mtime=1)
+        )
+        assert key == cassette.request_key(
+            "POST", url, gzip.compress(b'{"a":1}', mtime=2)
+        )
+
+    def test_oauth_body_is_ignored(self):
+        url = "https://a.com/oauth_token.do"
+
+        assert cassette.request_key("POST", url, "password=a") == cassette.request_key(
+            "POST", url, "password=b"
+        )
+
+
+class TestCassette:
+    @pytest.mark.parametrize("name", ["cassette.json", "cassette.json.gz"])
+    def test_save_load(self, tmp_path, name):
+        path = str(tmp_path / name)
+        c = cassette.Cassette(path)
+        c.record("GET", "https://a.com/x", None, 200, "OK", {"A": "b"}, b"text")
+        c.record("GET", "https://a.com/y", None, 200, "OK", {}, b"\x1f\x8b\xff")
+        c.save()
+
+        loaded = cassette.Cassette.load(path)
+
+        assert loaded.interactions == c.interactions
+        if name.endswith(".gz"):
+            with gzip.open(path) as f:
+                json.loads(f.read().decode("utf-8"))
+
+    def test_load_missing(self, tmp_path):
+        with pytest.raises(errors.ServiceNowError, match="Unable to load cassette"):
+            cassette.Cassette.load(str(tmp_path / "missing.json"))
+
+    def test_load_wrong_version(self, tmp_path):
+        path = tmp_path / "cassette.json"
+        path.write_text('{"version": 99}')
+
+        with pytest.raises(errors.ServiceNowError, match="Unsupported cassette"):
+            cassette.Cassette.load(str(path))
+
+    def test_play_in_order_and_repeat_last(self):
+        c = cassette.Cassette("c.json")
+        c.record("GET", "https://a.com/x", None, 200, "OK", {}, b"1")
+        c.record("GET", "https://a.com/x", None, 200, "OK", {}, b"2")
+
+        bodies = [c.play("GET", "https://b.com/x")["body"] for _i in range(3)]
+
+        assert bodies == ["1", "2", "2"]
+
+    def test_play_missing(self):
+        c = cassette.Cassette("c.json")
+
+        with pytest.raises(errors.ServiceNowError, match="No recorded response"):
+            c.play("GET", "https://a.com/x")
+
+    def test_oauth_tokens_are_redacted(self):
+        c = cassette.Cassette("c.json")
+        c.record(
+            "POST",
+            "https://a.com/oauth_token.do",
+            "password=secret",
+            200,
+            "OK",
+            {"Set-Cookie": "JSESSIONID=1", "A": "b"},
+            b'{"access_token": "token", "refresh_token": "r", "expires_in": 1800}',
+        )
+
+        interaction = c.interactions[0]
+        assert json.loads(interaction["body"]) == dict(
+            access_token="redacted", refresh_token="redacted", expires_in=1800
+        )
+        assert interaction["headers"] == [["A", "b"]]
+        assert "secret" not in json.dumps(c.interactions)
+
+
+class TestRecordingTransport:
+    def test_record(self, mocker):
+        transport = mocker.Mock()
+        transport.open.return_value = raw_response(
+            mocker, b'{"result": []}', headers={"X-Total-Count": "0"}
+        )
+        c = cassette.Cassette("c.json")
+
+        resp = cassette.RecordingTransport(transport, c).open(
+            "GET", "https://a.com/x", data=None, stream=True, timeout=10
+        )
+
+        transport.open.assert_called_once_with(
+            "GET", "https://a.com/x", data=None, timeout=10
+        )
+        assert resp.read() == b'{"result": []}'
+        assert c.interactions[0]["headers"] == [["X-Total-Count", "0"]]
+
+    def test_record_http_error(self, mocker):
+        transport = mocker.Mock()
+        transport.open.side_effect = HTTPError(
+            "https://a.com/x", 404, "Not Found", {}, io.BytesIO(b"missing")
+        )
+        c = cassette.Cassette("c.json")
+
+        with pytest.raises(HTTPError) as exc:
+            cassette.RecordingTransport(transport, c).open("GET", "https://a.com/x")
+
+        assert exc.value.read() == b"missing"
+        assert c.interactions[0]["status"] == 404
+
+
+class TestReplayTransport:
+    def test_latency_and_bandwidth(self, mocker):
+        c = cassette.Cassette("c.json")
+        c.record("GET", "https://a.com/x", None, 200, "OK", {}, b"x" * 1000)
+        sleep = mocker.Mock()
+
+        resp = cassette.ReplayTransport(
+            c, latency=0.5, bandwidth=500, sleep=sleep
+        ).open("GET", "https://a.com/x")
+
+        sleep.assert_called_once_with(2.5)
+        assert resp.read(10) == b"x" * 10
+
+    def test_http_error(self):
+        c = cassette.Cassette("c.json")
+        c.record("GET", "https://a.com/x", None, 404, "Not Found", {}, b"missing")
+
+        with pytest.raises(HTTPError) as exc:
+            cassette.ReplayTransport(c).open("GET", "https://a.com/x")
+
+        assert exc.value.code == 404
+        assert exc.value.read() == b"missing"
+
+    def test_invalid_mode(self):
+        with pytest.raises(errors.ServiceNowError, match="Unknown cassette mode"):
+            cassette.create_transport(None, cassette.Cassette("c.json"), "rewind")
+
+
+class TestClientCassette:
+    def test_record_and_replay_pagination(self, mocker, tmp_path):
+        path = str(tmp_path / "cassette.json.gz")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = [
+            raw_response(
+                mocker,
+                json.dumps(dict(result=[dict(n=1), dict(n=2)])).encode("utf-8"),
+                headers={"X-Total-Count": "3"},
+            ),
+            raw_response(
+                mocker,
+                json.dumps(dict(result=[dict(n=3)])).encode("utf-8"),
+                headers={"X-Total-Count": "3"},
+            ),
+        ]
+
+        recorder = client.Client(
+            "https://instance.com",
+            "user",
+            "pass",
+            cassette_path=path,
+            cassette_mode="record",
+        )
+        recorded = snow.SNowClient(recorder, batch_size=2).list("table/incident")
+        recorder.close()
+
+        request_mock.open.reset_mock(side_effect=True)
+        player = client.Client(
+            "https://other.com", "user", "pass", cassette_path=path, collect_stats=True
+        )
+        replayed = snow.SNowClient(player, batch_size=2).list("table/incident")
+
+        assert replayed == recorded == [dict(n=1), dict(n=2), dict(n=3)]
+        assert request_mock.open.call_count == 0
+        assert player.stats_result()["api_stats"]["requests"] == 2
+
+    def test_replay_unrecorded_request(self, tmp_path):
+        path = tmp_path / "cassette.json"
+        path.write_text('{"version": 1, "interactions": []}')
+        c = client.Client(
+            "https://instance.com", "user", "pass", cassette_path=str(path)
+        )
+
+        with pytest.raises(errors.ApiCommunicationError, match="No recorded response"):
+            c.get("table/incident")
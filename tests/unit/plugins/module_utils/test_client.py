@@ -7,8 +7,12 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import gzip
+import http.client
 import io
+import socket
 import sys
+import zlib
 
 import pytest
 from ansible.module_utils.common.text.converters import to_text
@@ -68,7 +72,7 @@ class TestResponseInit:
             resp.json
 
     def test_json_is_cached(self, mocker):
-        json_mock = mocker.patch.object(client, "json")
+        json_mock = mocker.patch.object(client, "json_codec")
         resp = client.Response(
             200,
             '{"a": ["b", "c"], "d": 1}',
@@ -98,6 +102,128 @@ class TestResponseInit:
         assert resp.json == {"result": [{"some_obj": "value"}]}
 
 
+class TestResponseContentEncoding:
+    def test_gzip(self):
+        resp = client.Response(
+            200,
+            gzip.compress(b'{"result": []}'),
+            headers=[("Content-Encoding", "gzip")],
+        )
+
+        assert resp.data == b'{"result": []}'
+        assert resp.json == {"result": []}
+
+    def test_deflate(self):
+        resp = client.Response(
+            200,
+            zlib.compress(b'{"result": []}'),
+            headers=[("Content-Encoding", "deflate")],
+        )
+
+        assert resp.json == {"result": []}
+
+    def test_raw_deflate(self):
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        data = compressor.compress(b'{"result": []}') + compressor.flush()
+        resp = client.Response(200, data, headers=[("Content-Encoding", "deflate")])
+
+        assert resp.json == {"result": []}
+
+    def test_identity(self):
+        resp = client.Response(200, b"{}", headers=[("Content-Encoding", "identity")])
+
+        assert resp.data == b"{}"
+
+    def test_corrupt_data(self):
+        with pytest.raises(errors.ServiceNowError, match="decompress gzip"):
+            client.Response(200, b"not gzip", headers=[("Content-Encoding", "gzip")])
+
+
+class TestResponseIterJsonArray:
+    def test_from_data(self, mocker):
+        loads_mock = mocker.patch.object(client.json_codec, "loads")
+        resp = client.Response(200, '{"result": [{"a": 1}, {"b": 2}]}')
+
+        assert list(resp.iter_json_array()) == [{"a": 1}, {"b": 2}]
+        loads_mock.assert_not_called()
+
+    def test_from_cached_json(self):
+        resp = client.Response(200, '{"result": [{"a": 1}]}')
+        resp.json
+
+        assert list(resp.iter_json_array()) == [{"a": 1}]
+
+
+class TestStreamingResponse:
+    def test_iter_json_array(self, mocker):
+        raw = io.BytesIO(b'{"result": [{"a": 1}, {"b": 2}]}')
+        close_mock = mocker.patch.object(raw, "close")
+        resp = client.StreamingResponse(200, raw, [("X-Total-Count", "2")])
+
+        assert resp.headers == {"x-total-count": "2"}
+        assert list(resp.iter_json_array()) == [{"a": 1}, {"b": 2}]
+        close_mock.assert_called_once()
+
+    def test_bytes_read(self):
+        body = b'{"result": [{"a": 1}, {"b": 2}]}'
+        resp = client.StreamingResponse(
+            200, io.BytesIO(gzip.compress(body)), [("Content-Encoding", "gzip")]
+        )
+
+        assert resp.bytes_read == 0
+        list(resp.iter_json_array())
+        assert resp.bytes_read == len(body)
+
+    @pytest.mark.parametrize(
+        "encoding,compress",
+        [("gzip", gzip.compress), ("deflate", zlib.compress)],
+    )
+    def test_iter_json_array_compressed(self, encoding, compress):
+        raw = io.BytesIO(compress(b'{"result": [{"a": 1}, {"b": 2}]}'))
+        resp = client.StreamingResponse(200, raw, [("Content-Encoding", encoding)])
+
+        assert list(resp.iter_json_array()) == [{"a": 1}, {"b": 2}]
+
+    def test_json(self):
+        raw = io.BytesIO(gzip.compress(b'{"result": []}'))
+        resp = client.StreamingResponse(200, raw, [("Content-Encoding", "gzip")])
+
+        assert resp.data == b'{"result": []}'
+        assert resp.json == {"result": []}
+        assert raw.closed
+
+
+class TestStreamingResponseReadErrors:
+    class Broken:
+        def __init__(self, error):
+            self.error = error
+
+        def read(self, amt=None):
+            raise self.error
+
+        def close(self):
+            pass
+
+    @pytest.mark.parametrize(
+        "error", [socket.timeout("timed out"), http.client.IncompleteRead(b"")]
+    )
+    def test_iter_json_array(self, error):
+        resp = client.StreamingResponse(200, self.Broken(error))
+
+        with pytest.raises(errors.ApiCommunicationError) as exc:
+            list(resp.iter_json_array())
+
+        assert exc.value.__cause__ is error
+
+    def test_data(self):
+        resp = client.StreamingResponse(200, self.Broken(socket.timeout("timed out")))
+
+        with pytest.raises(errors.ApiCommunicationError) as exc:
+            resp.data
+
+        assert isinstance(exc.value.exception, URLError)
+
+
 class TestClientInit:
     @pytest.mark.parametrize("host", [None, "", "invalid", "missing.schema"])
     def test_invalid_host(self, host):
@@ -409,6 +535,62 @@ class TestClientRequest:
         )
         assert resp == mock_response
 
+    def test_request_compresses_large_body(self, mocker):
+        c = client.Client(
+            "https://instance.com", "user", "pass", compress_requests=True
+        )
+        request_mock = mocker.patch.object(c, "_request")
+        payload = {"records": ["x" * 100] * 100}
+
+        c.request("POST", "api/now/some/path", data=payload)
+
+        kwargs = request_mock.call_args.kwargs
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert gzip.decompress(kwargs["data"]) == client.json_codec.dumps(
+            payload
+        ).encode("utf-8")
+
+    def test_compressed_body_does_not_depend_on_the_time(self, mocker):
+        c = client.Client(
+            "https://instance.com", "user", "pass", compress_requests=True
+        )
+        request_mock = mocker.patch.object(c, "_request")
+        time_mock = mocker.patch("time.time", return_value=1000)
+        payload = {"records": ["x" * 100] * 100}
+
+        c.request("POST", "api/now/some/path", data=payload)
+        time_mock.return_value = 2000
+        c.request("POST", "api/now/some/path", data=payload)
+
+        first, second = [call.kwargs["data"] for call in request_mock.call_args_list]
+        assert first == second
+
+    def test_request_does_not_compress_small_body(self, mocker):
+        c = client.Client(
+            "https://instance.com", "user", "pass", compress_requests=True
+        )
+        request_mock = mocker.patch.object(c, "_request")
+
+        c.request("POST", "api/now/some/path", data={"some": "data"})
+
+        kwargs = request_mock.call_args.kwargs
+        assert "Content-Encoding" not in kwargs["headers"]
+        assert kwargs["data"] == '{"some":"data"}'
+
+    def test_accept_encoding_is_sent(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200, headers=[("Content-Encoding", "gzip")])
+        raw_resp.read.return_value = gzip.compress(b'{"result": "ok"}')
+        request_mock.open.return_value = raw_resp
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("GET", "api/now/some/path")
+
+        kwargs = request_mock.open.call_args.kwargs
+        assert kwargs["headers"]["Accept-Encoding"] == "gzip, deflate"
+        assert kwargs["decompress"] is False
+        assert resp.json == {"result": "ok"}
+
     def test_auth_error(self, mocker):
         request_mock = mocker.patch.object(client, "Request").return_value
         request_mock.open.side_effect = HTTPError("", 401, "Unauthorized", {}, None)
@@ -597,6 +779,197 @@ class TestClientRequest:
             c.request("GET", "api/now/some/path")
 
 
+class TestClientRateLimit:
+    def test_retry_after_is_honored(self, mocker):
+        sleep_mock = mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        raw_resp.read.return_value = '{"result": "ok"}'
+        request_mock.open.side_effect = [
+            HTTPError("", 429, "Too Many Requests", {"Retry-After": "2"}, None),
+            raw_resp,
+        ]
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("GET", "api/now/some/path")
+
+        assert resp.status == 200
+        assert request_mock.open.call_count == 2
+        assert sleep_mock.call_count == 1
+        assert 1.9 < sleep_mock.call_args.args[0] <= 2
+
+    def test_give_up_after_max_wait(self, mocker):
+        sleep_mock = mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = HTTPError(
+            "", 429, "Too Many Requests", {"Retry-After": "30"}, None
+        )
+
+        c = client.Client(
+            "https://instance.com", "user", "pass", rate_limit_max_wait=60
+        )
+        resp = c.request("GET", "api/now/some/path")
+
+        assert resp.status == 429
+        assert request_mock.open.call_count == 3
+        assert sleep_mock.call_count == 2
+
+    def test_503_without_retry_after_is_returned(self, mocker):
+        sleep_mock = mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = HTTPError(
+            "", 503, "Service Unavailable", {}, None
+        )
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("POST", "api/now/some/path", data={})
+
+        assert resp.status == 503
+        assert request_mock.open.call_count == 1
+        sleep_mock.assert_not_called()
+
+    def test_token_bucket_throttles_requests(self, mocker):
+        sleep_mock = mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        raw_resp.read.return_value = '{"result": "ok"}'
+        request_mock.open.return_value = raw_resp
+
+        c = client.Client(
+            "https://instance.com", "user", "pass", rate_limit=1, rate_limit_burst=2
+        )
+        for _i in range(3):
+            c.request("GET", "api/now/some/path")
+
+        assert sleep_mock.call_count == 1
+
+
+class TestClientRetry:
+    def _ok(self, mocker):
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        raw_resp.read.return_value = '{"result": "ok"}'
+        return raw_resp
+
+    def test_server_error_is_retried_for_get(self, mocker):
+        sleep_mock = mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = [
+            HTTPError("", 502, "Bad Gateway", {}, None),
+            HTTPError("", 504, "Gateway Timeout", {}, None),
+            self._ok(mocker),
+        ]
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("GET", "api/now/some/path")
+
+        assert resp.status == 200
+        assert request_mock.open.call_count == 3
+        assert sleep_mock.call_count == 2
+        # Full jitter keeps the delays within the exponential bound.
+        assert 0 <= sleep_mock.call_args_list[0].args[0] <= 0.5
+        assert 0 <= sleep_mock.call_args_list[1].args[0] <= 1
+
+    def test_server_error_is_not_retried_for_post(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = HTTPError("", 502, "Bad Gateway", {}, None)
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("POST", "api/now/some/path", data={})
+
+        assert resp.status == 502
+        assert request_mock.open.call_count == 1
+
+    def test_connection_reset_is_retried(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = [
+            ConnectionResetError("reset"),
+            self._ok(mocker),
+        ]
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("DELETE", "api/now/some/path")
+
+        assert resp.status == 200
+
+    @pytest.mark.parametrize(
+        "error",
+        [http.client.IncompleteRead(b"{"), ConnectionResetError("reset")],
+    )
+    def test_broken_body_is_retried(self, mocker, error):
+        mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        broken = mocker.MagicMock(status=200, headers=[])
+        broken.read.side_effect = error
+        request_mock.open.side_effect = [broken, self._ok(mocker)]
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("GET", "api/now/some/path")
+
+        assert resp.json == {"result": "ok"}
+        assert request_mock.open.call_count == 2
+
+    def test_body_read_timeout_is_reported(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        broken = mocker.MagicMock(status=200, headers=[])
+        broken.read.side_effect = socket.timeout("timed out")
+        request_mock.open.return_value = broken
+
+        c = client.Client("https://instance.com", "user", "pass", max_retries=1)
+        with pytest.raises(errors.ApiCommunicationError, match="timed out") as exc:
+            c.request("GET", "api/now/some/path")
+
+        assert request_mock.open.call_count == 2
+        assert exc.value.retries == 1
+
+    def test_connection_refused_is_retried_for_post(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = [
+            URLError(ConnectionRefusedError("refused")),
+            self._ok(mocker),
+        ]
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.request("POST", "api/now/some/path", data={})
+
+        assert resp.status == 200
+
+    def test_retries_are_reported(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = URLError("timed out")
+
+        c = client.Client("https://instance.com", "user", "pass", max_retries=2)
+        with pytest.raises(errors.ApiCommunicationError) as exc:
+            c.request("GET", "api/now/some/path")
+
+        assert request_mock.open.call_count == 3
+        assert exc.value.retries == 2
+        assert exc.value.elapsed is not None
+        debug_info = exc.value.to_module_fail_json_output()["debug_info"]
+        assert debug_info["retries"] == 2
+
+    def test_retry_rules(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = URLError("timed out")
+
+        c = client.Client(
+            "https://instance.com",
+            "user",
+            "pass",
+            retry_rules=dict(read_timeout="never"),
+        )
+        with pytest.raises(errors.ApiCommunicationError) as exc:
+            c.request("GET", "api/now/some/path")
+
+        assert request_mock.open.call_count == 1
+        assert exc.value.retries == 0
+
+
 class TestClientGet:
     def test_ok(self, mocker):
         c = client.Client("https://instance.com", "user", "pass")
@@ -639,6 +1012,34 @@ class TestClientGet:
         )
 
 
+class TestClientGetStream:
+    def test_stream(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200, headers=[("X-Total-Count", "1")])
+        raw_resp.read.side_effect = [b'{"result": [{"a": 1}]}', b""]
+        request_mock.open.return_value = raw_resp
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.get("api/now/table/incident", query=dict(a="1"), stream=True)
+
+        assert isinstance(resp, client.StreamingResponse)
+        assert resp.headers == {"x-total-count": "1"}
+        assert list(resp.iter_json_array()) == [{"a": 1}]
+        raw_resp.close.assert_called_once()
+
+    def test_stream_error_status(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.side_effect = HTTPError(
+            "", 404, "Not Found", {}, io.StringIO(to_text('{"result": []}'))
+        )
+
+        c = client.Client("https://instance.com", "user", "pass")
+        resp = c.get("api/now/table/incident", stream=True)
+
+        assert resp.status == 404
+        assert list(resp.iter_json_array()) == []
+
+
 class TestClientPost:
     def test_ok(self, mocker):
         c = client.Client("https://instance.com", "user", "pass")
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import ssl
+import sys
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    connection_pool,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.peers.add(self.client_address)
+        self.server.user_agents.append(self.headers.get("User-Agent"))
+        status = 404 if self.path.startswith("/missing") else 200
+        body = b'{"result": []}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path.startswith("/close"):
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.peers = set()
+    httpd.user_agents = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server, path):
+    return "http://127.0.0.1:{0}{1}".format(server.server_address[1], path)
+
+
+class TestConnectionPool:
+    def test_invalid_size(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            connection_pool.ConnectionPool(0)
+
+    def test_connection_is_reused(self, server):
+        pool = connection_pool.ConnectionPool(maxsize=2)
+
+        for _i in range(3):
+            resp = pool.open("GET", url(server, "/api/now/table/incident"))
+            assert resp.status == 200
+            assert resp.read() == b'{"result": []}'
+
+        pool.close()
+        assert len(server.peers) == 1
+
+    def test_connection_close_is_respected(self, server):
+        pool = connection_pool.ConnectionPool(maxsize=2)
+
+        pool.open("GET", url(server, "/close"))
+        pool.open("GET", url(server, "/close"))
+
+        pool.close()
+        assert len(server.peers) == 2
+
+    def test_stream_releases_connection_after_read(self, server):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+
+        resp = pool.open("GET", url(server, "/"), stream=True)
+        assert isinstance(resp, connection_pool.PooledStreamResponse)
+        assert resp.read(4) == b'{"re'
+        assert resp.read() == b'sult": []}'
+        pool.open("GET", url(server, "/"))
+
+        pool.close()
+        assert len(server.peers) == 1
+
+    def test_stream_closed_early_discards_connection(self, server):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+
+        resp = pool.open("GET", url(server, "/"), stream=True)
+        resp.read(4)
+        resp.close()
+
+        host_pool = list(pool._pools.values())[0]
+        assert host_pool.idle == []
+
+    def test_http_error(self, server):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+
+        with pytest.raises(HTTPError) as exc:
+            pool.open("GET", url(server, "/missing"))
+
+        assert exc.value.code == 404
+        assert exc.value.read() == b'{"result": []}'
+
+    def test_user_agent(self, server):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+
+        pool.open("GET", url(server, "/"))
+        pool.open("GET", url(server, "/"), headers={"user-agent": "custom"})
+
+        pool.close()
+        assert server.user_agents == [connection_pool.USER_AGENT, "custom"]
+
+    def test_ssl_error_is_reported_as_url_error(self, server):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+        https_url = url(server, "/").replace("http://", "https://")
+
+        with pytest.raises(URLError) as exc:
+            pool.open("GET", https_url, validate_certs=False)
+
+        assert isinstance(exc.value.reason, ssl.SSLError)
+
+    def test_stale_connection_is_replaced(self, server, mocker):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+        pool.open("GET", url(server, "/"))
+        # Simulate the server dropping the idle connection.
+        host_pool = list(pool._pools.values())[0]
+        host_pool.idle[0].sock.close()
+        host_pool.idle[0].sock = None
+        mocker.patch.object(
+            host_pool.idle[0],
+            "connect",
+            side_effect=ConnectionResetError("reset"),
+        )
+
+        resp = pool.open("GET", url(server, "/"))
+
+        assert resp.status == 200
+
+    def test_stale_connection_is_not_resent_for_post(self, server, mocker):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+        pool.open("GET", url(server, "/"))
+        host_pool = list(pool._pools.values())[0]
+        mocker.patch.object(
+            host_pool.idle[0],
+            "request",
+            side_effect=ConnectionResetError("reset"),
+        )
+        new_connection = mocker.spy(pool, "_new_connection")
+
+        with pytest.raises(URLError) as exc:
+            pool.open("POST", url(server, "/"), data=b"{}")
+
+        assert isinstance(exc.value.reason, ConnectionResetError)
+        new_connection.assert_not_called()
+
+
+class TestClientTransport:
+    def test_request_is_default(self):
+        c = client.Client("https://instance.com", "user", "pass")
+
+        assert isinstance(c._client, client.Request)
+
+    def test_pool_when_enabled(self):
+        c = client.Client(
+            "https://instance.com", "user", "pass", connection_pool_size=4
+        )
+
+        assert isinstance(c._client, connection_pool.ConnectionPool)
+        assert c._client.maxsize == 4
+
+    def test_no_pool_behind_proxy(self, monkeypatch):
+        monkeypatch.setenv("https_proxy", "http://proxy.example.com:3128")
+        monkeypatch.delenv("no_proxy", raising=False)
+        monkeypatch.delenv("NO_PROXY", raising=False)
+        c = client.Client(
+            "https://instance.com", "user", "pass", connection_pool_size=4
+        )
+
+        assert isinstance(c._client, client.Request)
+
+    def test_client_reuses_connection(self, server):
+        c = client.Client(
+            url(server, ""), "user", "pass", connection_pool_size=1, timeout=5
+        )
+
+        for _i in range(3):
+            assert c.get("api/now/table/incident").json == {"result": []}
+
+        c.close()
+        assert len(server.peers) == 1
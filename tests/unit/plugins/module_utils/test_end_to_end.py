@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    attachment,
+    client,
+    errors,
+    generic,
+    table,
+)
+from ansible_collections.servicenow.itsm.tests.unit.plugins.common import (
+    fake_servicenow,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+CIS = 250
+
+
+@pytest.fixture(scope="module")
+def store():
+    store = fake_servicenow.Store()
+    fake_servicenow.generate_cmdb(store, cis=CIS, seed=1)
+    return store
+
+
+@pytest.fixture
+def server(store):
+    with fake_servicenow.FakeServiceNow(
+        store, users=dict(admin="admin"), clients=dict(client="secret")
+    ) as server:
+        yield server
+
+
+@pytest.fixture
+def snow_client(server):
+    c = client.Client(server.url, "admin", "admin")
+    yield c
+    c.close()
+
+
+class TestEncodedQuery:
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("name=a", ["a"]),
+            ("name!=a", ["b", "c"]),
+            ("nameINa,c", ["a", "c"]),
+            ("nameNOT INa,c", ["b"]),
+            ("size>1", ["b", "c"]),
+            ("size<=2^name!=a", ["b"]),
+            ("name=a^ORname=b", ["a", "b"]),
+            ("name=a^NQsize=3", ["a", "c"]),
+            ("descISEMPTY", ["b"]),
+            ("descLIKEPP", ["c"]),
+            ("nameSTARTSWITHa", ["a"]),
+            ("sizeBETWEEN2@3", ["b", "c"]),
+            ("ORDERBYDESCname", ["c", "b", "a"]),
+        ],
+    )
+    def test_query(self, query, expected):
+        store = fake_servicenow.Store()
+        store.insert_many(
+            "t",
+            [
+                dict(name="a", size="1", desc="x"),
+                dict(name="b", size="2", desc=""),
+                dict(name="c", size="3", desc="apple"),
+            ],
+        )
+
+        assert [r["name"] for r in store.query("t", query)] == expected
+
+    def test_invalid_condition(self):
+        with pytest.raises(ValueError, match="Unsupported"):
+            fake_servicenow.EncodedQuery("^^BROKEN")
+
+
+class TestGenerators:
+    def test_generate_cmdb_is_deterministic(self):
+        first, second = fake_servicenow.Store(), fake_servicenow.Store()
+
+        assert fake_servicenow.generate_cmdb(
+            first, cis=20, seed=3
+        ) == fake_servicenow.generate_cmdb(second, cis=20, seed=3)
+        assert len(first.query("cmdb_ci")) == 20
+        assert len(first.query("cmdb_ci_server")) == 8
+        assert len(first.query("cmdb_rel_ci")) == 20
+
+
+class TestTableApi:
+    def test_pagination(self, server, snow_client):
+        records = table.TableClient(snow_client, batch_size=100).list_records(
+            "cmdb_ci", dict(sysparm_fields="sys_id,name")
+        )
+
+        assert len(records) == CIS
+        assert len(set(r["sys_id"] for r in records)) == CIS
+        assert server.request_count("GET", "/api/now/table/cmdb_ci") == 3
+
+    def test_concurrent_pagination(self, server, snow_client):
+        records = table.TableClient(
+            snow_client, batch_size=30, max_concurrency=4
+        ).list_records("cmdb_ci", dict(sysparm_fields="sys_id,name"))
+
+        assert records == table.TableClient(snow_client, batch_size=CIS).list_records(
+            "cmdb_ci", dict(sysparm_fields="sys_id,name")
+        )
+        assert server.request_count("GET", "/api/now/table/cmdb_ci") == 10
+
+    def test_keyset_pagination(self, server, store, snow_client):
+        expected = set(r["sys_id"] for r in store.query("cmdb_ci_linux_server"))
+        records = table.TableClient(
+            snow_client, batch_size=40, memory_efficient=True, pagination="keyset"
+        ).list_records("cmdb_ci_linux_server", dict(sysparm_fields="name"))
+
+        first = next(records)
+        # Deleting a record that was already listed shifts the offsets of the
+        # later records, but not their sys_ids.
+        deleted = dict(store.query("cmdb_ci_linux_server", "ORDERBYsys_id")[0])
+        store.delete("cmdb_ci_linux_server", deleted["sys_id"])
+        try:
+            names = [first["name"]] + [r["name"] for r in records]
+        finally:
+            store.insert("cmdb_ci_linux_server", deleted)
+
+        assert "sys_id" not in first
+        assert len(names) == len(expected) == len(set(names))
+        assert server.request_count("GET", "/api/now/table/cmdb_ci_linux_server") == 2
+
+    def test_no_count(self, snow_client):
+        resp = snow_client.get(
+            "api/now/table/cmdb_ci", dict(sysparm_limit=1, sysparm_no_count="true")
+        )
+
+        assert "x-total-count" not in resp.headers
+        assert len(resp.json["result"]) == 1
+
+    def test_encoded_query_and_dot_walking(self, store, snow_client):
+        relation = store.query("cmdb_rel_ci")[0]
+        parent = store.by_sys_id[relation["parent"]][1]
+
+        records = table.TableClient(snow_client).list_records(
+            "cmdb_rel_ci",
+            dict(
+                sysparm_query="parent.name={0}".format(parent["name"]),
+                sysparm_fields="sys_id,type.name,parent.name,child.sys_class_name",
+                sysparm_display_value="true",
+            ),
+        )
+
+        assert relation["sys_id"] in [r["sys_id"] for r in records]
+        assert all(r["parent.name"] == parent["name"] for r in records)
+        assert all("::" in r["type.name"] for r in records)
+        assert all(r["child.sys_class_name"].startswith("cmdb_ci_") for r in records)
+
+    def test_reference_formats(self, store, snow_client):
+        relation = store.query("cmdb_rel_ci")[0]
+        path = "api/now/table/cmdb_rel_ci/{0}".format(relation["sys_id"])
+
+        plain = snow_client.get(path).json["result"]["parent"]
+        display = snow_client.get(
+            path,
+            dict(sysparm_display_value="all", sysparm_exclude_reference_link="true"),
+        ).json["result"]["parent"]
+
+        assert plain["value"] == relation["parent"]
+        assert plain["link"].endswith(relation["parent"])
+        assert display == dict(
+            value=relation["parent"],
+            display_value=store.display_value(relation["parent"]),
+        )
+
+    def test_crud(self, snow_client):
+        table_client = table.TableClient(snow_client)
+
+        record = table_client.create_record(
+            "incident", dict(short_description="broken"), False
+        )
+        assert record["number"].startswith("INC")
+        updated = table_client.update_record("incident", record, dict(state="2"), False)
+        assert updated["state"] == "2"
+        table_client.delete_record("incident", record, False)
+
+        assert (
+            table_client.get_record("incident", dict(sys_id=record["sys_id"])) is None
+        )
+
+    def test_get_record_multiple_matches(self, snow_client):
+        with pytest.raises(errors.ServiceNowError, match="records match"):
+            table.TableClient(snow_client).get_record(
+                "cmdb_ci", dict(sysparm_query="nameSTARTSWITHlnx")
+            )
+
+    def test_tinyurl(self, server, snow_client):
+        names = ["lnx-{0:06d}".format(i) for i in range(0, CIS, 5)] * 10
+        query = dict(sysparm_query="nameIN" + ",".join(names))
+
+        records = table.TableClient(snow_client).list_records("cmdb_ci", query)
+
+        assert server.request_count("POST", "/api/now/tinyurl") >= 1
+        assert sorted(r["name"] for r in records) == sorted(set(names))
+
+
+class TestAuthentication:
+    def test_wrong_password(self, server):
+        c = client.Client(server.url, "admin", "wrong")
+
+        with pytest.raises(errors.AuthError):
+            c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        c.close()
+
+    def test_oauth(self, server):
+        c = client.Client(
+            server.url, "admin", "admin", client_id="client", client_secret="secret"
+        )
+
+        c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        c.close()
+
+        assert server.request_count("POST", "/oauth_token.do") == 1
+
+
+class TestAttachmentApi:
+    def test_upload_list_download_delete(self, store, snow_client, tmp_path):
+        ci = store.query("cmdb_ci")[0]
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"hello")
+        attachment_client = attachment.AttachmentClient(snow_client)
+
+        uploaded = attachment_client.upload_record(
+            "cmdb_ci",
+            ci["sys_id"],
+            dict(path=str(path), name="notes.txt", type="text/plain", hash="h"),
+            False,
+        )
+        records = attachment_client.list_records(
+            dict(table_name="cmdb_ci", table_sys_id=ci["sys_id"])
+        )
+        content = attachment_client.get_attachment(uploaded["sys_id"]).data
+        attachment_client.delete_attached_records("cmdb_ci", ci["sys_id"], False)
+
+        assert [r["sys_id"] for r in records] == [uploaded["sys_id"]]
+        assert records[0]["hash"] == "h"
+        assert content == b"hello"
+        assert attachment_client.list_records(dict(table_sys_id=ci["sys_id"])) == []
+
+
+class TestCmdbInstanceApi:
+    def test_relations(self, store, snow_client):
+        parent, child = store.query("cmdb_ci_linux_server")[:2]
+        rel_type = store.query("cmdb_rel_type")[0]
+        generic_client = generic.GenericClient(snow_client)
+        api_path = "api/now/cmdb/instance/cmdb_ci_linux_server/" + parent["sys_id"]
+
+        result = generic_client.create_record(
+            api_path + "/relation",
+            dict(
+                outbound_relations=[
+                    dict(type=rel_type["sys_id"], target=child["sys_id"])
+                ],
+                source="ServiceNow",
+            ),
+            False,
+        )
+        relation = [
+            r
+            for r in result["outbound_relations"]
+            if r["target"]["value"] == child["sys_id"]
+        ][0]
+        generic_client.delete_record_by_sys_id(
+            api_path + "/relation", relation["sys_id"]
+        )
+        instance = generic_client.get_record_by_sys_id(
+            "api/now/cmdb/instance/cmdb_ci_linux_server", parent["sys_id"]
+        )
+
+        assert relation["type"]["display_value"] == rel_type["name"]
+        assert relation["target"]["display_value"] == child["name"]
+        assert relation["sys_id"] not in [
+            r["sys_id"] for r in instance["outbound_relations"]
+        ]
+        assert instance["attributes"]["name"] == parent["name"]
+
+    def test_list(self, snow_client):
+        records = generic.GenericClient(snow_client, batch_size=40).list_records(
+            "api/now/cmdb/instance/cmdb_ci_win_server"
+        )
+
+        assert len(records) == CIS // 5
+        assert set(records[0]) == set(["sys_id", "name"])
+
+
+class TestLongQueries:
+    NAMES = ["lnx-{0:06d}".format(i) for i in range(0, CIS, 5)] * 10
+
+    def list_records(self, c):
+        query = dict(sysparm_query="nameIN" + ",".join(self.NAMES))
+        return table.TableClient(c, batch_size=10).list_records("cmdb_ci", query)
+
+    def test_tinyurl_is_created_for_every_page(self, server, snow_client):
+        records = self.list_records(snow_client)
+
+        assert len(records) == CIS // 5
+        assert server.request_count("POST", "/api/now/tinyurl") == 5
+
+    def test_tinyurl_cache(self, server, tmp_path):
+        path = str(tmp_path / "tinyurls.json")
+        for _i in range(2):
+            c = client.Client(server.url, "admin", "admin", tinyurl_cache_path=path)
+            records = self.list_records(c)
+            c.close()
+
+            assert sorted(r["name"] for r in records) == sorted(set(self.NAMES))
+        assert server.request_count("POST", "/api/now/tinyurl") == 1
+
+    def test_split(self, server):
+        c = client.Client(server.url, "admin", "admin", long_query_strategy="split")
+        records = self.list_records(c)
+        c.close()
+
+        assert sorted(r["name"] for r in records) == sorted(set(self.NAMES))
+        assert server.request_count("POST", "/api/now/tinyurl") == 0
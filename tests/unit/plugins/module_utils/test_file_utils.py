@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import stat
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import file_utils
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestLocked:
+    def test_lock_file_is_created(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+
+        with file_utils.locked(path):
+            assert os.path.exists(path + ".lock")
+
+
+class TestWriteAtomic:
+    def test_replaces_file(self, tmp_path):
+        path = tmp_path / "cache.json"
+        path.write_text("old")
+
+        file_utils.write_atomic(str(path), lambda f: f.write("new"))
+
+        assert path.read_text() == "new"
+        assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o600
+        assert os.listdir(str(tmp_path)) == ["cache.json"]
+
+    def test_mode(self, tmp_path):
+        path = tmp_path / "metrics.prom"
+
+        file_utils.write_atomic(str(path), lambda f: f.write("x"), mode=0o644)
+
+        assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o644
+
+    def test_failed_write_keeps_old_file(self, tmp_path):
+        path = tmp_path / "cache.json"
+        path.write_text("old")
+
+        def write(f):
+            f.write("partial")
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            file_utils.write_atomic(str(path), write)
+
+        assert path.read_text() == "old"
+        assert os.listdir(str(tmp_path)) == ["cache.json"]
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import csv
+import json
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    errors,
+    import_set,
+)
+from ansible_collections.servicenow.itsm.plugins.module_utils.client import Response
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def rows_response(*states):
+    return Response(
+        200,
+        json.dumps(
+            dict(
+                result=[
+                    dict(
+                        sys_id=str(i),
+                        sys_import_state=state,
+                        sys_import_state_comment="failed" if state == "error" else "",
+                    )
+                    for i, state in enumerate(states)
+                ]
+            )
+        ),
+        {"X-Total-Count": str(len(states))},
+    )
+
+
+class TestChunks:
+    def test_chunks(self):
+        assert list(import_set.chunks(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_empty(self):
+        assert list(import_set.chunks([], 2)) == []
+
+
+class TestReadCsv:
+    def test_rows(self, tmp_path):
+        path = tmp_path / "servers.csv"
+        path.write_text("u_name,u_ip\nweb-01,10.0.0.1\nweb-02,10.0.0.2\n")
+
+        rows = list(import_set.read_csv(str(path)))
+
+        assert rows == [
+            dict(u_name="web-01", u_ip="10.0.0.1"),
+            dict(u_name="web-02", u_ip="10.0.0.2"),
+        ]
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(errors.ServiceNowError, match="Cannot open"):
+            list(import_set.read_csv(str(tmp_path / "missing.csv")))
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"u_name\n\xff\xfe\n",
+            # A field that is longer than the csv module accepts.
+            b"u_name\n" + b"x" * (csv.field_size_limit() + 1) + b"\n",
+        ],
+    )
+    def test_unreadable_file(self, tmp_path, content):
+        path = tmp_path / "servers.csv"
+        path.write_bytes(content)
+
+        with pytest.raises(errors.ServiceNowError, match="Cannot read") as exc:
+            list(import_set.read_csv(str(path)))
+
+        assert exc.value.__cause__ is not None
+
+
+class TestImportSetClient:
+    def test_invalid_chunk_size(self, client):
+        with pytest.raises(errors.ServiceNowError):
+            import_set.ImportSetClient(client, chunk_size=0)
+
+    def test_load(self, client):
+        client.post.side_effect = [
+            Response(200, json.dumps(dict(import_set_id="1", multi_import_set_id="a"))),
+            Response(200, json.dumps(dict(import_set_id="2", multi_import_set_id="b"))),
+        ]
+        client.get.side_effect = [
+            rows_response("inserted", "updated"),
+            rows_response("error"),
+        ]
+        records = (dict(u_name=str(i)) for i in range(3))
+
+        summaries = import_set.ImportSetClient(client, chunk_size=2).load(
+            "u_imp_servers", records, False
+        )
+
+        assert client.post.call_args_list[0][0] == (
+            "api/now/import/u_imp_servers/insertMultiple",
+            dict(records=[dict(u_name="0"), dict(u_name="1")]),
+        )
+        assert client.post.call_args_list[1][0][1] == dict(records=[dict(u_name="2")])
+        assert client.get.call_args_list[0][0][0] == "api/now/table/sys_import_set_row"
+        assert (
+            client.get.call_args_list[0][1]["query"]["sysparm_query"]
+            == "sys_import_set=1"
+        )
+        assert [(s["import_set_id"], s["rows"]) for s in summaries] == [
+            ("1", 2),
+            ("2", 1),
+        ]
+        assert (summaries[0]["inserted"], summaries[0]["updated"]) == (1, 1)
+        assert summaries[1]["error"] == 1
+        assert summaries[1]["failed_rows"] == [dict(sys_id="0", msg="failed")]
+
+    def test_pending_rows_are_polled(self, client, mocker):
+        sleep = mocker.patch.object(import_set.time, "sleep")
+        client.post.return_value = Response(200, json.dumps(dict(import_set_id="1")))
+        client.get.side_effect = [
+            rows_response("pending", "inserted"),
+            rows_response("inserted", "inserted"),
+        ]
+
+        summaries = import_set.ImportSetClient(client).load(
+            "u_imp_servers", [dict(a=1), dict(a=2)], False
+        )
+
+        sleep.assert_called_once_with(import_set.POLL_INTERVAL)
+        assert summaries[0]["inserted"] == 2
+        assert summaries[0]["pending"] == 0
+
+    def test_pending_rows_after_timeout(self, client):
+        client.post.return_value = Response(200, json.dumps(dict(import_set_id="1")))
+        client.get.return_value = rows_response("pending", "inserted")
+
+        summaries = import_set.ImportSetClient(client, transform_timeout=0).load(
+            "u_imp_servers", [dict(a=1), dict(a=2)], False
+        )
+
+        assert client.get.call_count == 1
+        assert (summaries[0]["inserted"], summaries[0]["pending"]) == (1, 1)
+
+    def test_check_mode(self, client):
+        summaries = import_set.ImportSetClient(client, chunk_size=2).load(
+            "u_imp_servers", [dict(a=1), dict(a=2), dict(a=3)], True
+        )
+
+        client.post.assert_not_called()
+        client.get.assert_not_called()
+        assert [s["rows"] for s in summaries] == [2, 1]
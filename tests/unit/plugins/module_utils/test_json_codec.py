@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import math
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import json_codec
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+DOCUMENT = (
+    '{"result": [{"sys_id": "1", "parent": {"value": "2", "link": "x"}},'
+    ' {"sys_id": "3", "tags": [{"a": 1}, "b", null, 1.5]}], "ünïcode": "ok"}'
+)
+
+
+def hook(obj):
+    return dict(obj, _seen=sorted(obj))
+
+
+@pytest.fixture(params=["fast", "stdlib"])
+def backend(request, mocker):
+    if request.param == "stdlib":
+        mocker.patch.object(json_codec, "_fast_loads", None)
+    elif json_codec.BACKEND == "json":
+        pytest.skip("no fast JSON backend is installed")
+    return request.param
+
+
+class TestLoads:
+    @pytest.mark.parametrize("data", [DOCUMENT, DOCUMENT.encode("utf-8")])
+    def test_loads(self, backend, data):
+        assert json_codec.loads(data) == json.loads(DOCUMENT)
+
+    def test_object_hook_matches_stdlib(self, backend):
+        assert json_codec.loads(DOCUMENT.encode("utf-8"), hook) == json.loads(
+            DOCUMENT, object_hook=hook
+        )
+
+    def test_invalid(self, backend):
+        with pytest.raises(ValueError):
+            json_codec.loads(b"Not Found")
+
+    def test_stdlib_extensions(self, backend):
+        assert math.isnan(json_codec.loads(b'{"a": NaN}')["a"])
+
+
+class TestDumps:
+    def test_dumps(self):
+        payload = {"a": ["b", "ü/c"], "d": 1, "e": None}
+
+        result = json_codec.dumps(payload)
+
+        assert result == '{"a":["b","\\u00fc/c"],"d":1,"e":null}'
+        assert result == json.dumps(payload, separators=(",", ":"))
+
+    def test_non_str_keys(self):
+        assert json_codec.dumps({1: "ü"}) == '{"1":"\\u00fc"}'
+
+    def test_not_serializable(self):
+        with pytest.raises(TypeError):
+            json_codec.dumps({"a": object()})
+
+
+class TestApplyObjectHook:
+    def test_innermost_first(self):
+        calls = []
+
+        def record(obj):
+            calls.append(sorted(obj))
+            return len(obj)
+
+        result = json_codec.apply_object_hook({"a": {"b": {}}, "c": [{"d": 1}]}, record)
+
+        assert calls == [[], ["b"], ["d"], ["a", "c"]]
+        assert result == 2
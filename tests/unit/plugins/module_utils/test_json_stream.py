@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import json
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    errors,
+    json_stream,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestIterJsonArray:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+    def test_records(self, chunk_size):
+        records = [
+            dict(sys_id="a", number=1, nested=dict(list=[1, 2, 3])),
+            dict(sys_id="b", number=22.5, name="žluťoučký kůň"),
+            dict(sys_id="c", number=-3, flag=True, empty=None),
+        ]
+        data = json.dumps(dict(result=records)).encode("utf-8")
+
+        result = list(
+            json_stream.iter_json_array(io.BytesIO(data), chunk_size=chunk_size)
+        )
+
+        assert result == records
+
+    def test_scalars(self):
+        data = b'{"result": [1, 22, 333, "x", null]}'
+
+        result = list(json_stream.iter_json_array(io.BytesIO(data), chunk_size=2))
+
+        assert result == [1, 22, 333, "x", None]
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"{}", b'{"result": []}', b'{"result": null}', b'{"other": [1, 2]}'],
+    )
+    def test_no_records(self, data):
+        assert list(json_stream.iter_json_array(data)) == []
+
+    def test_other_members_are_skipped(self):
+        data = b'{"meta": {"result": [0]}, "result": [{"a": 1}], "tail": "x"}'
+
+        assert list(json_stream.iter_json_array(data, chunk_size=4)) == [{"a": 1}]
+
+    def test_custom_key(self):
+        data = '{"records": [{"a": 1}]}'
+
+        assert list(json_stream.iter_json_array(data, key="records")) == [{"a": 1}]
+
+    def test_object_hook(self):
+        def hook(obj):
+            obj.pop("__meta", None)
+            return obj
+
+        data = b'{"result": [{"a": 1, "__meta": {"x": 1}}]}'
+
+        assert list(json_stream.iter_json_array(data, object_hook=hook)) == [{"a": 1}]
+
+    @pytest.mark.parametrize(
+        "data", [b"Not Found", b'{"result": [{"a": 1}', b'{"result": [1 2]}']
+    )
+    def test_invalid_json(self, data):
+        with pytest.raises(errors.ServiceNowError, match="invalid JSON"):
+            list(json_stream.iter_json_array(data))
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    errors,
+    long_query,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestSplitInQuery:
+    def test_split(self):
+        query = "active=true^nameINa,bb,ccc,a,dd^ORDERBYname"
+
+        result = long_query.split_in_query(query, 50, 45)
+
+        # The url is 5 characters too long, so the list may take 13 - 5 = 8
+        # characters. The duplicate a is dropped.
+        assert result == [
+            "active=true^nameINa,bb,ccc^ORDERBYname",
+            "active=true^nameINdd^ORDERBYname",
+        ]
+
+    def test_longest_list_is_split(self):
+        result = long_query.split_in_query("aINx,y^bINxx,yy,zz", 100, 97)
+
+        assert result == ["aINx,y^bINxx,yy", "aINx,y^bINzz"]
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "name=a",
+            "nameNOT INa,b,c",
+            "nameINa,b^NQnameINc,d",
+            "nameINa,b,c^ORactive=true",
+        ],
+    )
+    def test_cannot_split(self, query):
+        assert long_query.split_in_query(query, 100, 90) is None
+
+    def test_value_too_long(self):
+        assert long_query.split_in_query("nameINaaaaaaaaaa,b", 100, 92) is None
+
+
+class TestTinyUrlCache:
+    def test_in_memory(self):
+        cache = long_query.TinyUrlCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.put("c", "3")
+        cache.delete("b")
+
+        assert [cache.get(k) for k in "abc"] == [None, None, "3"]
+
+    def test_persisted(self, tmp_path):
+        path = str(tmp_path / "tinyurls.json")
+        first = long_query.TinyUrlCache(path)
+        first.put("a", "1")
+        first.put("b", "2")
+        first.save()
+        second = long_query.TinyUrlCache(path)
+        second.delete("a")
+        second.put("c", "3")
+        second.save()
+
+        third = long_query.TinyUrlCache(path)
+
+        assert [third.get(k) for k in "abc"] == [None, "2", "3"]
+
+    def test_corrupt_file(self, tmp_path):
+        path = tmp_path / "tinyurls.json"
+        path.write_text("{")
+
+        assert long_query.TinyUrlCache(str(path)).get("a") is None
+
+
+class TestClientLongQueries:
+    def test_invalid_strategy(self):
+        with pytest.raises(errors.ServiceNowError, match="long query strategy"):
+            client.Client("https://host", "u", "p", long_query_strategy="zip")
+
+    def test_split_long_query(self):
+        c = client.Client("https://host", "u", "p", long_query_strategy="split")
+        names = ",".join("name{0:04d}".format(i) for i in range(500))
+        query = dict(sysparm_query="nameIN" + names, sysparm_limit=100)
+
+        queries = c.split_long_query("api/now/table/cmdb_ci", query)
+
+        assert len(queries) > 1
+        assert all(q["sysparm_limit"] == 100 for q in queries)
+        assert ",".join(q["sysparm_query"][len("nameIN") :] for q in queries) == names
+        for q in queries:
+            url = c._build_url(
+                "api/now/table/cmdb_ci", dict(q, sysparm_offset=client.MAX_OFFSET_PROBE)
+            )
+            assert len(url) <= client.MAX_URL_LENGTH
+
+    def test_short_query_is_not_split(self):
+        c = client.Client("https://host", "u", "p", long_query_strategy="split")
+        query = dict(sysparm_query="nameINa,b")
+
+        assert c.split_long_query("api/now/table/cmdb_ci", query) == [query]
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import sys
+
+from urllib.error import HTTPError, URLError
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    errors,
+    observers,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+SYS_ID = "0123456789abcdef0123456789abcdef"
+
+
+def event(method="GET", url="https://instance.com/api/now/table/incident", **kwargs):
+    e = observers.RequestEvent(method, url)
+    e.finish(**kwargs)
+    return e
+
+
+class Recorder(observers.Observer):
+    def __init__(self):
+        self.events = []
+
+    def request_started(self, event):
+        self.events.append(("started", event.method, event.path, event.status))
+
+    def request_finished(self, event):
+        self.events.append(("finished", event.method, event.path, event.status))
+
+
+class TestPathTemplate:
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("https://x.com/api/now/table/incident", "api/now/table/incident"),
+            (
+                "https://x.com/api/now/table/incident/{0}?a=b".format(SYS_ID),
+                "api/now/table/incident/{sys_id}",
+            ),
+            (
+                "https://x.com/api/now/attachment/{0}/file".format(SYS_ID),
+                "api/now/attachment/{sys_id}/file",
+            ),
+            ("https://x.com/oauth_token.do", "oauth_token.do"),
+        ],
+    )
+    def test_path_template(self, url, expected):
+        assert observers.path_template(url) == expected
+
+
+class TestStatsCollector:
+    def test_as_dict(self):
+        stats = observers.StatsCollector()
+        stats.request_finished(event(status=200, response_bytes=10))
+        stats.request_finished(event(status=404, response_bytes=5))
+        e = event(method="POST", error="ApiCommunicationError")
+        e.retries = 2
+        stats.request_finished(e)
+
+        result = stats.as_dict()
+
+        assert result["requests"] == 3
+        assert result["errors"] == 1
+        assert result["retries"] == 2
+        assert result["response_bytes"] == 15
+        assert result["by_status"] == {"200": 1, "404": 1, "error": 1}
+        assert sorted((e["method"], e["count"]) for e in result["endpoints"]) == [
+            ("GET", 2),
+            ("POST", 1),
+        ]
+
+
+class TestJsonLinesExporter:
+    def test_append(self, tmp_path):
+        path = str(tmp_path / "stats.jsonl")
+        exporter = observers.JsonLinesExporter(path)
+
+        exporter.request_finished(event(status=200, response_bytes=3))
+        exporter.request_finished(event(status=201))
+
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        assert [line["status"] for line in lines] == [200, 201]
+        assert lines[0]["path"] == "api/now/table/incident"
+
+
+class TestPrometheusTextfileExporter:
+    def test_counters_are_merged(self, tmp_path):
+        path = str(tmp_path / "servicenow.prom")
+        for _i in range(2):
+            exporter = observers.PrometheusTextfileExporter(path)
+            exporter.request_finished(event(status=200, response_bytes=3))
+            exporter.close()
+
+        with open(path) as f:
+            content = f.read()
+        assert (
+            'servicenow_itsm_requests_total{method="GET",'
+            'path="api/now/table/incident",status="200"} 2'
+        ) in content
+        assert (
+            'servicenow_itsm_response_bytes_total{method="GET",'
+            'path="api/now/table/incident"} 6'
+        ) in content
+        assert "# TYPE servicenow_itsm_requests_total counter" in content
+
+    def test_nothing_to_export(self, tmp_path):
+        path = tmp_path / "servicenow.prom"
+        observers.PrometheusTextfileExporter(str(path)).close()
+
+        assert not path.exists()
+
+
+class TestCreateExporter:
+    def test_invalid_format(self):
+        with pytest.raises(errors.ServiceNowError, match="Unknown export format"):
+            observers.create_exporter("/tmp/x", "xml")
+
+
+class TestClientObservers:
+    def test_events(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        raw_resp.read.return_value = '{"result": []}'
+        request_mock.open.return_value = raw_resp
+        recorder = Recorder()
+
+        c = client.Client("https://instance.com", "user", "pass", observers=[recorder])
+        c.get("api/now/table/incident/{0}".format(SYS_ID))
+
+        assert recorder.events == [
+            ("started", "GET", "api/now/table/incident/{sys_id}", None),
+            ("finished", "GET", "api/now/table/incident/{sys_id}", 200),
+        ]
+
+    def test_stats_result(self, mocker):
+        mocker.patch.object(client.time, "sleep")
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        raw_resp.read.return_value = '{"result": []}'
+        request_mock.open.side_effect = [
+            HTTPError("", 502, "Bad Gateway", {}, None),
+            raw_resp,
+            URLError("some error"),
+        ]
+
+        c = client.Client("https://instance.com", "user", "pass", collect_stats=True)
+        c.get("api/now/table/incident")
+        with pytest.raises(errors.ApiCommunicationError):
+            c.get("api/now/table/incident")
+
+        api_stats = c.stats_result()["api_stats"]
+        assert api_stats["requests"] == 2
+        assert api_stats["retries"] == 1
+        assert api_stats["errors"] == 1
+        assert api_stats["response_bytes"] == len('{"result": []}')
+
+    def test_stats_disabled(self):
+        c = client.Client("https://instance.com", "user", "pass")
+
+        assert c.stats_result() == {}
+
+    def test_failing_observer_is_ignored(self, mocker):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        raw_resp.read.return_value = '{"result": []}'
+        request_mock.open.return_value = raw_resp
+        observer = mocker.Mock(spec=observers.Observer)
+        observer.request_finished.side_effect = RuntimeError("boom")
+
+        c = client.Client("https://instance.com", "user", "pass", observers=[observer])
+
+        assert c.get("api/now/table/incident").status == 200
+
+    def test_exporter_is_flushed_on_close(self, mocker, tmp_path):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        raw_resp.read.return_value = '{"result": []}'
+        request_mock.open.return_value = raw_resp
+        path = tmp_path / "servicenow.prom"
+
+        c = client.Client(
+            "https://instance.com",
+            "user",
+            "pass",
+            stats_export_path=str(path),
+            stats_export_format="prometheus",
+        )
+        c.get("api/now/table/incident")
+        c.close()
+
+        assert "servicenow_itsm_requests_total" in path.read_text()
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import json
+import socket
+import sys
+
+from urllib.error import URLError
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    errors,
+    page_size,
+    table,
+)
+from ansible_collections.servicenow.itsm.plugins.module_utils.client import (
+    Response,
+    StreamingResponse,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def timeout_error():
+    return errors.ApiCommunicationError(URLError(socket.timeout("timed out")))
+
+
+class TestIsReadTimeout:
+    def test_read_timeout(self):
+        assert page_size.is_read_timeout(timeout_error()) is True
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            errors.ApiCommunicationError(URLError(ConnectionRefusedError())),
+            errors.ServiceNowError("timed out"),
+        ],
+    )
+    def test_other_errors(self, error):
+        assert page_size.is_read_timeout(error) is False
+
+
+class TestAdaptiveBatchSize:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [dict(min_size=0), dict(min_size=20, max_size=10), dict(target_latency=0)],
+    )
+    def test_invalid_settings(self, kwargs):
+        with pytest.raises(errors.ServiceNowError):
+            page_size.AdaptiveBatchSize(**kwargs)
+
+    def test_start_is_clamped_and_kept(self):
+        sizer = page_size.AdaptiveBatchSize(min_size=10, max_size=500)
+
+        assert sizer.start(1000) == 500
+        assert sizer.start(100) == 500
+
+    def test_fast_pages_grow_by_at_most_double(self):
+        sizer = page_size.AdaptiveBatchSize(target_latency=2)
+        sizer.start(100)
+
+        assert sizer.observe(100, 0.1) == 200
+        assert sizer.observe(200, 0.1) == 400
+
+    def test_slow_pages_shrink(self):
+        sizer = page_size.AdaptiveBatchSize(target_latency=2)
+        sizer.start(1000)
+
+        assert sizer.observe(1000, 3) == 666
+        assert sizer.observe(666, 60) == 333
+
+    def test_large_pages_shrink(self):
+        sizer = page_size.AdaptiveBatchSize(max_page_bytes=1000)
+        sizer.start(100)
+
+        assert sizer.observe(100, 0.1, response_bytes=2000) == 50
+
+    def test_short_page_does_not_grow(self):
+        sizer = page_size.AdaptiveBatchSize()
+        sizer.start(100)
+
+        assert sizer.observe(10, 0.01) == 100
+        assert sizer.observe(0, 0.01) == 100
+
+    def test_shrink(self):
+        sizer = page_size.AdaptiveBatchSize(min_size=10)
+        sizer.start(30)
+
+        assert sizer.shrink() is True
+        assert sizer.size == 15
+        assert sizer.shrink() is True
+        assert sizer.size == 10
+        assert sizer.shrink() is False
+
+
+class TestAdaptivePagination:
+    @staticmethod
+    def pages(total, fail_limits=()):
+        requested = []
+
+        def get(path, query, **kwargs):
+            offset, limit = query["sysparm_offset"], query["sysparm_limit"]
+            requested.append((offset, limit))
+            if limit in fail_limits:
+                raise timeout_error()
+            records = [dict(n=n) for n in range(offset, min(offset + limit, total))]
+            return Response(
+                200, json.dumps(dict(result=records)), {"X-Total-Count": str(total)}
+            )
+
+        return get, requested
+
+    def test_page_size_adapts(self, client):
+        client.get.side_effect, requested = self.pages(100)
+        sizer = page_size.AdaptiveBatchSize()
+        sizes = iter([20, 40, 40, 40])
+
+        def observe(records, elapsed, response_bytes=None):
+            sizer.size = next(sizes)
+
+        sizer.observe = observe
+        t = table.TableClient(client, batch_size=10, batch_sizer=sizer)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(100)]
+        assert requested == [(0, 10), (10, 20), (30, 40), (70, 40)]
+
+    def test_timeout_retries_the_offset_with_a_smaller_page(self, client):
+        client.get.side_effect, requested = self.pages(50, fail_limits=(40,))
+        sizer = page_size.AdaptiveBatchSize(target_latency=1000)
+        t = table.TableClient(client, batch_size=40, batch_sizer=sizer)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(50)]
+        assert requested[:2] == [(0, 40), (0, 20)]
+
+    def test_stream_timeout_retries_the_offset_with_a_smaller_page(self, client):
+        requested = []
+
+        class TimingOut:
+            def read(self, amt=None):
+                raise socket.timeout("timed out")
+
+        def get(path, query, **kwargs):
+            offset, limit = query["sysparm_offset"], query["sysparm_limit"]
+            requested.append((offset, limit))
+            if limit == 40:
+                return StreamingResponse(200, TimingOut())
+            records = [dict(n=n) for n in range(offset, min(offset + limit, 50))]
+            return StreamingResponse(
+                200,
+                io.BytesIO(json.dumps(dict(result=records)).encode("utf-8")),
+                {"X-Total-Count": "50"},
+            )
+
+        client.get.side_effect = get
+        sizer = page_size.AdaptiveBatchSize(target_latency=1000)
+        t = table.TableClient(client, batch_size=40, stream=True, batch_sizer=sizer)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(50)]
+        assert requested[:2] == [(0, 40), (0, 20)]
+
+    def test_streamed_page_bytes_limit_the_size(self, client):
+        requested = []
+
+        def get(path, query, **kwargs):
+            offset, limit = query["sysparm_offset"], query["sysparm_limit"]
+            requested.append((offset, limit))
+            records = [dict(n=n) for n in range(offset, min(offset + limit, 100))]
+            return StreamingResponse(
+                200,
+                io.BytesIO(json.dumps(dict(result=records)).encode("utf-8")),
+                {"X-Total-Count": "100"},
+            )
+
+        client.get.side_effect = get
+        # Every page is fast, only its size in bytes keeps it from growing.
+        sizer = page_size.AdaptiveBatchSize(
+            min_size=1, target_latency=1000, max_page_bytes=100
+        )
+        t = table.TableClient(client, batch_size=40, stream=True, batch_sizer=sizer)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(100)]
+        assert requested[:2] == [(0, 40), (40, 20)]
+
+    def test_timeout_at_minimum_size_is_raised(self, client):
+        client.get.side_effect, _requested = self.pages(50, fail_limits=(10,))
+        sizer = page_size.AdaptiveBatchSize(min_size=10)
+        t = table.TableClient(client, batch_size=10, batch_sizer=sizer)
+
+        with pytest.raises(errors.ApiCommunicationError):
+            t.list_records("my_table")
+
+    def test_timeout_without_sizer_is_raised(self, client):
+        client.get.side_effect, requested = self.pages(50, fail_limits=(40,))
+        t = table.TableClient(client, batch_size=40)
+
+        with pytest.raises(errors.ApiCommunicationError):
+            t.list_records("my_table")
+        assert requested == [(0, 40)]
+
+    def test_keyset_timeout(self, client):
+        responses = iter(
+            [
+                timeout_error(),
+                Response(200, '{"result": [{"sys_id": "a"}, {"sys_id": "b"}]}'),
+                Response(200, '{"result": []}'),
+            ]
+        )
+
+        def get(path, query, **kwargs):
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        client.get.side_effect = get
+        sizer = page_size.AdaptiveBatchSize(min_size=1, target_latency=1000)
+        t = table.TableClient(
+            client, batch_size=4, pagination="keyset", batch_sizer=sizer
+        )
+
+        records = t.list_records("my_table")
+
+        assert [r["sys_id"] for r in records] == ["a", "b"]
+        assert [c[1]["query"]["sysparm_limit"] for c in client.get.call_args_list] == [
+            4,
+            2,
+            4,
+        ]
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import rate_limit
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseRetryAfter:
+    @pytest.mark.parametrize(
+        "value,expected",
+        [(None, None), ("5", 5.0), (" 1.5 ", 1.5), ("-3", 0.0), ("soon", None)],
+    )
+    def test_seconds(self, value, expected):
+        assert rate_limit.parse_retry_after(value) == expected
+
+    def test_http_date(self):
+        # Wed, 21 Oct 2015 07:28:00 GMT
+        delay = rate_limit.parse_retry_after(
+            "Wed, 21 Oct 2015 07:28:00 GMT", now=1445412470
+        )
+
+        assert delay == 10.0
+
+
+class TestParseRateLimitReset:
+    def test_seconds(self):
+        assert rate_limit.parse_rate_limit_reset("30") == 30.0
+
+    def test_epoch(self):
+        assert rate_limit.parse_rate_limit_reset("1445412480", now=1445412470) == 10.0
+
+    def test_invalid(self):
+        assert rate_limit.parse_rate_limit_reset(None) is None
+
+
+class TestTokenBucket:
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError, match="greater than 0"):
+            rate_limit.TokenBucket(0)
+
+    def test_burst_then_throttle(self):
+        clock = Clock()
+        bucket = rate_limit.TokenBucket(2, burst=2, clock=clock)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0.5
+        # Concurrent callers queue up behind each other.
+        assert bucket.reserve() == 1.0
+
+    def test_refill(self):
+        clock = Clock()
+        bucket = rate_limit.TokenBucket(1, burst=1, clock=clock)
+
+        bucket.reserve()
+        clock.now += 1
+
+        assert bucket.reserve() == 0
+
+
+class TestRateLimiter:
+    def test_disabled_by_default(self):
+        limiter = rate_limit.RateLimiter()
+
+        assert limiter.bucket is None
+        assert limiter.acquire() == 0
+
+    def test_retry_after(self):
+        clock = Clock()
+        limiter = rate_limit.RateLimiter(clock=clock)
+
+        assert limiter.observe(429, {"retry-after": "3"}) == 3
+        assert limiter.acquire() == 3
+        assert limiter.throttled_responses == 1
+
+    def test_backoff_without_headers(self):
+        limiter = rate_limit.RateLimiter(clock=Clock())
+
+        assert limiter.observe(429, {}, attempt=0) == 1
+        assert limiter.observe(429, {}, attempt=3) == 8
+
+    def test_reset_header_on_429(self):
+        limiter = rate_limit.RateLimiter(clock=Clock())
+
+        delay = limiter.observe(
+            429, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "7"}
+        )
+
+        assert delay == 7
+
+    def test_exhausted_quota_blocks_next_request(self):
+        clock = Clock()
+        limiter = rate_limit.RateLimiter(clock=clock)
+
+        delay = limiter.observe(
+            200, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "4"}
+        )
+
+        assert delay is None
+        assert limiter.acquire() == 4
+
+    def test_503_requires_retry_after(self):
+        limiter = rate_limit.RateLimiter(clock=Clock())
+
+        assert limiter.observe(503, {}) is None
+        assert limiter.observe(503, {"retry-after": "1"}) == 1
+
+    def test_max_wait(self):
+        limiter = rate_limit.RateLimiter(max_wait=10, clock=Clock())
+
+        assert limiter.observe(429, {"retry-after": "6"}, waited=6) is None
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    errors,
+    reference_cache,
+    table,
+)
+from ansible_collections.servicenow.itsm.tests.unit.plugins.common import (
+    fake_servicenow,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestReferenceCache:
+    def test_get_put(self):
+        cache = reference_cache.ReferenceCache()
+        cache.put("sys_user", "user_name", "bob", "1")
+
+        assert cache.get("sys_user", "user_name", "bob") == "1"
+        assert cache.get("sys_user", "name", "bob") is None
+        assert cache.get("sys_user_group", "user_name", "bob") is None
+
+    def test_expired_entries(self, mocker):
+        time = mocker.patch.object(reference_cache.time, "time", return_value=100)
+        cache = reference_cache.ReferenceCache(ttl=10)
+        cache.put("sys_user", "user_name", "bob", "1")
+
+        time.return_value = 110
+
+        assert cache.get("sys_user", "user_name", "bob") is None
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = reference_cache.ReferenceCache(max_entries=2)
+        cache.put("sys_user", "user_name", "a", "1")
+        cache.put("sys_user", "user_name", "b", "2")
+        cache.get("sys_user", "user_name", "a")
+        cache.put("sys_user", "user_name", "c", "3")
+
+        assert [cache.get("sys_user", "user_name", v) for v in "abc"] == [
+            "1",
+            None,
+            "3",
+        ]
+
+    def test_invalidate(self):
+        cache = reference_cache.ReferenceCache()
+        cache.put("sys_user", "user_name", "a", "1")
+        cache.put("cmdb_ci", "name", "a", "2")
+
+        cache.invalidate("sys_user")
+
+        assert cache.get("sys_user", "user_name", "a") is None
+        assert cache.get("cmdb_ci", "name", "a") == "2"
+
+    def test_file(self, tmp_path):
+        path = str(tmp_path / "references.json")
+        first = reference_cache.ReferenceCache(path)
+        first.put("sys_user", "user_name", "a", "1")
+        first.put("cmdb_ci", "name", "a", "2")
+        first.save()
+        second = reference_cache.ReferenceCache(path)
+        second.invalidate("cmdb_ci")
+        second.put("sys_user", "user_name", "b", "3")
+        second.save()
+
+        third = reference_cache.ReferenceCache(path)
+
+        assert third.get("sys_user", "user_name", "a") == "1"
+        assert third.get("sys_user", "user_name", "b") == "3"
+        assert third.get("cmdb_ci", "name", "a") is None
+
+    def test_file_keeps_most_recently_used_entries(self, tmp_path):
+        path = str(tmp_path / "references.json")
+        first = reference_cache.ReferenceCache(path)
+        for value in "abc":
+            first.put("sys_user", "user_name", value, value)
+        first.save()
+        second = reference_cache.ReferenceCache(path, max_entries=2)
+        second.get("sys_user", "user_name", "a")
+        second.save()
+
+        third = reference_cache.ReferenceCache(path)
+
+        assert [third.get("sys_user", "user_name", v) for v in "abc"] == [
+            "a",
+            None,
+            "c",
+        ]
+
+    @pytest.mark.parametrize("content", ["not json", "{}", '[["a", 1]]'])
+    def test_invalid_file(self, tmp_path, content):
+        path = tmp_path / "references.json"
+        path.write_text(content)
+
+        cache = reference_cache.ReferenceCache(str(path))
+
+        assert cache.get("a", "b", "c") is None
+
+    def test_expired_entries_are_not_loaded(self, tmp_path):
+        path = tmp_path / "references.json"
+        path.write_text(json.dumps([["sys_user", "user_name", "a", "1", 0]]))
+
+        cache = reference_cache.ReferenceCache(str(path))
+
+        assert cache.get("sys_user", "user_name", "a") is None
+
+
+@pytest.fixture
+def store():
+    store = fake_servicenow.Store()
+    store.insert("sys_user", dict(user_name="bob", name="Bob"))
+    store.insert("sys_user_group", dict(name="ops"))
+    return store
+
+
+@pytest.fixture
+def server(store):
+    with fake_servicenow.FakeServiceNow(store, users=dict(admin="admin")) as server:
+        yield server
+
+
+class TestFindReference:
+    def test_reference_is_looked_up_once(self, store, server):
+        c = client.Client(server.url, "admin", "admin", reference_cache=True)
+        t = table.TableClient(c)
+
+        first = table.find_user(t, "bob")
+        second = table.find_user(t, "bob")
+        c.close()
+
+        assert first["name"] == "Bob"
+        assert second == dict(sys_id=first["sys_id"], user_name="bob")
+        assert server.request_count("GET", "/api/now/table/sys_user") == 1
+
+    def test_disabled_by_default(self, server):
+        c = client.Client(server.url, "admin", "admin")
+        t = table.TableClient(c)
+
+        table.find_assignment_group(t, "ops")
+        table.find_assignment_group(t, "ops")
+        c.close()
+
+        assert c.reference_cache is None
+        assert server.request_count("GET", "/api/now/table/sys_user_group") == 2
+
+    def test_write_invalidates(self, store, server):
+        c = client.Client(server.url, "admin", "admin", reference_cache=True)
+        t = table.TableClient(c)
+
+        user = table.find_user(t, "bob")
+        t.update_record("sys_user", user, dict(user_name="robert"), False)
+        t.create_record("sys_user", dict(user_name="bob"), False)
+        new_user = table.find_user(t, "bob")
+        c.close()
+
+        assert new_user["sys_id"] != user["sys_id"]
+
+    def test_shared_file(self, server, tmp_path):
+        path = str(tmp_path / "references.json")
+        for _i in range(2):
+            c = client.Client(
+                server.url,
+                "admin",
+                "admin",
+                reference_cache=True,
+                reference_cache_path=path,
+            )
+            table.find_user(table.TableClient(c), "bob")
+            c.close()
+
+        assert server.request_count("GET", "/api/now/table/sys_user") == 1
+
+    def test_missing_reference_is_not_cached(self, server):
+        c = client.Client(server.url, "admin", "admin", reference_cache=True)
+        t = table.TableClient(c)
+
+        for _i in range(2):
+            with pytest.raises(errors.ServiceNowError, match="No"):
+                table.find_user(t, "alice")
+        c.close()
+
+        assert server.request_count("GET", "/api/now/table/sys_user") == 2
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+import threading
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    request_memo,
+)
+from ansible_collections.servicenow.itsm.tests.unit.plugins.common import (
+    fake_servicenow,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+HOST = "https://instance.service-now.com"
+USERS = HOST + "/api/now/table/sys_user"
+
+
+class FakeResponse:
+    def __init__(self, status=200, body="x"):
+        self.status = status
+        self.body = body
+
+
+def identity(response):
+    return response
+
+
+class Sender:
+    def __init__(self, *responses):
+        self.responses = list(responses) or [FakeResponse()]
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.responses[min(self.calls, len(self.responses)) - 1]
+
+
+class TestMemoKey:
+    def test_query_order_is_normalized(self):
+        assert request_memo.memo_key(USERS + "?b=2&a=1") == request_memo.memo_key(
+            USERS + "/?a=1&b=2"
+        )
+
+    def test_different_queries(self):
+        assert request_memo.memo_key(USERS + "?a=1") != request_memo.memo_key(
+            USERS + "?a=2"
+        )
+
+    @pytest.mark.parametrize(
+        "url,scope",
+        [
+            (USERS, "sys_user"),
+            (USERS + "/1234?sysparm_fields=name", "sys_user"),
+            (HOST + "/api/now/v1/table/incident", "incident"),
+            (HOST + "/api/now/attachment/file", None),
+            (HOST + "/api/now/cmdb/instance/cmdb_ci", None),
+        ],
+    )
+    def test_scope(self, url, scope):
+        assert request_memo.memo_scope(url) == scope
+
+
+class TestRequestMemo:
+    def test_hit(self):
+        memo, send = request_memo.RequestMemo(), Sender()
+
+        first = memo.fetch(USERS + "?a=1&b=2", send, identity)
+        second = memo.fetch(USERS + "?b=2&a=1", send, identity)
+
+        assert first is second
+        assert send.calls == 1
+        assert memo.stats() == dict(hits=1, misses=1, coalesced=0)
+
+    def test_copy_is_applied_to_every_response(self):
+        memo = request_memo.RequestMemo()
+        copies = []
+
+        def copy(response):
+            copies.append(response)
+            return FakeResponse(response.status, response.body)
+
+        first = memo.fetch(USERS, Sender(), copy)
+        second = memo.fetch(USERS, Sender(), copy)
+
+        assert first is not second
+        assert len(copies) == 2
+
+    def test_failed_responses_are_not_stored(self):
+        memo, send = request_memo.RequestMemo(), Sender(FakeResponse(404))
+
+        memo.fetch(USERS, send, identity)
+        memo.fetch(USERS, send, identity)
+
+        assert send.calls == 2
+
+    def test_write_invalidates_table(self):
+        memo, send = request_memo.RequestMemo(), Sender()
+        incidents = HOST + "/api/now/table/incident"
+        memo.fetch(USERS, send, identity)
+        memo.fetch(incidents, send, identity)
+
+        memo.invalidate(USERS + "/1234")
+        memo.fetch(USERS, send, identity)
+        memo.fetch(incidents, send, identity)
+
+        assert send.calls == 3
+
+    def test_table_write_invalidates_other_apis(self):
+        memo, send = request_memo.RequestMemo(), Sender()
+        instances = HOST + "/api/now/cmdb/instance/cmdb_ci"
+        memo.fetch(instances, send, identity)
+
+        memo.invalidate(HOST + "/api/now/table/cmdb_ci")
+        memo.fetch(instances, send, identity)
+
+        assert send.calls == 2
+
+    def test_other_write_clears_memo(self):
+        memo, send = request_memo.RequestMemo(), Sender()
+        memo.fetch(USERS, send, identity)
+
+        memo.invalidate(HOST + "/api/now/attachment/file")
+        memo.fetch(USERS, send, identity)
+
+        assert send.calls == 2
+
+    def test_tinyurl_does_not_invalidate(self):
+        memo, send = request_memo.RequestMemo(), Sender()
+        memo.fetch(USERS, send, identity)
+
+        memo.invalidate(HOST + "/api/now/tinyurl")
+        memo.fetch(USERS, send, identity)
+
+        assert send.calls == 1
+
+    def test_response_racing_with_write_is_not_stored(self):
+        memo = request_memo.RequestMemo()
+        calls = []
+
+        def send():
+            calls.append(1)
+            memo.invalidate(USERS)
+            return FakeResponse()
+
+        memo.fetch(USERS, send, identity)
+        memo.fetch(USERS, send, identity)
+
+        assert len(calls) == 2
+
+    def test_oldest_entries_are_evicted(self):
+        memo, send = request_memo.RequestMemo(max_entries=2), Sender()
+        for name in ("a", "b", "c", "b"):
+            memo.fetch(USERS + "?name=" + name, send, identity)
+
+        memo.fetch(USERS + "?name=a", send, identity)
+
+        assert send.calls == 4
+
+    def test_concurrent_requests_are_coalesced(self):
+        memo, started, release = request_memo.RequestMemo(), [], threading.Event()
+
+        def send():
+            started.append(1)
+            release.wait(5)
+            return FakeResponse()
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(memo.fetch(USERS, send, identity))
+            )
+            for _i in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while memo.stats()["coalesced"] < 4:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(started) == 1
+        assert len(results) == 5
+        assert all(r is results[0] for r in results)
+
+    def test_error_is_raised_in_waiters(self):
+        memo, release = request_memo.RequestMemo(), threading.Event()
+
+        def send():
+            release.wait(5)
+            raise ValueError("boom")
+
+        errors = []
+
+        def fetch():
+            try:
+                memo.fetch(USERS, send, identity)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fetch) for _i in range(3)]
+        for thread in threads:
+            thread.start()
+        while memo.stats()["coalesced"] < 2:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 3
+        assert memo.fetch(USERS, Sender(), identity).status == 200
+
+
+@pytest.fixture(scope="module")
+def store():
+    store = fake_servicenow.Store()
+    fake_servicenow.generate_cmdb(store, cis=20, seed=2)
+    return store
+
+
+@pytest.fixture
+def server(store):
+    with fake_servicenow.FakeServiceNow(store, users=dict(admin="admin")) as server:
+        yield server
+
+
+class TestClientRequestMemo:
+    def test_memo_is_disabled_by_default(self, server):
+        c = client.Client(server.url, "admin", "admin")
+        c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        c.close()
+
+        assert c.request_memo is None
+        assert server.request_count("GET", "/api/now/table/cmdb_ci") == 2
+
+    def test_repeated_get(self, server):
+        c = client.Client(server.url, "admin", "admin", request_memo=True)
+        first = c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        first.json["result"][0]["name"] = "changed"
+        second = c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        c.close()
+
+        assert server.request_count("GET", "/api/now/table/cmdb_ci") == 1
+        assert second.json["result"][0]["name"] != "changed"
+
+    def test_streamed_get_bypasses_memo(self, server):
+        c = client.Client(server.url, "admin", "admin", request_memo=True)
+        for _i in range(2):
+            c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1), stream=True).close()
+        c.close()
+
+        assert server.request_count("GET", "/api/now/table/cmdb_ci") == 2
+
+    def test_write_invalidates(self, store, server):
+        ci = store.query("cmdb_ci")[0]
+        path = "api/now/table/cmdb_ci/" + ci["sys_id"]
+        c = client.Client(server.url, "admin", "admin", request_memo=True)
+
+        c.get(path)
+        c.patch(path, dict(comments="memo"))
+        record = c.get(path).json["result"]
+        c.close()
+
+        assert record["comments"] == "memo"
+        assert server.request_count("GET", "/" + path) == 2
+
+    def test_concurrent_gets(self, server):
+        server.latency = 0.05
+        c = client.Client(server.url, "admin", "admin", request_memo=True)
+        threads = [
+            threading.Thread(
+                target=c.get, args=("api/now/table/cmdb_ci", dict(sysparm_limit=2))
+            )
+            for _i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        c.close()
+
+        assert server.request_count("GET", "/api/now/table/cmdb_ci") == 1
+        assert c.request_memo.stats()["misses"] == 1
+
+    def test_stats(self, server):
+        c = client.Client(
+            server.url, "admin", "admin", request_memo=True, collect_stats=True
+        )
+        c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        c.get("api/now/table/cmdb_ci", dict(sysparm_limit=1))
+        c.close()
+
+        assert c.stats_result()["api_stats"]["memo"] == dict(
+            hits=1, misses=1, coalesced=0
+        )
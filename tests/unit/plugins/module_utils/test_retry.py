@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import http.client
+import socket
+import sys
+
+from urllib.error import URLError
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import errors, retry
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClassifyException:
+    @pytest.mark.parametrize(
+        "exception,expected",
+        [
+            (
+                URLError("_ssl.c:1: The handshake operation timed out"),
+                "handshake_timeout",
+            ),
+            (URLError(ConnectionRefusedError("refused")), "connect_error"),
+            (URLError(ConnectionResetError("reset")), "connection_reset"),
+            (http.client.RemoteDisconnected("gone"), "connection_reset"),
+            (URLError("timed out"), "read_timeout"),
+            (socket.timeout("timed out"), "read_timeout"),
+            (URLError("Name or service not known"), None),
+            (ValueError("boom"), None),
+        ],
+    )
+    def test_classify(self, exception, expected):
+        assert retry.classify_exception(exception) == expected
+
+
+class TestClassifyResponse:
+    @pytest.mark.parametrize(
+        "status,headers,expected",
+        [
+            (502, {}, "server_error"),
+            (503, {}, "server_error"),
+            (503, {"retry-after": "3"}, None),
+            (500, {}, None),
+            (404, {}, None),
+        ],
+    )
+    def test_classify(self, status, headers, expected):
+        assert retry.classify_response(status, headers) == expected
+
+
+class TestRetryPolicy:
+    def test_invalid_error_class(self):
+        with pytest.raises(errors.ServiceNowError, match="Unknown retry error class"):
+            retry.RetryPolicy(rules=dict(bad="always"))
+
+    def test_invalid_rule(self):
+        with pytest.raises(errors.ServiceNowError, match="Invalid retry rule"):
+            retry.RetryPolicy(rules=dict(read_timeout="sometimes"))
+
+    @pytest.mark.parametrize(
+        "method,error_class,expected",
+        [
+            ("GET", "server_error", True),
+            ("put", "read_timeout", True),
+            ("POST", "server_error", False),
+            ("PATCH", "connection_reset", False),
+            ("POST", "connect_error", True),
+            ("POST", "handshake_timeout", True),
+        ],
+    )
+    def test_idempotency(self, method, error_class, expected):
+        assert retry.RetryPolicy().is_retryable(method, error_class) is expected
+
+    def test_backoff_full_jitter(self):
+        policy = retry.RetryPolicy(backoff_base=1, backoff_max=5, random=lambda: 1)
+
+        assert [policy.backoff(n) for n in range(5)] == [1, 2, 4, 5, 5]
+
+    def test_max_retries(self):
+        state = retry.RetryPolicy(max_retries=2, random=lambda: 0.5).start("GET")
+
+        assert state.next_delay("server_error") == 0.25
+        assert state.next_delay("server_error") == 0.5
+        assert state.next_delay("server_error") is None
+        assert state.retries == 2
+
+    def test_deadline(self):
+        clock = Clock()
+        policy = retry.RetryPolicy(
+            max_retries=10, deadline=5, random=lambda: 1, clock=clock
+        )
+        state = policy.start("GET")
+
+        clock.now = 4
+        assert state.next_delay("server_error") == 0.5
+        clock.now = 4.9
+        assert state.next_delay("server_error") is None
+        assert state.elapsed == 4.9
+
+    def test_not_retryable(self):
+        state = retry.RetryPolicy().start("GET")
+
+        assert state.next_delay(None) is None
+        assert state.retries == 0
@@ -7,10 +7,18 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import json
 import sys
+import threading
+import time
 
 import pytest
-from ansible_collections.servicenow.itsm.plugins.module_utils import errors, table
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    errors,
+    reference_cache,
+    snow,
+    table,
+)
 from ansible_collections.servicenow.itsm.plugins.module_utils.client import Response
 
 pytestmark = pytest.mark.skipif(
@@ -89,10 +97,353 @@ class TestTableListRecords:
         client.get.assert_any_call(
             "api/now/table/my_table",
             query=dict(
-                sysparm_exclude_reference_link="true", sysparm_limit=1, sysparm_offset=1
+                sysparm_exclude_reference_link="true",
+                sysparm_limit=1,
+                sysparm_offset=1,
+                sysparm_no_count="true",
+            ),
+        )
+
+
+class TestTableListRecordsStream:
+    def test_pagination(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 3}]}', {"X-Total-Count": "2"}),
+            Response(200, '{"result": [{"a": 2}]}', {"X-Total-Count": "2"}),
+        )
+        t = table.TableClient(client, batch_size=1, stream=True)
+
+        records = t.list_records("my_table")
+
+        assert [dict(a=3), dict(a=2)] == records
+        client.get.assert_any_call(
+            "api/now/table/my_table",
+            query=dict(
+                sysparm_exclude_reference_link="true",
+                sysparm_limit=1,
+                sysparm_offset=1,
+                sysparm_no_count="true",
             ),
+            stream=True,
+        )
+
+    def test_generator_is_lazy(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 3}]}', {"X-Total-Count": "2"}),
+            Response(200, '{"result": [{"a": 2}]}', {"X-Total-Count": "2"}),
+        )
+        t = table.TableClient(client, batch_size=1, memory_efficient=True, stream=True)
+
+        records = t.list_records_generator("my_table")
+
+        assert next(records) == dict(a=3)
+        assert client.get.call_count == 1
+        assert list(records) == [dict(a=2)]
+
+
+class TestTableListRecordsConcurrent:
+    @staticmethod
+    def pages(total, headers=True):
+        lock = threading.Lock()
+        requested = []
+
+        def get(path, query, **kwargs):
+            offset, limit = query["sysparm_offset"], query["sysparm_limit"]
+            with lock:
+                requested.append(offset)
+            # Later pages finish first.
+            time.sleep(0.001 * (total - offset) / limit)
+            records = [dict(n=n) for n in range(offset, min(offset + limit, total))]
+            return Response(
+                200,
+                json.dumps(dict(result=records)),
+                {"X-Total-Count": str(total)} if headers else {},
+            )
+
+        return get, requested
+
+    def test_records_are_in_offset_order(self, client):
+        client.get.side_effect, requested = self.pages(95)
+        t = table.TableClient(client, batch_size=10, max_concurrency=4)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(95)]
+        assert sorted(requested) == list(range(0, 95, 10))
+
+    def test_consumer_stops_early(self, client):
+        client.get.side_effect, requested = self.pages(1000)
+        t = table.TableClient(
+            client, batch_size=10, memory_efficient=True, max_concurrency=3
         )
 
+        records = t.list_records_generator("my_table")
+        first = [next(records) for _i in range(25)]
+        records.close()
+
+        assert first == [dict(n=n) for n in range(25)]
+        assert len(requested) < 10
+
+    def test_error_is_raised(self, client):
+        get, _requested = self.pages(50)
+
+        def failing_get(path, query, **kwargs):
+            if query["sysparm_offset"] == 30:
+                raise errors.ServiceNowError("page failed")
+            return get(path, query, **kwargs)
+
+        client.get.side_effect = failing_get
+        t = table.TableClient(client, batch_size=10, max_concurrency=4)
+
+        with pytest.raises(errors.ServiceNowError, match="page failed"):
+            t.list_records("my_table")
+
+
+class TestTableListRecordsCount:
+    @staticmethod
+    def pages(total):
+        def get(path, query, **kwargs):
+            offset, limit = query["sysparm_offset"], query["sysparm_limit"]
+            records = [dict(n=n) for n in range(offset, min(offset + limit, total))]
+            counted = query.get("sysparm_no_count") != "true"
+            return Response(
+                200,
+                json.dumps(dict(result=records)),
+                {"X-Total-Count": str(total)} if counted else {},
+            )
+
+        return get
+
+    @staticmethod
+    def counted(client):
+        return [
+            "sysparm_no_count" not in c[1]["query"] for c in client.get.call_args_list
+        ]
+
+    def test_only_first_page_is_counted(self, client):
+        client.get.side_effect = self.pages(25)
+        t = table.TableClient(client, batch_size=10)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(25)]
+        assert self.counted(client) == [True, False, False]
+
+    def test_total_ends_listing(self, client):
+        client.get.side_effect = self.pages(20)
+        t = table.TableClient(client, batch_size=10)
+
+        t.list_records("my_table")
+
+        assert client.get.call_count == 2
+
+    def test_without_count_short_page_ends_listing(self, client):
+        client.get.side_effect = self.pages(25)
+        t = table.TableClient(client, batch_size=10, count=False)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(25)]
+        assert self.counted(client) == [False, False, False]
+
+    def test_without_count_empty_page_ends_listing(self, client):
+        client.get.side_effect = self.pages(20)
+        t = table.TableClient(client, batch_size=10, count=False)
+
+        records = t.list_records("my_table")
+
+        assert len(records) == 20
+        assert client.get.call_count == 3
+
+    def test_missing_total_count_header(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 3}]}'),
+            Response(200, '{"result": [{"a": 2}]}'),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(client, batch_size=1)
+
+        records = t.list_records("my_table")
+
+        assert [dict(a=3), dict(a=2)] == records
+
+    def test_concurrent_pages_are_not_counted(self, client):
+        client.get.side_effect = self.pages(45)
+        t = table.TableClient(client, batch_size=10, max_concurrency=3)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(45)]
+        assert sorted(self.counted(client)) == [False] * 4 + [True]
+
+
+class TestTableListRecordsReadAhead:
+    @staticmethod
+    def pages(total, fail_offset=None):
+        lock = threading.Lock()
+        requested = []
+
+        def get(path, query, **kwargs):
+            offset, limit = query["sysparm_offset"], query["sysparm_limit"]
+            with lock:
+                requested.append(offset)
+            if offset == fail_offset:
+                raise errors.ServiceNowError("page failed")
+            records = [dict(n=n) for n in range(offset, min(offset + limit, total))]
+            return Response(
+                200,
+                json.dumps(dict(result=records)),
+                {"X-Total-Count": str(total)},
+            )
+
+        return get, requested
+
+    @staticmethod
+    def wait_for(condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return condition()
+
+    def test_records_are_in_order(self, client):
+        client.get.side_effect, _requested = self.pages(95)
+        t = table.TableClient(client, batch_size=10, read_ahead=2)
+
+        records = t.list_records("my_table")
+
+        assert records == [dict(n=n) for n in range(95)]
+
+    def test_next_page_is_fetched_while_consuming(self, client):
+        client.get.side_effect, requested = self.pages(100)
+        t = table.TableClient(
+            client, batch_size=10, memory_efficient=True, read_ahead=1
+        )
+
+        records = t.list_records_generator("my_table")
+        first = next(records)
+
+        assert first == dict(n=0)
+        assert self.wait_for(lambda: 10 in requested)
+        assert list(records) == [dict(n=n) for n in range(1, 100)]
+
+    def test_read_ahead_is_bounded(self, client):
+        client.get.side_effect, requested = self.pages(1000)
+        t = table.TableClient(
+            client, batch_size=10, memory_efficient=True, read_ahead=2
+        )
+
+        records = t.list_records_generator("my_table")
+        next(records)
+        self.wait_for(lambda: len(requested) >= 4)
+        time.sleep(0.05)
+
+        # The page being consumed, two queued pages and one waiting for room.
+        assert len(requested) <= 4
+        records.close()
+
+    def test_consumer_stops_early(self, client):
+        client.get.side_effect, requested = self.pages(1000)
+        t = table.TableClient(
+            client, batch_size=10, memory_efficient=True, read_ahead=2
+        )
+
+        records = t.list_records_generator("my_table")
+        first = [next(records) for _i in range(15)]
+        records.close()
+        fetched = len(requested)
+        time.sleep(0.05)
+
+        assert first == [dict(n=n) for n in range(15)]
+        assert len(requested) == fetched < 10
+
+    def test_error_is_raised(self, client):
+        client.get.side_effect, _requested = self.pages(50, fail_offset=30)
+        t = table.TableClient(client, batch_size=10, read_ahead=2)
+
+        with pytest.raises(errors.ServiceNowError, match="page failed"):
+            t.list_records("my_table")
+
+
+class TestKeysetQuery:
+    @pytest.mark.parametrize(
+        "query,last,expected",
+        [
+            ("", None, "ORDERBYsys_id"),
+            ("", "a1", "sys_id>a1^ORDERBYsys_id"),
+            ("active=true", None, "active=true^ORDERBYsys_id"),
+            ("a=1^ORb=2", "a1", "a=1^ORb=2^sys_id>a1^ORDERBYsys_id"),
+            ("a=1^NQb=2", "a1", "a=1^sys_id>a1^NQb=2^sys_id>a1^ORDERBYsys_id"),
+        ],
+    )
+    def test_query(self, query, last, expected):
+        assert snow.keyset_query(query, "sys_id", last) == expected
+
+    def test_order_by_is_rejected(self):
+        with pytest.raises(errors.ServiceNowError, match="ordered"):
+            snow.keyset_query("active=true^ORDERBYDESCnumber", "sys_id")
+
+
+class TestTableListRecordsKeyset:
+    def test_invalid_mode(self, client):
+        with pytest.raises(errors.ServiceNowError, match="pagination mode"):
+            table.TableClient(client, pagination="cursor")
+
+    def test_pagination(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"sys_id": "a"}, {"sys_id": "b"}]}'),
+            Response(200, '{"result": [{"sys_id": "c"}]}'),
+        )
+        t = table.TableClient(client, batch_size=2, pagination="keyset")
+
+        records = t.list_records("my_table", dict(sysparm_query="active=true"))
+
+        assert [r["sys_id"] for r in records] == ["a", "b", "c"]
+        client.get.assert_called_with(
+            "api/now/table/my_table",
+            query=dict(
+                sysparm_exclude_reference_link="true",
+                sysparm_query="active=true^sys_id>b^ORDERBYsys_id",
+                sysparm_limit=2,
+                sysparm_no_count="true",
+            ),
+        )
+        assert "sysparm_offset" not in client.get.call_args_list[0][1]["query"]
+
+    def test_full_last_page(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"number": "1"}, {"number": "2"}]}'),
+            Response(200, '{"result": []}'),
+        )
+        t = table.TableClient(
+            client, batch_size=2, pagination="keyset", keyset_field="number"
+        )
+
+        records = t.list_records("my_table")
+
+        assert len(records) == 2
+        assert client.get.call_count == 2
+        assert client.get.call_args[1]["query"]["sysparm_query"] == (
+            "number>2^ORDERBYnumber"
+        )
+
+    def test_keyset_field_is_added_to_fields(self, client):
+        client.get.return_value = Response(
+            200, '{"result": [{"name": "x", "sys_id": "a"}]}'
+        )
+        t = table.TableClient(client, batch_size=2, pagination="keyset")
+
+        records = t.list_records("my_table", dict(sysparm_fields="name"))
+
+        assert records == [dict(name="x")]
+        assert client.get.call_args[1]["query"]["sysparm_fields"] == "name,sys_id"
+
+    def test_missing_keyset_value(self, client):
+        client.get.return_value = Response(200, '{"result": [{"name": "x"}]}')
+        t = table.TableClient(client, pagination="keyset")
+
+        with pytest.raises(errors.ServiceNowError, match="sys_id value"):
+            t.list_records("my_table")
+
 
 class TestTableGetRecord:
     def test_single_match(self, client):
@@ -109,8 +460,8 @@ class TestTableGetRecord:
             query=dict(
                 sysparm_exclude_reference_link="true",
                 our="query",
-                sysparm_limit=1000,
-                sysparm_offset=0,
+                sysparm_limit=2,
+                sysparm_no_count="true",
             ),
         )
 
@@ -123,6 +474,42 @@ class TestTableGetRecord:
         with pytest.raises(errors.ServiceNowError, match="2"):
             t.get_record("my_table", dict(our="query"))
 
+    def test_multiple_matches_are_counted(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 3}, {"b": 4}]}'),
+            Response(200, '{"result": [{"a": 3}]}', {"X-Total-Count": "5000"}),
+        )
+        t = table.TableClient(client)
+
+        with pytest.raises(errors.ServiceNowError, match="5000 .* records match"):
+            t.get_record("my_table", dict(our="query"))
+        client.get.assert_called_with(
+            "api/now/table/my_table",
+            query=dict(
+                sysparm_exclude_reference_link="true", our="query", sysparm_limit=1
+            ),
+        )
+
+    def test_multiple_matches_without_count(self, client):
+        client.get.side_effect = (
+            Response(200, '{"result": [{"a": 3}, {"b": 4}]}'),
+            Response(200, '{"result": [{"a": 3}]}'),
+            Response(200, '{"result": [{"a": 3}, {"b": 4}, {"c": 5}]}'),
+        )
+        t = table.TableClient(client)
+
+        with pytest.raises(errors.ServiceNowError, match="3 .* records match"):
+            t.get_record("my_table", dict(our="query"))
+
+    def test_fields(self, client):
+        client.get.return_value = Response(200, '{"result": [{"sys_id": "1"}]}')
+        t = table.TableClient(client)
+
+        record = t.get_record("my_table", dict(our="query"), fields=["sys_id"])
+
+        assert dict(sys_id="1") == record
+        assert client.get.call_args[1]["query"]["sysparm_fields"] == "sys_id"
+
     def test_zero_matches(self, client):
         client.get.return_value = Response(
             200, '{"result": []}', {"X-Total-Count": "0"}
@@ -276,3 +663,117 @@ class TestFindConfigurationItem:
         user = table.find_change_request(table_client, "TST123")
 
         assert dict(sys_id="1234", name="TST123") == user
+
+
+class TestQueryReferences:
+    def test_references(self):
+        query = [
+            {"priority": ("=", "1"), "assigned_to": ("=", "bob")},
+            {"assigned_to": ("!=", "alice"), "duplicate_of": ("=", "PRB1")},
+        ]
+
+        references = table.query_references(
+            query, dict(assigned_to=table.USER, duplicate_of=table.PROBLEM)
+        )
+
+        assert references == [
+            ("sys_user", "user_name", "bob"),
+            ("sys_user", "user_name", "alice"),
+            ("problem", "number", "PRB1"),
+        ]
+
+
+class TestResolveReferences:
+    def test_values_of_a_column_are_listed_at_once(self, table_client):
+        table_client.list_records.return_value = [
+            dict(sys_id="1", user_name="Bob"),
+            dict(sys_id="2", user_name="alice"),
+        ]
+        table_client.get_record.return_value = dict(sys_id="3", name="ops")
+
+        sys_ids = table.resolve_references(
+            table_client,
+            [
+                ("sys_user", "user_name", "bob"),
+                ("sys_user_group", "name", "ops"),
+                ("sys_user", "user_name", "alice"),
+                ("sys_user", "user_name", "bob"),
+            ],
+        )
+
+        assert sys_ids == {
+            ("sys_user", "user_name", "bob"): "1",
+            ("sys_user", "user_name", "alice"): "2",
+            ("sys_user_group", "name", "ops"): "3",
+        }
+        table_client.list_records.assert_called_once_with(
+            "sys_user",
+            dict(
+                sysparm_query="user_nameINalice,bob",
+                sysparm_fields="sys_id,user_name",
+            ),
+        )
+        table_client.get_record.assert_called_once_with(
+            "sys_user_group", dict(name="ops"), must_exist=True
+        )
+
+    def test_values_that_cannot_be_listed(self, table_client):
+        table_client.get_record.side_effect = [dict(sys_id="1"), dict(sys_id="2")]
+
+        sys_ids = table.resolve_references(
+            table_client,
+            [("cmdb_ci", "name", "a,b"), ("cmdb_ci", "name", "c^d")],
+        )
+
+        assert sys_ids == {
+            ("cmdb_ci", "name", "a,b"): "1",
+            ("cmdb_ci", "name", "c^d"): "2",
+        }
+        table_client.list_records.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "records,message",
+        [
+            ([dict(sys_id="1", user_name="bob")], "No sys_user records"),
+            (
+                [
+                    dict(sys_id="1", user_name="bob"),
+                    dict(sys_id="2", user_name="alice"),
+                    dict(sys_id="3", user_name="alice"),
+                ],
+                "2 sys_user records",
+            ),
+        ],
+    )
+    def test_values_without_a_single_match(self, table_client, records, message):
+        table_client.list_records.return_value = records
+
+        with pytest.raises(errors.ServiceNowError, match=message):
+            table.resolve_references(
+                table_client,
+                [("sys_user", "user_name", "bob"), ("sys_user", "user_name", "alice")],
+            )
+
+    def test_cached_values_are_not_fetched(self, table_client, mocker):
+        cache = reference_cache.ReferenceCache()
+        cache.put("sys_user", "user_name", "bob", "1")
+        table_client.client = mocker.Mock(reference_cache=cache)
+        table_client.list_records.return_value = [
+            dict(sys_id="2", user_name="alice"),
+            dict(sys_id="3", user_name="carol"),
+        ]
+
+        sys_ids = table.resolve_references(
+            table_client,
+            [
+                ("sys_user", "user_name", "bob"),
+                ("sys_user", "user_name", "alice"),
+                ("sys_user", "user_name", "carol"),
+            ],
+        )
+
+        assert sys_ids[("sys_user", "user_name", "bob")] == "1"
+        assert table_client.list_records.call_args[0][1]["sysparm_query"] == (
+            "user_nameINalice,carol"
+        )
+        assert cache.get("sys_user", "user_name", "carol") == "3"
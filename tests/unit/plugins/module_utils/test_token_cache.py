@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import stat
+import sys
+import time
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    token_cache,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+class TestTokenCache:
+    def test_key_depends_on_all_parts(self):
+        key = token_cache.TokenCache.key("https://a", "id", "password", "user")
+
+        assert key != token_cache.TokenCache.key("https://b", "id", "password", "user")
+        assert key != token_cache.TokenCache.key("https://a", "id2", "password", "user")
+        assert key != token_cache.TokenCache.key(
+            "https://a", "id", "client_credentials", "user"
+        )
+        assert key != token_cache.TokenCache.key("https://a", "id", "password", "user2")
+        assert key != token_cache.TokenCache.key(
+            "https://a", "id", "password", "user", ("secret",)
+        )
+
+    def test_round_trip(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path / "tokens"))
+        expires_at = time.time() + 1800
+
+        cache.put("key", "token", expires_at)
+
+        assert cache.get("key") == ("token", expires_at)
+        path = tmp_path / "tokens" / "key.json"
+        assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(str(tmp_path / "tokens")).st_mode) == 0o700
+
+    def test_missing(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path))
+
+        assert cache.get("key") is None
+
+    def test_expired_within_margin(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path))
+        cache.put("key", "token", time.time() + 30)
+
+        assert cache.get("key", margin=60) is None
+        assert cache.get("key", margin=0) is not None
+
+    def test_unsafe_permissions_are_ignored(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path))
+        cache.put("key", "token", time.time() + 1800)
+        os.chmod(str(tmp_path / "key.json"), 0o644)
+
+        assert cache.get("key") is None
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path))
+        path = tmp_path / "key.json"
+        path.write_text("{not json")
+        os.chmod(str(path), 0o600)
+
+        assert cache.get("key") is None
+
+    def test_delete(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path))
+        cache.put("key", "token", time.time() + 1800)
+
+        cache.delete("key")
+        cache.delete("key")
+
+        assert cache.get("key") is None
+
+    def test_lock(self, tmp_path):
+        cache = token_cache.TokenCache(str(tmp_path / "tokens"))
+
+        with cache.lock("key"):
+            assert (tmp_path / "tokens" / "key.lock").exists()
+
+
+class TestClientTokenCache:
+    def _oauth_resp(self, mocker, token):
+        resp = mocker.MagicMock(status=200, headers=[])
+        resp.read.return_value = '{"access_token": "%s", "expires_in": 1800}' % token
+        return resp
+
+    def _client(self, tmp_path, **kwargs):
+        return client.Client(
+            "https://instance.com",
+            "user",
+            "pass",
+            client_id="id",
+            client_secret="secret",
+            token_cache=True,
+            token_cache_dir=str(tmp_path),
+            **kwargs
+        )
+
+    def test_token_is_shared(self, mocker, tmp_path):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = self._oauth_resp(mocker, "token")
+
+        assert self._client(tmp_path).auth_header == {"Authorization": "Bearer token"}
+        assert self._client(tmp_path).auth_header == {"Authorization": "Bearer token"}
+
+        assert request_mock.open.call_count == 1
+
+    @pytest.mark.parametrize(
+        "grant_type,credential",
+        [
+            ("client_credentials", "client_secret"),
+            ("refresh_token", "refresh_token"),
+            ("password", "password"),
+        ],
+    )
+    def test_key_depends_on_credentials(self, tmp_path, grant_type, credential):
+        def key(value):
+            credentials = dict(
+                password="pass", client_secret="secret", refresh_token="refresh"
+            )
+            credentials[credential] = value
+            c = client.Client(
+                "https://instance.com",
+                username="user" if grant_type == "password" else None,
+                client_id="id",
+                grant_type=grant_type,
+                token_cache=True,
+                token_cache_dir=str(tmp_path),
+                **credentials
+            )
+            return c._token_cache_key()
+
+        assert key("one") != key("two")
+
+    def test_disabled_by_default(self, mocker, tmp_path):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock.open.return_value = self._oauth_resp(mocker, "token")
+        c = client.Client(
+            "https://instance.com",
+            "user",
+            "pass",
+            client_id="id",
+            client_secret="secret",
+        )
+
+        c.auth_header
+
+        assert c.token_cache is None
+
+    def test_cached_expiry_is_used(self, mocker, tmp_path):
+        mocker.patch.object(client, "Request")
+        cache = token_cache.TokenCache(str(tmp_path))
+        c = self._client(tmp_path)
+        cache.put(c._token_cache_key(), "cached", time.time() + 600)
+
+        assert c.auth_header == {"Authorization": "Bearer cached"}
+        assert 0 < c._token_expiry_time - time.time() <= 600
+
+    def test_rejected_token_is_evicted(self, mocker, tmp_path):
+        request_mock = mocker.patch.object(client, "Request").return_value
+        cache = token_cache.TokenCache(str(tmp_path))
+        c = self._client(tmp_path)
+        cache.put(c._token_cache_key(), "revoked", time.time() + 600)
+        ok = mocker.MagicMock(status=200, headers=[])
+        ok.read.return_value = '{"result": "ok"}'
+        request_mock.open.side_effect = [
+            client.HTTPError("", 401, "Unauthorized", {}, None),
+            self._oauth_resp(mocker, "fresh"),
+            ok,
+        ]
+
+        resp = c.request("GET", "api/now/some/path")
+
+        assert resp.status == 200
+        assert cache.get(c._token_cache_key())[0] == "fresh"
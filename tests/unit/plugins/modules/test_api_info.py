@@ -48,6 +48,7 @@ class TestMain:
             query_category="cat",
             query_no_domain="true",
             no_count="true",
+            max_concurrency=4,
         )
 
         with set_module_args(args=params):
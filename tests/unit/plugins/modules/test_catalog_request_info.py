@@ -96,24 +96,30 @@ class TestRun:
                 ],
             )
         )
-        mocker.patch(
-            "ansible_collections.servicenow.itsm.plugins.module_utils.table.find_user",
-            return_value=dict(sys_id="1234"),
-        )
-        mocker.patch(
-            "ansible_collections.servicenow.itsm.plugins.module_utils.table.find_assignment_group",
-            return_value=dict(sys_id="5678"),
-        )
-        table_client.list_records.return_value = SAMPLE_RECORDS
+        table_client.list_records.side_effect = [
+            [
+                dict(sys_id="1234", user_name="john.doe"),
+                dict(sys_id="4321", user_name="jane.smith"),
+            ],
+            SAMPLE_RECORDS,
+        ]
+        table_client.get_record.return_value = dict(sys_id="5678")
 
         records = catalog_request_info.run(module, table_client)
-        table_client.list_records.assert_called_once_with(
+        table_client.list_records.assert_called_with(
             "sc_request",
             {
-                "sysparm_query": "priority=1^NQrequested_for=1234^NQrequested_by=1234^NQassignment_group=5678"
+                "sysparm_query": "priority=1^NQrequested_for=1234^NQrequested_by=4321^NQassignment_group=5678"
             },
         )
         assert records == SAMPLE_RECORDS
+        table_client.list_records.assert_any_call(
+            "sys_user",
+            dict(
+                sysparm_query="user_nameINjane.smith,john.doe",
+                sysparm_fields="sys_id,user_name",
+            ),
+        )
 
     def test_run_sysparm_query(self, create_module, table_client):
         module = create_module(
@@ -176,27 +182,24 @@ class TestRun:
 
 
 class TestRemapParams:
-    def test_remap_params(self, mocker):
+    def test_remap_params(self, table_client):
         query = [
             {"priority": "= 1"},
-            {"requested_for": "= john.doe"},
-            {"requested_by": "= jane.smith"},
-            {"assignment_group": "= IT Services"},
+            {"requested_for": ("=", "john.doe")},
+            {"requested_by": ("=", "jane.smith")},
+            {"assignment_group": ("=", "IT Services")},
         ]
-        mocker.patch(
-            "ansible_collections.servicenow.itsm.plugins.module_utils.table.find_user",
-            return_value=dict(sys_id="1234"),
-        )
-        mocker.patch(
-            "ansible_collections.servicenow.itsm.plugins.module_utils.table.find_assignment_group",
-            return_value=dict(sys_id="5678"),
-        )
+        table_client.list_records.return_value = [
+            dict(sys_id="1234", user_name="john.doe"),
+            dict(sys_id="4321", user_name="jane.smith"),
+        ]
+        table_client.get_record.return_value = dict(sys_id="5678")
 
-        remapped_query = catalog_request_info.remap_params(query, mocker.MagicMock())
+        remapped_query = catalog_request_info.remap_params(query, table_client)
         assert remapped_query == [
             {"priority": "= 1"},
             {"requested_for": ("=", "1234")},
-            {"requested_by": ("=", "1234")},
+            {"requested_by": ("=", "4321")},
             {"assignment_group": ("=", "5678")},
         ]
 
@@ -9,7 +9,10 @@ __metaclass__ = type
 import sys
 
 import pytest
-from ansible_collections.servicenow.itsm.plugins.module_utils import errors
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    errors,
+    reference_cache,
+)
 from ansible_collections.servicenow.itsm.plugins.modules import catalog_request_task
 from ansible_collections.servicenow.itsm.tests.unit.plugins.common.utils import (
     set_module_args,
@@ -107,6 +110,16 @@ class TestLookupRequestSysId:
         )
         assert result == expected_record
 
+    def test_lookup_uses_reference_cache(self, table_client, mocker):
+        cache = reference_cache.ReferenceCache()
+        cache.put("sc_request", "number", "REQ0000001", "request_sys_id")
+        table_client.client = mocker.Mock(reference_cache=cache)
+
+        result = catalog_request_task._lookup_request_sys_id("REQ0000001", table_client)
+
+        table_client.get_record.assert_not_called()
+        assert result["sys_id"] == "request_sys_id"
+
 
 class TestBuildPayload:
     def test_build_payload_with_task_state(self, create_module, table_client):
@@ -210,6 +223,27 @@ class TestBuildPayload:
         assert result["assignment_group"] == "group_sys_id"
         assert result["short_description"] == "Test task"
 
+    def test_build_payload_uses_reference_cache(
+        self, create_module, table_client, mocker
+    ):
+        module = create_test_module(
+            create_module,
+            requested_for="john.doe",
+            assigned_to="john.doe",
+            assignment_group="IT Support",
+        )
+        cache = reference_cache.ReferenceCache()
+        cache.put("sys_user", "user_name", "john.doe", "user_sys_id")
+        cache.put("sys_user_group", "name", "IT Support", "group_sys_id")
+        table_client.client = mocker.Mock(reference_cache=cache)
+
+        result = catalog_request_task.build_payload(module, table_client)
+
+        table_client.get_record.assert_not_called()
+        assert result["requested_for"] == "user_sys_id"
+        assert result["assigned_to"] == "user_sys_id"
+        assert result["assignment_group"] == "group_sys_id"
+
     @pytest.mark.parametrize(
         "field,value",
         [
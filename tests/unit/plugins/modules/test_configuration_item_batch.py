@@ -2,16 +2,34 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import base64
+import json
 import sys
 
 import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import (
+    client,
+    errors,
+    table,
+)
 from ansible_collections.servicenow.itsm.plugins.modules import configuration_item_batch
+from ansible_collections.servicenow.itsm.tests.unit.plugins.common import (
+    fake_servicenow,
+)
 
 pytestmark = pytest.mark.skipif(
     sys.version_info < (2, 7), reason="requires python2.7 or higher"
 )
 
 
+def b64(value):
+    return base64.b64encode(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+def batch_response(serviced):
+    return client.Response(200, json.dumps(dict(serviced_requests=serviced)))
+
+
 class TestUpdate:
     def test_update_create_record(self, create_module, table_client):
         module = create_module(
@@ -21,18 +39,24 @@ class TestUpdate:
                 ),
                 sys_class_name="cmdb_ci_ec2_instance",
                 id_column_set=["vm_inst_id"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=0,
                 dataset=[
                     dict(vm_inst_id="12345", ip_address="1.2.3.4", name="my_name")
                 ],
             )
         )
-        table_client.get_record.return_value = None
+        table_client.list_records.return_value = []
 
-        result, changed = configuration_item_batch.update(module, table_client)
+        result, changed, counts, failures = configuration_item_batch.update(
+            module, table_client
+        )
 
         table_client.create_record.assert_called_once()
         table_client.update_record.assert_not_called()
         assert changed is True
+        assert counts == dict(created=1, updated=0, unchanged=0, failed=0)
 
     def test_update_is_superset(self, create_module, table_client):
         module = create_module(
@@ -42,21 +66,27 @@ class TestUpdate:
                 ),
                 sys_class_name="cmdb_ci_ec2_instance",
                 id_column_set=["vm_inst_id"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=0,
                 dataset=[
                     dict(vm_inst_id="12345", ip_address="1.2.3.4", name="my_name")
                 ],
             )
         )
 
-        table_client.get_record.return_value = dict(
-            ip_address="1.2.3.4", name="my_name", vm_inst_id="12345"
-        )
+        table_client.list_records.return_value = [
+            dict(sys_id="1", ip_address="1.2.3.4", name="my_name", vm_inst_id="12345")
+        ]
 
-        result, changed = configuration_item_batch.update(module, table_client)
+        result, changed, counts, failures = configuration_item_batch.update(
+            module, table_client
+        )
 
         table_client.create_record.assert_not_called()
         table_client.update_record.assert_not_called()
         assert changed is False
+        assert counts == dict(created=0, updated=0, unchanged=1, failed=0)
 
     def test_update_update_record(self, create_module, table_client):
         module = create_module(
@@ -66,18 +96,327 @@ class TestUpdate:
                 ),
                 sys_class_name="cmdb_ci_ec2_instance",
                 id_column_set=["vm_inst_id"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=0,
                 dataset=[
                     dict(vm_inst_id="12345", ip_address="1.2.3.4", name="my_name")
                 ],
             )
         )
 
-        table_client.get_record.return_value = dict(
-            ip_address="1.1.1.1", name="my_name", vm_inst_id="12345"
-        )
+        table_client.list_records.return_value = [
+            dict(sys_id="1", ip_address="1.1.1.1", name="my_name", vm_inst_id="12345")
+        ]
 
-        result, changed = configuration_item_batch.update(module, table_client)
+        result, changed, counts, failures = configuration_item_batch.update(
+            module, table_client
+        )
 
         table_client.create_record.assert_not_called()
         table_client.update_record.assert_called_once()
         assert changed is True
+        assert counts == dict(created=0, updated=1, unchanged=0, failed=0)
+
+    def test_update_prefetches_records(self, create_module, table_client, mocker):
+        mocker.patch.object(configuration_item_batch, "PREFETCH_CHUNK_SIZE", 2)
+        module = create_module(
+            params=dict(
+                instance=dict(
+                    host="https://my.host.name", username="user", password="pass"
+                ),
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name", "ip_address"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=0,
+                dataset=[
+                    dict(name="a", ip_address="1.1.1.1", os="Linux"),
+                    dict(name="B", ip_address="2.2.2.2", os="Linux"),
+                    dict(name="c", ip_address="3.3.3.3", os="Linux"),
+                ],
+            )
+        )
+        table_client.list_records.side_effect = [
+            [
+                dict(sys_id="1", name="a", ip_address="1.1.1.1", os="Linux"),
+                dict(sys_id="2", name="b", ip_address="2.2.2.2", os="Windows"),
+                dict(sys_id="3", name="a", ip_address="2.2.2.2", os="Linux"),
+            ],
+            [],
+        ]
+
+        result, changed, counts, failures = configuration_item_batch.update(
+            module, table_client
+        )
+
+        assert table_client.list_records.call_args_list == [
+            mocker.call(
+                "cmdb_ci_server",
+                dict(
+                    sysparm_query="nameINB,a^ip_addressIN1.1.1.1,2.2.2.2",
+                    sysparm_fields="ip_address,name,os,sys_id",
+                ),
+            ),
+            mocker.call(
+                "cmdb_ci_server",
+                dict(
+                    sysparm_query="nameINc^ip_addressIN3.3.3.3",
+                    sysparm_fields="ip_address,name,os,sys_id",
+                ),
+            ),
+        ]
+        table_client.get_record.assert_not_called()
+        table_client.update_record.assert_called_once_with(
+            "cmdb_ci_server",
+            dict(sys_id="2", name="b", ip_address="2.2.2.2", os="Windows"),
+            dict(name="B", ip_address="2.2.2.2", os="Linux"),
+            False,
+        )
+        table_client.create_record.assert_called_once()
+        assert counts == dict(created=1, updated=1, unchanged=1, failed=0)
+
+    def test_update_unlistable_values(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                instance=dict(
+                    host="https://my.host.name", username="user", password="pass"
+                ),
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=0,
+                dataset=[dict(name="a,b", os="Linux")],
+            )
+        )
+        table_client.get_record.return_value = dict(sys_id="1", name="a,b", os="Linux")
+
+        result, changed, counts, failures = configuration_item_batch.update(
+            module, table_client
+        )
+
+        table_client.list_records.assert_not_called()
+        table_client.get_record.assert_called_once_with(
+            "cmdb_ci_server", dict(name="a,b")
+        )
+        assert counts == dict(created=0, updated=0, unchanged=1, failed=0)
+
+    def test_update_repeated_rows(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                instance=dict(
+                    host="https://my.host.name", username="user", password="pass"
+                ),
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=0,
+                dataset=[dict(name="a", os="Linux"), dict(name="a", os="Windows")],
+            )
+        )
+        table_client.list_records.return_value = []
+        table_client.create_record.return_value = dict(sys_id="1", name="a", os="Linux")
+
+        result, changed, counts, failures = configuration_item_batch.update(
+            module, table_client
+        )
+
+        table_client.create_record.assert_called_once()
+        table_client.update_record.assert_called_once()
+        assert counts == dict(created=1, updated=1, unchanged=0, failed=0)
+
+    def test_update_ambiguous_records(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                instance=dict(
+                    host="https://my.host.name", username="user", password="pass"
+                ),
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=0,
+                dataset=[dict(name="a", os="Linux")],
+            )
+        )
+        table_client.list_records.return_value = [
+            dict(sys_id="1", name="a"),
+            dict(sys_id="2", name="A"),
+        ]
+
+        with pytest.raises(errors.ServiceNowError, match="2 cmdb_ci_server records"):
+            configuration_item_batch.update(module, table_client)
+
+    @pytest.mark.parametrize("concurrency", [1, 2])
+    def test_update_continue_on_error(self, create_module, table_client, concurrency):
+        module = create_module(
+            params=dict(
+                instance=dict(
+                    host="https://my.host.name", username="user", password="pass"
+                ),
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                concurrency=concurrency,
+                continue_on_error=True,
+                batch_size=0,
+                dataset=[dict(name="a"), dict(name="b"), dict(name="c")],
+            )
+        )
+        table_client.list_records.return_value = []
+
+        def create_record(cmdb_table, payload, check_mode):
+            if payload["name"] == "b":
+                raise errors.ServiceNowError("Denied")
+            return dict(payload, sys_id=payload["name"])
+
+        table_client.create_record.side_effect = create_record
+
+        result, changed, counts, failures = configuration_item_batch.update(
+            module, table_client
+        )
+
+        assert [r["sys_id"] for r in result] == ["a", "c"]
+        assert failures == [dict(index=1, item=dict(name="b"), msg="Denied")]
+        assert counts == dict(created=2, updated=0, unchanged=0, failed=1)
+
+    def test_update_stops_on_error(self, create_module, table_client):
+        module = create_module(
+            params=dict(
+                instance=dict(
+                    host="https://my.host.name", username="user", password="pass"
+                ),
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=0,
+                dataset=[dict(name="a"), dict(name="b")],
+            )
+        )
+        table_client.list_records.return_value = []
+        table_client.create_record.side_effect = errors.ServiceNowError("Denied")
+
+        with pytest.raises(errors.ServiceNowError, match="Denied"):
+            configuration_item_batch.update(module, table_client)
+
+        table_client.create_record.assert_called_once()
+
+
+class TestUpdateEndToEnd:
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_only_the_delta_is_written(self, create_module, concurrency):
+        store = fake_servicenow.Store()
+        store.insert_many(
+            "cmdb_ci_server",
+            [
+                dict(name="srv-{0:03d}".format(i), os="Linux" if i % 2 else "AIX")
+                for i in range(200)
+            ],
+        )
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                concurrency=concurrency,
+                continue_on_error=False,
+                batch_size=0,
+                dataset=[
+                    dict(name="srv-{0:03d}".format(i), os="Linux")
+                    for i in range(100, 300)
+                ],
+            )
+        )
+
+        with fake_servicenow.FakeServiceNow(store, users=dict(admin="admin")) as server:
+            c = client.Client(server.url, "admin", "admin")
+            records, changed, counts, failures = configuration_item_batch.update(
+                module, table.TableClient(c)
+            )
+            c.close()
+
+        assert changed is True
+        assert counts == dict(created=100, updated=50, unchanged=50, failed=0)
+        assert [r["name"] for r in records] == [
+            "srv-{0:03d}".format(i) for i in range(100, 300)
+        ]
+        assert all(r["os"] == "Linux" for r in store.query("cmdb_ci_server")[100:])
+        assert server.request_count("GET") == 2
+        assert server.request_count("POST") == 100
+        assert server.request_count("PATCH") == 50
+
+    def test_batched_writes(self, create_module):
+        store = fake_servicenow.Store()
+        store.insert_many(
+            "cmdb_ci_server",
+            [
+                dict(name="srv-{0:03d}".format(i), os="Linux" if i % 2 else "AIX")
+                for i in range(200)
+            ],
+        )
+        module = create_module(
+            params=dict(
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                concurrency=1,
+                continue_on_error=False,
+                batch_size=50,
+                dataset=[
+                    dict(name="srv-{0:03d}".format(i), os="Linux")
+                    for i in range(100, 300)
+                ]
+                + [dict(name="srv-299", os="AIX")],
+            )
+        )
+
+        with fake_servicenow.FakeServiceNow(store, users=dict(admin="admin")) as server:
+            c = client.Client(server.url, "admin", "admin")
+            records, changed, counts, failures = configuration_item_batch.update(
+                module, table.TableClient(c)
+            )
+            c.close()
+
+        assert changed is True
+        assert counts == dict(created=100, updated=51, unchanged=50, failed=0)
+        assert [r["name"] for r in records][-2:] == ["srv-299", "srv-299"]
+        assert [r["os"] for r in records][-2:] == ["Linux", "AIX"]
+        assert store.query("cmdb_ci_server")[-1]["os"] == "AIX"
+        # The second write of srv-299 waits for the round after the first one.
+        assert server.request_count("POST", "/api/now/v1/batch") == 4
+        assert server.request_count("POST", "/api/now/table/cmdb_ci_server") == 100
+
+    def test_batched_failures(self, create_module, table_client, client):
+        module = create_module(
+            params=dict(
+                instance=dict(
+                    host="https://my.host.name", username="user", password="pass"
+                ),
+                sys_class_name="cmdb_ci_server",
+                id_column_set=["name"],
+                concurrency=1,
+                continue_on_error=True,
+                batch_size=10,
+                dataset=[dict(name="a"), dict(name="b")],
+            )
+        )
+        table_client.client = client
+        table_client.path.side_effect = lambda *parts: "/".join(parts)
+        table_client.list_records.return_value = []
+        client.api_path = ("api", "now")
+        client.post.return_value = batch_response(
+            [
+                dict(id="0", status_code=201, body=b64(dict(result=dict(name="a")))),
+                dict(id="1", status_code=403, body=b64(dict(error="Denied"))),
+            ]
+        )
+
+        records, changed, counts, failures = configuration_item_batch.update(
+            module, table_client
+        )
+
+        assert records == [dict(name="a")]
+        assert counts == dict(created=1, updated=0, unchanged=0, failed=1)
+        assert failures[0]["index"] == 1
+        assert "403" in failures[0]["msg"]
+        table_client.create_record.assert_not_called()
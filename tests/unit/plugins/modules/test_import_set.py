@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Red Hat
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+from ansible_collections.servicenow.itsm.plugins.module_utils import import_set
+from ansible_collections.servicenow.itsm.plugins.modules import (
+    import_set as import_set_module,
+)
+from ansible_collections.servicenow.itsm.tests.unit.plugins.common.utils import (
+    set_module_args,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (2, 7), reason="requires python2.7 or higher"
+)
+
+
+def summary(**counts):
+    result = import_set.new_summary(counts.pop("rows"))
+    result.update(counts)
+    return result
+
+
+class TestMain:
+    def test_all_params(self, run_main):
+        params = dict(
+            staging_table="u_imp_servers",
+            dataset=[dict(u_name="web-01")],
+            chunk_size=500,
+            transform_timeout=10,
+        )
+        with set_module_args(args=params):
+            success, result = run_main(import_set_module, params)
+
+        assert success is True
+
+    def test_required(self, run_main):
+        params = dict(staging_table="u_imp_servers")
+        with set_module_args(args=params):
+            success, result = run_main(import_set_module, params)
+
+        assert success is False
+        assert "one of the following is required: dataset, src" in result["msg"]
+
+    def test_mutually_exclusive(self, run_main):
+        params = dict(staging_table="u_imp_servers", dataset=[], src="servers.csv")
+        with set_module_args(args=params):
+            success, result = run_main(import_set_module, params)
+
+        assert success is False
+        assert "mutually exclusive" in result["msg"]
+
+
+class TestRun:
+    def test_dataset(self, create_module, mocker):
+        module = create_module(
+            params=dict(
+                staging_table="u_imp_servers",
+                dataset=[dict(u_name="web-01"), dict(u_name="web-02")],
+                src=None,
+            )
+        )
+        import_set_client = mocker.Mock(spec=import_set.ImportSetClient)
+        import_set_client.load.return_value = [
+            summary(rows=2, inserted=1, error=1),
+            summary(rows=1, updated=1),
+        ]
+
+        changed, result, import_sets = import_set_module.run(module, import_set_client)
+
+        import_set_client.load.assert_called_once_with(
+            "u_imp_servers", [dict(u_name="web-01"), dict(u_name="web-02")], False
+        )
+        assert changed is True
+        assert result == dict(
+            rows=3, inserted=1, updated=1, ignored=0, skipped=0, error=1, pending=0
+        )
+        assert len(import_sets) == 2
+
+    def test_src(self, create_module, mocker, tmp_path):
+        path = tmp_path / "servers.csv"
+        path.write_text("u_name\nweb-01\n")
+        module = create_module(
+            params=dict(staging_table="u_imp_servers", dataset=None, src=str(path)),
+            check_mode=True,
+        )
+        import_set_client = mocker.Mock(spec=import_set.ImportSetClient)
+        import_set_client.load.side_effect = lambda table, records, check_mode: [
+            summary(rows=len(list(records)))
+        ]
+
+        changed, result, import_sets = import_set_module.run(module, import_set_client)
+
+        assert import_set_client.load.call_args[0][2] is True
+        assert changed is True
+        assert result["rows"] == 1
+
+    def test_nothing_to_load(self, create_module, mocker):
+        module = create_module(
+            params=dict(staging_table="u_imp_servers", dataset=[], src=None)
+        )
+        import_set_client = mocker.Mock(spec=import_set.ImportSetClient)
+        import_set_client.load.return_value = []
+
+        changed, result, import_sets = import_set_module.run(module, import_set_client)
+
+        assert changed is False
+        assert result["rows"] == 0
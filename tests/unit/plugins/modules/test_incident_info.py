@@ -10,6 +10,8 @@ __metaclass__ = type
 import sys
 
 import pytest
+from ansible.module_utils import basic
+from ansible_collections.servicenow.itsm.plugins.module_utils import client
 from ansible_collections.servicenow.itsm.plugins.modules import incident_info
 from ansible_collections.servicenow.itsm.tests.unit.plugins.common.utils import (
     set_module_args,
@@ -62,6 +64,27 @@ class TestMain:
 
         assert success is True
 
+    def test_client_is_closed_before_exit(self, run_main, mocker):
+        close = mocker.patch.object(client.Client, "close")
+        exit_json = basic.AnsibleModule.exit_json
+        closed_at_exit = []
+
+        def check_closed(module, **result):
+            closed_at_exit.append(close.called)
+            exit_json(module, **result)
+
+        mocker.patch.object(basic.AnsibleModule, "exit_json", check_closed)
+        params = dict(
+            instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+        )
+        with set_module_args(args=params):
+            success, result = run_main(incident_info, params)
+
+        assert success is True
+        assert closed_at_exit == [True]
+
     def test_fail(self, run_main):
         with set_module_args(args={}):
             success, result = run_main(incident_info)
@@ -122,6 +122,9 @@ class TestBuildPayload:
         assert result["urgency"] == "3"
         assert result["resolution_code"] == "duplicate"
         assert result["duplicate_of"] == "6816f79cc0a8016401c5a33be04be441"
+        table_client.get_record.assert_called_with(
+            "problem", {"number": "PRB0000010"}, must_exist=True
+        )
 
     def test_build_payload_with_other_option(self, create_module, table_client):
         module = create_module(